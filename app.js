@@ -6,9 +6,35 @@
   const metaEl = document.getElementById("meta");
   const emptyMsg = document.getElementById("empty-msg");
   const mediaListEl = document.getElementById("media-list");
+  const tableWrap = document.getElementById("table-wrap");
 
-  let allJobs = [];
-  let sources = new Set();
+  // Windowed rendering: only rows inside the scroll viewport (plus OVERSCAN above
+  // and below) are in the DOM; spacer rows stand in for the rest.
+  const OVERSCAN = 10;
+  const DEFAULT_ROW_HEIGHT = 42;
+  const SEARCH_DEBOUNCE_MS = 150;
+  let rowHeight = DEFAULT_ROW_HEIGHT;
+  let currentIds = [];
+  let renderQueued = false;
+
+  // Job data, in the same shape whether it came from data/manifest.json (sharded,
+  // prebuilt index) or from data/jobs.json (one shard, index built here):
+  //   total, shardSize, shardFiles[], shardJobs[] (loaded shards), newCount,
+  //   index: { tokens: {token: [ids]}, sources: [names], source: [source id per job],
+  //            posted: [epoch per job], order: {posted_date|company|title: [ids]} }
+  // Sharded data: a job id is stable while the posting is open, and ids no open job has
+  // are null in the shards and left out of the index. From jobs.json: its position there.
+  let data = null;
+  let vocab = [];
+  const pendingShards = new Set();
+  let lastRunMs = 0;
+  const NEW_WINDOW_MS = 24 * 60 * 60 * 1000;
+
+  function isNew(job) {
+    if (!job.first_seen || !lastRunMs) return false;
+    const seen = new Date(job.first_seen).getTime();
+    return !isNaN(seen) && lastRunMs - seen < NEW_WINDOW_MS;
+  }
 
   function formatDate(iso) {
     if (!iso) return "—";
@@ -24,79 +50,192 @@
     }
   }
 
+  function tokenize(text) {
+    return (text || "").toLowerCase().match(/[a-z0-9]+/g) || [];
+  }
+
+  function buildIndex(jobs) {
+    const tokens = {};
+    const sources = [];
+    const sourceIds = new Map();
+    const source = [];
+    const posted = [];
+    jobs.forEach((j, i) => {
+      new Set(tokenize((j.title || "") + " " + (j.company || ""))).forEach((t) => {
+        (tokens[t] || (tokens[t] = [])).push(i);
+      });
+      const s = j.source != null ? String(j.source) : "";
+      if (!sourceIds.has(s)) {
+        sourceIds.set(s, sources.length);
+        sources.push(s);
+      }
+      source.push(sourceIds.get(s));
+      const ms = j.posted_date ? new Date(j.posted_date).getTime() : 0;
+      posted.push(isNaN(ms) ? 0 : Math.floor(ms / 1000));
+    });
+    const ids = jobs.map((_, i) => i);
+    const byText = (field) => (a, b) =>
+      (jobs[a][field] || "").localeCompare(jobs[b][field] || "") || a - b;
+    return {
+      tokens,
+      sources,
+      source,
+      posted,
+      order: {
+        posted_date: [...ids].sort((a, b) => posted[b] - posted[a] || a - b),
+        company: [...ids].sort(byText("company")),
+        title: [...ids].sort(byText("title")),
+      },
+    };
+  }
+
+  function jobAt(id) {
+    const shard = data.shardJobs[Math.floor(id / data.shardSize)];
+    return shard ? shard[id % data.shardSize] : null;
+  }
+
+  function ensureShards(ids) {
+    ids.forEach((id) => {
+      const n = Math.floor(id / data.shardSize);
+      if (data.shardJobs[n] || pendingShards.has(n)) return;
+      pendingShards.add(n);
+      fetch(dataUrl("data/" + data.shardFiles[n]))
+        .then((r) => {
+          if (!r.ok) throw new Error(r.status + " " + r.statusText);
+          return r.json();
+        })
+        .then((shard) => {
+          data.shardJobs[n] = Array.isArray(shard.jobs) ? shard.jobs : [];
+          scheduleRender();
+        })
+        .catch((err) => {
+          metaEl.textContent = "Failed to load jobs: " + err.message;
+        })
+        .finally(() => pendingShards.delete(n));
+    });
+  }
+
+  // Ids of jobs with a title/company token starting with `prefix` (vocab is sorted).
+  function idsForPrefix(prefix) {
+    let lo = 0;
+    let hi = vocab.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (vocab[mid] < prefix) lo = mid + 1;
+      else hi = mid;
+    }
+    const out = new Set();
+    for (let i = lo; i < vocab.length && vocab[i].startsWith(prefix); i++) {
+      data.index.tokens[vocab[i]].forEach((id) => out.add(id));
+    }
+    return out;
+  }
+
+  function searchIds(query) {
+    const terms = tokenize(query);
+    if (!terms.length) return null;
+    let result = null;
+    for (const term of terms) {
+      const ids = idsForPrefix(term);
+      result = result ? new Set([...result].filter((id) => ids.has(id))) : ids;
+      if (!result.size) break;
+    }
+    return result;
+  }
+
   function filterJobs() {
-    const query = (searchEl.value || "").trim().toLowerCase();
+    if (!data) return [];
+    const matched = searchIds(searchEl.value || "");
     const selectedSources = new Set(
       Array.from(document.querySelectorAll(".source-checkbox:checked")).map(
         (c) => c.dataset.source
       )
     );
-    let list = allJobs;
-    if (query) {
-      list = list.filter(
-        (j) =>
-          (j.title || "").toLowerCase().includes(query) ||
-          (j.company || "").toLowerCase().includes(query)
-      );
-    }
-    if (selectedSources.size > 0) {
-      list = list.filter((j) => {
-        const s = (j.source != null && j.source !== "") ? String(j.source) : "";
-        return selectedSources.has(s) || (s === "" && selectedSources.has(""));
-      });
-    }
-    const sortBy = sortEl.value;
-    if (sortBy === "posted_date") {
-      list = [...list].sort((a, b) => {
-        const da = a.posted_date ? new Date(a.posted_date).getTime() : 0;
-        const db = b.posted_date ? new Date(b.posted_date).getTime() : 0;
-        return db - da;
-      });
-    } else if (sortBy === "company") {
-      list = [...list].sort((a, b) =>
-        (a.company || "").localeCompare(b.company || "")
-      );
-    } else if (sortBy === "title") {
-      list = [...list].sort((a, b) =>
-        (a.title || "").localeCompare(b.title || "")
-      );
+    const allowed =
+      selectedSources.size > 0
+        ? data.index.sources.map((s) => selectedSources.has(s))
+        : null;
+    const order = data.index.order[sortEl.value] || data.index.order.posted_date;
+    return order.filter(
+      (id) =>
+        (!matched || matched.has(id)) &&
+        (!allowed || allowed[data.index.source[id]])
+    );
+  }
+
+  function rowHtml(id) {
+    const j = jobAt(id);
+    if (!j) return `<tr class="loading"><td colspan="6">Loading…</td></tr>`;
+    return `<tr>` +
+      `<td class="company">${escapeHtml(j.company || "—")}</td>` +
+      `<td class="title">${escapeHtml(j.title || "—")}${isNew(j) ? ' <span class="badge-new">New</span>' : ""}</td>` +
+      `<td class="location">${escapeHtml(j.location || "—")}</td>` +
+      `<td class="posted">${formatDate(j.posted_date)}</td>` +
+      `<td class="source">${escapeHtml(j.source || "—")}</td>` +
+      `<td><a href="${escapeAttr(j.url)}" target="_blank" rel="noopener">Apply</a></td>` +
+      `</tr>`;
+  }
+
+  function spacer(rows) {
+    return rows > 0
+      ? `<tr class="spacer"><td colspan="6" style="height:${rows * rowHeight}px"></td></tr>`
+      : "";
+  }
+
+  // Render the visible window of currentIds; cost depends on the viewport, not the job count.
+  function renderWindow() {
+    renderQueued = false;
+    const ids = currentIds;
+    const viewport = (tableWrap && tableWrap.clientHeight) || 800;
+    const scrollTop = (tableWrap && tableWrap.scrollTop) || 0;
+    const first = Math.max(0, Math.floor(scrollTop / rowHeight) - OVERSCAN);
+    const last = Math.min(ids.length, Math.ceil((scrollTop + viewport) / rowHeight) + OVERSCAN);
+    const visible = ids.slice(first, last);
+    jobsBody.innerHTML = spacer(first) + visible.map(rowHtml).join("") + spacer(ids.length - last);
+    emptyMsg.hidden = ids.length > 0;
+    const sample = jobsBody.querySelector && jobsBody.querySelector("tr:not(.spacer):not(.loading)");
+    if (sample && sample.offsetHeight && Math.abs(sample.offsetHeight - rowHeight) > 1) {
+      rowHeight = sample.offsetHeight;
+      scheduleRender();
     }
-    return list;
+    const missing = visible.filter((id) => !jobAt(id));
+    if (missing.length) ensureShards(missing);
   }
 
-  function render(jobs) {
-    jobsBody.innerHTML = jobs
-      .map(
-        (j) => `
-      <tr>
-        <td class="company">${escapeHtml(j.company || "—")}</td>
-        <td class="title">${escapeHtml(j.title || "—")}</td>
-        <td class="location">${escapeHtml(j.location || "—")}</td>
-        <td class="posted">${formatDate(j.posted_date)}</td>
-        <td class="source">${escapeHtml(j.source || "—")}</td>
-        <td><a href="${escapeAttr(j.url)}" target="_blank" rel="noopener">Apply</a></td>
-      </tr>
-    `
-      )
-      .join("");
-    emptyMsg.hidden = jobs.length > 0;
+  function scheduleRender() {
+    if (renderQueued) return;
+    renderQueued = true;
+    if (window.requestAnimationFrame) window.requestAnimationFrame(renderWindow);
+    else setTimeout(renderWindow, 16);
   }
 
+  function render(ids) {
+    currentIds = ids;
+    if (tableWrap) tableWrap.scrollTop = 0;
+    renderWindow();
+  }
+
+  function debounce(fn, ms) {
+    let timer = null;
+    return function () {
+      clearTimeout(timer);
+      timer = setTimeout(fn, ms);
+    };
+  }
+
+  const HTML_ESCAPES = { "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;" };
+
   function escapeHtml(s) {
-    const div = document.createElement("div");
-    div.textContent = s;
-    return div.innerHTML;
+    return String(s).replace(/[&<>"']/g, (c) => HTML_ESCAPES[c]);
   }
 
   function escapeAttr(s) {
     if (!s) return "#";
-    const div = document.createElement("div");
-    div.textContent = s;
-    return div.innerHTML.replace(/"/g, "&quot;");
+    return escapeHtml(s);
   }
 
   function buildSourceFilters() {
-    const sorted = Array.from(sources).sort();
+    const sorted = data.index.sources.filter((s) => s !== "").sort();
     sourceFiltersEl.innerHTML = sorted
       .map(
         (src) => `
@@ -124,6 +263,41 @@
     return origin + pathname + path;
   }
 
+  function fetchJson(path) {
+    return fetch(dataUrl(path)).then((r) => {
+      if (!r.ok) throw new Error(r.status + " " + r.statusText);
+      return r.json();
+    });
+  }
+
+  // Sharded data: manifest + index now, shards on demand. Falls back to jobs.json.
+  function loadData() {
+    return fetchJson("data/manifest.json")
+      .then((manifest) =>
+        fetchJson("data/" + (manifest.index || "index.json")).then((index) => ({
+          total: manifest.count || 0,
+          newCount: manifest.new_count,
+          shardSize: manifest.shard_size || 1,
+          shardFiles: (manifest.shards || []).map((s) => s.file),
+          shardJobs: [],
+          index,
+        }))
+      )
+      .catch(() =>
+        fetchJson("data/jobs.json").then((raw) => {
+          const jobs = Array.isArray(raw.jobs) ? raw.jobs : [];
+          return {
+            total: jobs.length,
+            newCount: null,
+            shardSize: Math.max(1, jobs.length),
+            shardFiles: [],
+            shardJobs: [jobs],
+            index: buildIndex(jobs),
+          };
+        })
+      );
+  }
+
   function loadMediaAppearances() {
     if (!mediaListEl) return;
     fetch(dataUrl("data/media_appearances.json"))
@@ -150,8 +324,13 @@
   }
 
   function run() {
-    searchEl.addEventListener("input", () => render(filterJobs()));
+    searchEl.addEventListener(
+      "input",
+      debounce(() => render(filterJobs()), SEARCH_DEBOUNCE_MS)
+    );
     sortEl.addEventListener("change", () => render(filterJobs()));
+    if (tableWrap) tableWrap.addEventListener("scroll", scheduleRender, { passive: true });
+    window.addEventListener("resize", scheduleRender);
 
     const timeout = setTimeout(() => {
       showError(
@@ -160,20 +339,12 @@
       );
     }, 12000);
 
-    fetch(dataUrl("data/jobs.json"))
-      .then((r) => {
+    loadData()
+      .then((loaded) => {
         clearTimeout(timeout);
-        if (!r.ok) throw new Error(r.status + " " + r.statusText);
-        return r.json();
-      })
-      .then((data) => {
-        const list = Array.isArray(data.jobs) ? data.jobs : [];
-        allJobs = list;
-        sources.clear();
-        allJobs.forEach((j) => {
-          if (j.source) sources.add(String(j.source));
-        });
-        metaEl.textContent = `${allJobs.length} jobs`;
+        data = loaded;
+        vocab = Object.keys(data.index.tokens).sort();
+        metaEl.textContent = `${data.total} jobs`;
         buildSourceFilters();
         render(filterJobs());
         return fetch(dataUrl("data/last_run.txt")).then((r) => (r.ok ? r.text() : ""));
@@ -183,11 +354,15 @@
           try {
             const d = new Date(lastRun.trim());
             if (!isNaN(d.getTime())) {
-              metaEl.textContent = `Last updated: ${d.toLocaleString()} • ${allJobs.length} jobs`;
+              lastRunMs = d.getTime();
+              const newCount =
+                data.newCount != null ? data.newCount : data.shardJobs[0].filter(isNew).length;
+              // last_run.txt is written only by runs that change the data.
+              metaEl.textContent = `Data last changed: ${d.toLocaleString()} • ${data.total} jobs • ${newCount} new`;
             }
           } catch (_) {}
         }
-        render(filterJobs());
+        scheduleRender();
         loadMediaAppearances();
       })
       .catch((err) => {
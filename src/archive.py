@@ -0,0 +1,232 @@
+"""
+History archive: a snapshot of the open jobs of every run that changed the published
+data, partitioned by run date.
+  .cache/archive/date=YYYY-MM-DD/jobs-YYYYMMDDTHHMMSSZ.parquet    (zstd; when pyarrow is installed)
+  .cache/archive/date=YYYY-MM-DD/jobs-YYYYMMDDTHHMMSSZ.ndjson.gz  (otherwise; one job per line)
+The archive is kept out of data/, so it is never committed with the dashboard data or
+deployed; the scheduled workflow pushes new snapshots to the `archive` branch.
+Runs that change nothing write no snapshot (see run.publish), so a snapshot stays the
+current job list until the next one. Snapshots are never rewritten, and both formats
+can sit in one archive.
+The query side reads only the partitions a date range needs, and only the columns a
+query uses (Parquet column projection; NDJSON lines are parsed and projected).
+Run from repo root: python -m src.archive [--by company|source|location] [--since DATE]
+    [--until DATE] [--archive DIR] [--root DIR]
+prints postings open per key per ISO week as tab-separated rows.
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import sys
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None  # type: ignore
+
+LOG = logging.getLogger(__name__)
+
+ARCHIVE_DIR = "archive"
+COLUMNS = ("title", "company", "url", "location", "posted_date", "source", "snippet", "first_seen")
+GROUP_COLUMNS = ("company", "source", "location")
+ROW_GROUP = 10_000
+_SUFFIXES = (".parquet", ".ndjson.gz")
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    run_at: datetime
+    path: Path
+
+
+def _stamp(run_at: datetime) -> str:
+    return run_at.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _parse_stamp(name: str) -> datetime | None:
+    """jobs-20261016T080012Z.parquet -> its run time (None for other files)."""
+    for suffix in _SUFFIXES:
+        if name.startswith("jobs-") and name.endswith(suffix):
+            try:
+                return datetime.strptime(name[5 : -len(suffix)], "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+            except ValueError:
+                return None
+    return None
+
+
+def _parse_partition(name: str) -> date | None:
+    if not name.startswith("date="):
+        return None
+    try:
+        return date.fromisoformat(name[5:])
+    except ValueError:
+        return None
+
+
+def write_snapshot(archive_dir: Path, jobs: Iterable[dict[str, Any]], run_at: str) -> Path:
+    """Write the jobs of one run to its date partition (temp file + rename). Returns the file written."""
+    when = datetime.fromisoformat(run_at).astimezone(timezone.utc)
+    directory = archive_dir / f"date={when.date().isoformat()}"
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"jobs-{_stamp(when)}{'.parquet' if pq is not None else '.ndjson.gz'}"
+    tmp = path.with_name(path.name + ".tmp")
+    rows = ({c: job.get(c) for c in COLUMNS} for job in jobs)
+    count = 0
+    if pq is not None:
+        schema = pa.schema([(c, pa.string()) for c in COLUMNS])
+        with pq.ParquetWriter(tmp, schema, compression="zstd") as writer:
+            batch: list[dict[str, Any]] = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= ROW_GROUP:
+                    writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                    count += len(batch)
+                    batch = []
+            if batch or not count:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                count += len(batch)
+    else:
+        with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=9) as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n")
+                count += 1
+    os.replace(tmp, path)
+    LOG.info("Archived %d jobs to %s", count, path)
+    return path
+
+
+def snapshots(archive_dir: Path, since: datetime | None = None, until: datetime | None = None) -> list[Snapshot]:
+    """
+    Snapshots current at some point in [since, until), oldest first: those taken in the
+    range plus the last one taken before it. Partitions outside the range are not listed.
+    """
+    partitions = sorted(
+        (day, p) for p in archive_dir.glob("date=*") if p.is_dir() and (day := _parse_partition(p.name)) is not None
+    )
+    if until is not None:
+        partitions = [(day, p) for day, p in partitions if day <= until.date()]
+    if since is not None:
+        before = [(day, p) for day, p in partitions if day < since.date()]
+        partitions = before[-1:] + [(day, p) for day, p in partitions if day >= since.date()]
+    found = sorted(
+        (
+            Snapshot(run_at, path)
+            for _day, directory in partitions
+            for path in directory.iterdir()
+            if (run_at := _parse_stamp(path.name)) is not None
+        ),
+        key=lambda s: s.run_at,
+    )
+    if until is not None:
+        found = [s for s in found if s.run_at < until]
+    if since is not None:
+        earlier = [s for s in found if s.run_at <= since]
+        found = earlier[-1:] + [s for s in found if s.run_at > since]
+    return found
+
+
+def read_columns(path: Path, columns: Iterable[str]) -> Iterator[dict[str, Any]]:
+    """Rows of one snapshot with only `columns` (missing ones are None)."""
+    columns = list(columns)
+    if path.name.endswith(".parquet"):
+        if pq is None:
+            raise RuntimeError(f"{path} is a Parquet snapshot; install pyarrow to read it")
+        f = pq.ParquetFile(path)
+        present = [c for c in columns if c in f.schema_arrow.names]
+        for batch in f.iter_batches(columns=present):
+            for row in batch.to_pylist():
+                yield {c: row.get(c) for c in columns}
+        return
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                job = json.loads(line)
+                yield {c: job.get(c) for c in columns}
+
+
+def _week(day: date) -> str:
+    year, week, _weekday = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _weeks_between(start: datetime, end: datetime) -> list[str]:
+    """ISO weeks overlapping [start, end)."""
+    out = []
+    day = start.date() - timedelta(days=start.weekday())
+    while datetime.combine(day, time(), tzinfo=timezone.utc) < end:
+        out.append(_week(day))
+        day += timedelta(days=7)
+    return out
+
+
+def weekly_counts(
+    archive_dir: Path,
+    *,
+    by: str = "company",
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> dict[tuple[str, str], int]:
+    """
+    (ISO week, value of `by`) -> number of distinct postings (URLs) open at any time in
+    that week. A snapshot counts for every week between its run and the next snapshot.
+    Reads only the `by` and url columns of the snapshots the range needs.
+    """
+    if by not in GROUP_COLUMNS:
+        raise ValueError(f"cannot group by {by!r}; expected one of {GROUP_COLUMNS}")
+    until = until or datetime.now(tz=timezone.utc)
+    found = snapshots(archive_dir, since, until)
+    seen: dict[tuple[str, str], set[str]] = {}
+    for snap, following in zip(found, found[1:] + [None]):
+        start = max(snap.run_at, since) if since else snap.run_at
+        end = following.run_at if following else until
+        weeks = _weeks_between(start, end)
+        if not weeks:
+            continue
+        for row in read_columns(snap.path, (by, "url")):
+            for week in weeks:
+                seen.setdefault((week, row[by] or ""), set()).add(row["url"])
+    LOG.info("Read %d snapshots from %s", len(found), archive_dir)
+    return {key: len(urls) for key, urls in sorted(seen.items())}
+
+
+def _date_arg(value: str) -> datetime:
+    try:
+        return datetime.combine(date.fromisoformat(value), time(), tzinfo=timezone.utc)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM-DD, got {value!r}") from e
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s %(message)s")
+    parser = argparse.ArgumentParser(description="Postings open per company (or source, location) per ISO week.")
+    parser.add_argument("--by", choices=GROUP_COLUMNS, default="company")
+    parser.add_argument("--since", type=_date_arg, metavar="YYYY-MM-DD", help="first day to count (default: all)")
+    parser.add_argument("--until", type=_date_arg, metavar="YYYY-MM-DD", help="day after the last one (default: now)")
+    parser.add_argument(
+        "--archive",
+        type=Path,
+        help="archive directory, e.g. a checkout of the archive branch (default: .cache/archive)",
+    )
+    parser.add_argument("--root", type=Path, help="project directory (default: the repo root)")
+    args = parser.parse_args(argv)
+
+    root = args.root.resolve() if args.root else Path(__file__).resolve().parent.parent
+    archive_dir = args.archive or root / ".cache" / ARCHIVE_DIR
+    counts = weekly_counts(archive_dir, by=args.by, since=args.since, until=args.until)
+    out = sys.stdout
+    out.write(f"week\t{args.by}\tpostings\n")
+    for (week, key), n in counts.items():
+        out.write(f"{week}\t{key}\t{n}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Offline micro- and end-to-end benchmarks (python -m src.benchmarks.<name>)
@@ -0,0 +1,177 @@
+"""
+Offline end-to-end benchmark of python -m src.run.
+Starts the local stand-in server (src.benchmarks.standin_server), writes a temporary
+project (config/ with N Greenhouse boards, Lever sites and RSS feeds pointing at it),
+and runs the pipeline as a subprocess --runs times against the same cache and job
+store: run 1 is cold, later runs see `churn` of the boards change. Each run reports
+wall time, per-stage time, peak RSS, HTTP counters and jobs/sec (read back from the
+run's data/run_metrics.json). Results go to a JSON file; --compare prints the change
+against an earlier result file.
+Run from repo root:
+  python -m src.benchmarks.end_to_end [--greenhouse 100] [--lever 25] [--feeds 4]
+      [--latency-ms 50] [--error-rate 0] [--scheduler [--request-budget N]] [--runs 2] [--out .cache/bench/e2e.json] [--compare OLD.json]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from src.benchmarks.standin_server import StandIn, StandInServer
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+SOURCE_STAGES = ("greenhouse", "lever", "crypto_boards", "jobspy")
+# Metrics shown by --compare (lower is better for all of them except jobs_per_sec).
+COMPARED = ("wall_seconds", "peak_rss_mib", "jobs_per_sec", "http_requests")
+
+
+def _write_project(project: Path, server_url: str, args: argparse.Namespace) -> None:
+    config = project / "config"
+    config.mkdir(parents=True)
+    companies = {
+        "greenhouse": [{"slug": f"gh-{i:05d}", "name": f"GH Company {i}"} for i in range(args.greenhouse)],
+        "lever": [{"id": f"lever-{i:05d}", "name": f"Lever Company {i}"} for i in range(args.lever)],
+        "crypto_boards": [{"url": f"{server_url}/rss/feed{i}.xml", "name": f"Feed {i}"} for i in range(args.feeds)],
+        "jobspy": {"enabled": False},
+    }
+    if args.scheduler:
+        companies["scheduler"] = {"enabled": True}
+        if args.request_budget is not None:
+            companies["scheduler"]["request_budget"] = args.request_budget
+    with open(config / "companies.yaml", "w", encoding="utf-8") as f:
+        yaml.safe_dump(companies, f, sort_keys=False)
+    shutil.copy(ROOT / "config" / "keywords.yaml", config / "keywords.yaml")
+
+
+def _run_once(project: Path, server_url: str, name: str) -> dict[str, Any]:
+    env = dict(
+        os.environ,
+        GREENHOUSE_API_BASE=f"{server_url}/v1/boards",
+        LEVER_API_BASE=f"{server_url}/v0/postings",
+    )
+    log_path = project / f"{name}.log"
+    t0 = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log:
+        proc = subprocess.run(
+            [sys.executable, "-m", "src.run", "--root", str(project)],
+            cwd=ROOT,
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+    wall = time.perf_counter() - t0
+    if proc.returncode != 0:
+        sys.stderr.write(log_path.read_text(encoding="utf-8")[-4000:])
+        raise SystemExit(f"{name}: src.run exited with {proc.returncode} (log: {log_path})")
+
+    with open(project / "data" / "run_metrics.json", encoding="utf-8") as f:
+        metrics = json.load(f)
+    stages = metrics.get("stages") or {}
+    fetched = sum((stages.get(s) or {}).get("items", 0) for s in SOURCE_STAGES)
+    http = metrics.get("http") or {}
+    return {
+        "name": name,
+        "wall_seconds": round(wall, 3),
+        "pipeline_seconds": metrics.get("wall_seconds"),
+        "peak_rss_mib": metrics.get("peak_rss_mib"),
+        "jobs_fetched": fetched,
+        "jobs_kept": (stages.get("dedupe") or {}).get("items"),
+        "jobs_per_sec": round(fetched / wall) if wall > 0 else None,
+        "http_requests": sum(h.get("requests", 0) for h in http.values()),
+        "http_retries": sum(h.get("retries", 0) for h in http.values()),
+        "http_errors": sum(h.get("errors", 0) for h in http.values()),
+        "cache": metrics.get("cache"),
+        "stages": stages,
+    }
+
+
+def _compare(old: dict[str, Any], new: dict[str, Any]) -> None:
+    """Print old -> new for each run present in both result files."""
+    old_runs = {r["name"]: r for r in old.get("runs") or []}
+    for run in new.get("runs") or []:
+        before = old_runs.get(run["name"])
+        if not before:
+            continue
+        print(f"{run['name']}:")
+        for key in COMPARED:
+            a, b = before.get(key), run.get(key)
+            if isinstance(a, (int, float)) and isinstance(b, (int, float)) and a:
+                print(f"  {key:<16} {a:>12} -> {b:<12} ({(b - a) / a:+.1%})")
+        for stage in sorted(set(before.get("stages") or {}) | set(run.get("stages") or {})):
+            a = ((before.get("stages") or {}).get(stage) or {}).get("seconds")
+            b = ((run.get("stages") or {}).get(stage) or {}).get("seconds")
+            print(f"  stage {stage:<10} {a!s:>12} -> {b!s:<12}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark src.run end to end against a local stand-in server.")
+    parser.add_argument("--greenhouse", type=int, default=100, help="Greenhouse boards (10 to 10000)")
+    parser.add_argument("--lever", type=int, default=25, help="Lever sites")
+    parser.add_argument("--feeds", type=int, default=4, help="RSS feeds")
+    parser.add_argument("--jobs-per-board", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="mean response latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 503")
+    parser.add_argument("--churn", type=float, default=0.1, help="share of boards that change between runs")
+    parser.add_argument("--scheduler", action="store_true", help="enable adaptive board polling (src.scheduler)")
+    parser.add_argument("--request-budget", type=int, help="scheduler request budget per run (default: the scheduler's)")
+    parser.add_argument("--runs", type=int, default=2, help="run 1 is cold; later runs reuse cache and store")
+    parser.add_argument("--fixtures", type=Path, help="directory of recorded responses, by request path")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", type=Path, default=ROOT / ".cache" / "bench" / "e2e.json")
+    parser.add_argument("--compare", type=Path, help="earlier result file to compare against")
+    parser.add_argument("--keep", action="store_true", help="keep the temporary project directory")
+    args = parser.parse_args(argv)
+
+    standin = StandIn(
+        jobs_per_board=args.jobs_per_board,
+        latency_ms=args.latency_ms,
+        error_rate=args.error_rate,
+        churn=args.churn,
+        fixtures=args.fixtures,
+        seed=args.seed,
+    )
+    project = Path(tempfile.mkdtemp(prefix="e2e-bench-"))
+    runs = []
+    try:
+        with StandInServer(standin) as server:
+            _write_project(project, server.url, args)
+            for i in range(args.runs):
+                standin.generation = i
+                name = "cold" if i == 0 else f"warm{i}"
+                runs.append(_run_once(project, server.url, name))
+                print(
+                    f"{name}: {runs[-1]['wall_seconds']}s, {runs[-1]['jobs_fetched']} jobs fetched, "
+                    f"{runs[-1]['jobs_per_sec']} jobs/s, peak RSS {runs[-1]['peak_rss_mib']} MiB",
+                    file=sys.stderr,
+                )
+    finally:
+        if args.keep:
+            print(f"Project kept at {project}", file=sys.stderr)
+        else:
+            shutil.rmtree(project, ignore_errors=True)
+
+    result = {
+        "params": {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items() if k not in ("out", "compare", "keep")},
+        "python": sys.version.split()[0],
+        "runs": runs,
+    }
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+        f.write("\n")
+    print(f"Wrote {args.out}", file=sys.stderr)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            _compare(json.load(f), result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Benchmark: slotted Job records vs. the old per-job dicts.
+Builds N synthetic postings both ways (the dict form is the old normalize_job output)
+and reports retained memory (tracemalloc), build time, and the time to run the
+keyword filter, a key-set dedupe pass and JSON serialization over them.
+Run from repo root: python -m src.benchmarks.job_record [--jobs 100000]
+"""
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from src.filters import KeywordMatcher
+from src.normalize import Job, normalize_job
+
+WORDS = (
+    "senior staff engineer manager product design data platform backend frontend "
+    "solidity protocol blockchain defi wallet payments risk compliance growth"
+).split()
+SOURCES = ("greenhouse", "lever", "CryptoJobsList", "web3.career", "linkedin", "indeed")
+KEYWORDS = ["blockchain", "defi", "solidity", "web3"]
+
+
+def _dict_job(title: str, company: str, url: str, source: str, location: str, snippet: str) -> dict[str, Any]:
+    """The pre-Job normalize_job."""
+    return {
+        "title": (title or "").strip(),
+        "company": (company or "").strip(),
+        "url": (url or "").strip(),
+        "location": (location or "").strip() or None,
+        "posted_date": None,
+        "source": (source or "").strip(),
+        "snippet": (snippet or "").strip() or None,
+    }
+
+
+def _raw(n: int, seed: int) -> list[tuple[str, str, str, str, str, str]]:
+    """Field strings as a scraper sees them: fresh str objects per posting, like parsed JSON."""
+    rnd = random.Random(seed)
+    companies = [f"Company {i}" for i in range(max(1, n // 50))]
+    out = []
+    for i in range(n):
+        company = rnd.choice(companies)
+        out.append(
+            (
+                " ".join(rnd.choices(WORDS, k=4)).title(),
+                "".join(company),
+                f"https://jobs.example.com/{company.lower().replace(' ', '-')}/{i}",
+                "".join(rnd.choice(SOURCES)),
+                "Remote",
+                " ".join(rnd.choices(WORDS, k=40)),
+            )
+        )
+    return out
+
+
+def _dict_key(job: dict[str, Any]) -> tuple[str, str, str]:
+    return (job["company"], job["title"], job["url"])
+
+
+def _job_key(job: Job) -> tuple[str, str, str]:
+    return (job.company, job.title, job.url)
+
+
+def _measure(build: Callable[[], list[Any]]) -> tuple[list[Any], float, int]:
+    """Build time (untraced) and bytes retained by a second, traced build."""
+    gc.collect()
+    t0 = time.perf_counter()
+    build()
+    seconds = time.perf_counter() - t0
+    gc.collect()
+    tracemalloc.start()
+    jobs = build()
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return jobs, seconds, size
+
+
+def _pipeline(
+    jobs: list[Any],
+    match: Callable[[Any], Any],
+    key: Callable[[Any], Any],
+    encode: Callable[[Any], Any],
+) -> dict[str, float]:
+    t0 = time.perf_counter()
+    kept = [j for j in jobs if match(j) is not None]
+    t1 = time.perf_counter()
+    seen = set()
+    for j in kept:
+        seen.add(key(j))
+    t2 = time.perf_counter()
+    for j in kept:
+        json.dumps(encode(j), ensure_ascii=False, separators=(",", ":"))
+    t3 = time.perf_counter()
+    return {"filter": round(t1 - t0, 4), "dedupe": round(t2 - t1, 4), "serialize": round(t3 - t2, 4)}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare memory and throughput of Job records vs. dicts.")
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    raw = _raw(args.jobs, args.seed)
+    matcher = KeywordMatcher(KEYWORDS)
+
+    dicts, dict_build, dict_bytes = _measure(lambda: [_dict_job(*r) for r in raw])
+    dict_times = _pipeline(
+        dicts,
+        lambda j: matcher.match_text(j["title"] + "\n" + (j["snippet"] or "")),
+        _dict_key,
+        lambda j: j,
+    )
+    del dicts
+    records, job_build, job_bytes = _measure(
+        lambda: [
+            normalize_job(t, c, u, s, location=loc, snippet=snip) for t, c, u, s, loc, snip in raw
+        ]
+    )
+    job_times = _pipeline(records, matcher.match, _job_key, lambda j: j.to_dict())
+
+    def _report(build: float, size: int, times: dict[str, float]) -> dict[str, Any]:
+        total = build + sum(times.values())
+        return {
+            "retained_mib": round(size / 2**20, 2),
+            "bytes_per_job": round(size / args.jobs),
+            "build_seconds": round(build, 4),
+            **{f"{k}_seconds": v for k, v in times.items()},
+            "jobs_per_sec": round(args.jobs / total),
+        }
+
+    print(
+        json.dumps(
+            {
+                "jobs": args.jobs,
+                "dict": _report(dict_build, dict_bytes, dict_times),
+                "job": _report(job_build, job_bytes, job_times),
+                "memory_ratio": round(job_bytes / dict_bytes, 3),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Micro-benchmark: compiled KeywordMatcher vs. the old per-keyword substring scan.
+Builds a synthetic corpus of jobs (a few percent containing a real keyword, a few
+percent containing look-alike words such as "Daoust" or "html2") and reports jobs/sec
+for both matchers with the configured keywords and with larger synthetic keyword lists,
+plus how many jobs each one matched.
+Run from repo root: python -m src.benchmarks.keyword_matcher [--jobs 200000]
+"""
+
+import argparse
+import json
+import random
+import string
+import time
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from src.filters import KeywordMatcher, load_keywords
+from src.normalize import Job, normalize_job
+
+WORDS = (
+    "senior staff engineer manager product design data platform backend frontend "
+    "analyst sales account executive operations finance legal recruiter support "
+    "infrastructure security mobile android ios payments risk compliance growth "
+    "marketing people partnerships research quality customer success"
+).split()
+LOOK_ALIKES = ("Daoust", "html2", "cryptography", "nftables", "unstaking", "dappled")
+
+
+def _legacy_match(job: Job, keywords: list[str]) -> bool:
+    combined = " ".join([job.title, job.snippet or ""]).lower()
+    return any(kw in combined for kw in keywords)
+
+
+def _corpus(n: int, keywords: list[str], hit_rate: float, seed: int) -> list[Job]:
+    rnd = random.Random(seed)
+    jobs = []
+    for _ in range(n):
+        title = " ".join(rnd.choices(WORDS, k=4)).title()
+        words = rnd.choices(WORDS, k=60)
+        roll = rnd.random()
+        if roll < hit_rate:
+            words.insert(rnd.randrange(len(words)), rnd.choice(keywords))
+        elif roll < 2 * hit_rate:
+            words.insert(rnd.randrange(len(words)), rnd.choice(LOOK_ALIKES))
+        jobs.append(normalize_job(title, "Acme", "https://example.com", "bench", snippet=", ".join(words)))
+    return jobs
+
+
+def _synthetic_keywords(n: int, seed: int) -> list[str]:
+    rnd = random.Random(seed)
+    return ["".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(6, 10))) for _ in range(n)]
+
+
+def _time(fn, jobs: list[Job]) -> tuple[float, int]:
+    t0 = time.perf_counter()
+    n = sum(1 for j in jobs if fn(j))
+    return time.perf_counter() - t0, n
+
+
+def _compare(jobs: list[Job], keywords: list[str]) -> dict[str, Any]:
+    legacy_sec, legacy_n = _time(lambda j: _legacy_match(j, keywords), jobs)
+    t0 = time.perf_counter()
+    matcher = KeywordMatcher(keywords)
+    compile_sec = time.perf_counter() - t0
+    compiled_sec, compiled_n = _time(lambda j: matcher.match(j) is not None, jobs)
+    return {
+        "keywords": len(keywords),
+        "legacy": {"seconds": round(legacy_sec, 4), "jobs_per_sec": round(len(jobs) / legacy_sec), "matched": legacy_n},
+        "compiled": {
+            "seconds": round(compiled_sec, 4),
+            "compile_seconds": round(compile_sec, 6),
+            "jobs_per_sec": round(len(jobs) / compiled_sec),
+            "matched": compiled_n,
+        },
+        "speedup": round(legacy_sec / compiled_sec, 2),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark keyword matching over a synthetic corpus.")
+    parser.add_argument("--jobs", type=int, default=200_000)
+    parser.add_argument("--hit-rate", type=float, default=0.03)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keywords", type=Path, default=Path("config/keywords.yaml"))
+    parser.add_argument("--extra-keywords", type=int, nargs="*", default=[100, 500], help="synthetic list sizes to add")
+    args = parser.parse_args(argv)
+
+    with open(args.keywords, encoding="utf-8") as f:
+        keywords = load_keywords((yaml.safe_load(f) or {}).get("keywords") or [])
+    jobs = _corpus(args.jobs, keywords, args.hit_rate, args.seed)
+
+    runs = [_compare(jobs, keywords)]
+    for extra in args.extra_keywords:
+        runs.append(_compare(jobs, keywords + _synthetic_keywords(extra, args.seed)))
+    print(json.dumps({"jobs": args.jobs, "runs": runs}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Local stand-in for the job sources, for offline benchmarks.
+Serves synthetic (or recorded) responses for
+  Greenhouse  GET /v1/boards/{slug}/jobs
+  Lever       GET /v0/postings/{site}?mode=json[&skip=N&limit=M]
+  RSS         GET /rss/{name}.xml
+with configurable latency, a random 503 rate, ETag / If-None-Match support, and a
+"generation" counter: bumping it changes the content of a `churn` fraction of boards,
+so repeated runs see a realistic mix of unchanged and updated boards.
+Recorded responses: a file at FIXTURES/<request path> (e.g. fixtures/v1/boards/acme/jobs)
+is served verbatim instead of the synthetic body.
+Run standalone: python -m src.benchmarks.standin_server [--port 8765] [--latency-ms 50]
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+CRYPTO_TITLES = (
+    "Blockchain Engineer", "Smart Contract Engineer", "Solidity Developer", "DeFi Protocol Engineer",
+    "Web3 Product Manager", "Crypto Compliance Analyst", "Staking Infrastructure Engineer",
+)
+OTHER_TITLES = (
+    "Account Executive", "Data Analyst", "Backend Engineer", "Product Designer", "Recruiter",
+    "Finance Manager", "Customer Success Manager", "Frontend Engineer", "Legal Counsel",
+)
+LOCATIONS = ("Remote", "New York, NY", "London", "Berlin", "Singapore", "Lisbon")
+FILLER = (
+    "We are hiring to grow the team and ship reliable systems for our customers. You will work "
+    "with product, design and operations, own projects end to end and mentor others. "
+)
+
+
+class StandIn:
+    """Response generator shared by the request handler threads."""
+
+    def __init__(
+        self,
+        *,
+        jobs_per_board: int = 20,
+        crypto_share: float = 0.3,
+        latency_ms: float = 50.0,
+        error_rate: float = 0.0,
+        churn: float = 0.1,
+        feed_items: int = 50,
+        fixtures: Path | None = None,
+        seed: int = 1,
+    ) -> None:
+        self.jobs_per_board = jobs_per_board
+        self.crypto_share = crypto_share
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.churn = churn
+        self.feed_items = feed_items
+        self.fixtures = fixtures
+        self.seed = seed
+        self.generation = 0
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _version(self, name: str) -> int:
+        """Content version of a board: each generation bumps it for a `churn` share of boards."""
+        version = 0
+        for gen in range(1, self.generation + 1):
+            h = int(hashlib.sha1(f"{self.seed}:{name}:{gen}".encode()).hexdigest()[:8], 16)
+            if h / 0xFFFFFFFF < self.churn:
+                version = gen
+        return version
+
+    def _postings(self, name: str) -> list[dict[str, Any]]:
+        version = self._version(name)
+        rnd = random.Random(f"{self.seed}:{name}:{version}")
+        out = []
+        for i in range(self.jobs_per_board):
+            crypto = rnd.random() < self.crypto_share
+            title = rnd.choice(CRYPTO_TITLES if crypto else OTHER_TITLES)
+            out.append(
+                {
+                    "id": f"{version}{i:04d}",
+                    "title": f"{title} {rnd.choice(('', 'II', 'Senior', 'Lead'))}".strip(),
+                    "location": rnd.choice(LOCATIONS),
+                    "updated_at": f"2026-01-{rnd.randint(1, 28):02d}T00:00:00Z",
+                    "description": FILLER * rnd.randint(1, 6),
+                }
+            )
+        return out
+
+    def _greenhouse(self, slug: str) -> tuple[bytes, str]:
+        jobs = [
+            {
+                "id": int(p["id"]),
+                "title": p["title"],
+                "absolute_url": f"https://boards.greenhouse.io/{slug}/jobs/{p['id']}",
+                "location": {"name": p["location"]},
+                "updated_at": p["updated_at"],
+            }
+            for p in self._postings(f"gh:{slug}")
+        ]
+        return json.dumps({"jobs": jobs, "meta": {"total": len(jobs)}}).encode(), "application/json"
+
+    def _lever(self, site: str, query: dict[str, list[str]]) -> tuple[bytes, str]:
+        postings = [
+            {
+                "id": f"{site}-{p['id']}",
+                "text": p["title"],
+                "hostedUrl": f"https://jobs.lever.co/{site}/{p['id']}",
+                "categories": {"location": p["location"]},
+                "descriptionPlain": p["description"],
+            }
+            for p in self._postings(f"lever:{site}")
+        ]
+        skip = int((query.get("skip") or ["0"])[0])
+        limit = int((query.get("limit") or ["0"])[0]) or len(postings)
+        return json.dumps(postings[skip : skip + limit]).encode(), "application/json"
+
+    def _rss(self, name: str) -> tuple[bytes, str]:
+        # Feeds grow at the top: each generation adds entries ahead of the previous ones.
+        start = self.generation * max(1, int(self.feed_items * self.churn))
+        rnd = random.Random(f"{self.seed}:rss:{name}")
+        items = []
+        for n in range(start + self.feed_items, start, -1):
+            title = (CRYPTO_TITLES + OTHER_TITLES)[n % (len(CRYPTO_TITLES) + len(OTHER_TITLES))]
+            company = f"Company {rnd.randint(1, 500)}"
+            items.append(
+                f"<item><title>{company} - {title}</title><link>https://{name}.example/jobs/{n}</link>"
+                f"<guid>{name}-{n}</guid><description>{FILLER}</description>"
+                f"<pubDate>Mon, 05 Jan 2026 00:00:00 GMT</pubDate></item>"
+            )
+        body = f'<?xml version="1.0"?><rss version="2.0"><channel><title>{name}</title>{"".join(items)}</channel></rss>'
+        return body.encode(), "application/rss+xml"
+
+    def respond(self, target: str) -> tuple[int, bytes, str]:
+        """(status, body, content type) for a request target (path and query)."""
+        split = urlsplit(target)
+        path, query = split.path, parse_qs(split.query)
+        with self._lock:
+            self.requests += 1
+            fail = self._rng.random() < self.error_rate
+            delay = self.latency_ms / 1000 * self._rng.uniform(0.5, 1.5)
+        time.sleep(delay)
+        if fail:
+            return 503, b"", "text/plain"
+        if self.fixtures is not None:
+            recorded = self.fixtures / path.lstrip("/")
+            if recorded.is_file():
+                kind = "application/rss+xml" if path.endswith(".xml") else "application/json"
+                return 200, recorded.read_bytes(), kind
+        parts = [p for p in path.split("/") if p]
+        if len(parts) == 4 and parts[:2] == ["v1", "boards"] and parts[3] == "jobs":
+            return (200, *self._greenhouse(parts[2]))
+        if len(parts) == 3 and parts[:2] == ["v0", "postings"]:
+            return (200, *self._lever(parts[2], query))
+        if len(parts) == 2 and parts[0] == "rss" and parts[1].endswith(".xml"):
+            return (200, *self._rss(parts[1][: -len(".xml")]))
+        return 404, b"", "text/plain"
+
+
+def _handler(standin: StandIn) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            status, body, kind = standin.respond(self.path)
+            etag = '"%s"' % hashlib.sha1(body).hexdigest() if status == 200 else None
+            if etag and self.headers.get("If-None-Match") == etag:
+                status, body = 304, b""
+            self.send_response(status)
+            if etag:
+                self.send_header("ETag", etag)
+            self.send_header("Content-Type", kind)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+class StandInServer:
+    """ThreadingHTTPServer around a StandIn, serving from a background thread."""
+
+    def __init__(self, standin: StandIn, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.standin = standin
+        self._server = ThreadingHTTPServer((host, port), _handler(standin))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="standin", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StandInServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve synthetic Greenhouse/Lever/RSS responses locally.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--jobs-per-board", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--fixtures", type=Path)
+    args = parser.parse_args(argv)
+    standin = StandIn(
+        jobs_per_board=args.jobs_per_board,
+        latency_ms=args.latency_ms,
+        error_rate=args.error_rate,
+        fixtures=args.fixtures,
+    )
+    with StandInServer(standin, port=args.port) as server:
+        print(f"Serving on {server.url} (Ctrl-C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,37 @@
 Discover valid Greenhouse boards and Lever sites from seed lists.
 Reads config/seed_greenhouse_slugs.txt and config/seed_lever_sites.txt (one slug/id per line),
 pings each API, and appends valid boards to config/greenhouse_slugs.txt and config/lever_sites.txt.
-Run from repo root: python -m src.discover_boards
+
+With --from-jobs the candidates come from the run's output instead: every
+boards.greenhouse.io/<slug> or jobs.lever.co/<site> link in data/jobs.json (job URLs
+and snippets, e.g. RSS and JobSpy apply links) that is not already configured is
+probed, ranked by how many keyword-matching jobs point at it.
+
+Probes run in parallel within a per-API token-bucket budget and the API host's adaptive
+concurrency limit (src.host_limits). Invalid and empty slugs are remembered in
+.cache/discovery_state.json for NEGATIVE_TTL_DAYS, and progress is checkpointed every
+CHECKPOINT_EVERY probes, so a re-run (or a resumed, interrupted run) only probes new or
+expired candidates.
+Run from repo root: python -m src.discover_boards [--workers N] [--rate R] [--full]
+    [--from-jobs [JOBS_JSON]] [--limit N]
 """
 
+import argparse
+import json
 import logging
+import os
+import re
 import time
+from collections import Counter
+from collections.abc import Callable, Iterable
 from pathlib import Path
+from typing import Any
+
+import yaml
 
-import requests
+from src import host_limits, http_client
+from src.fetcher import fetch_concurrently
+from src.rate_limit import TokenBucket
 
 logging.basicConfig(
     level=logging.INFO,
@@ -19,7 +42,32 @@ LOG = logging.getLogger(__name__)
 
 GREENHOUSE_API = "https://boards-api.greenhouse.io/v1/boards"
 LEVER_API = "https://api.lever.co/v0/postings"
-REQUEST_DELAY_SEC = 0.5
+# Per-API budget: sustained requests/second and burst size shared by all workers.
+REQUEST_RATE_PER_SEC = 4.0
+REQUEST_BURST = 4
+MAX_WORKERS = 8
+NEGATIVE_TTL_DAYS = 14
+CHECKPOINT_EVERY = 25
+
+# Probe outcomes. Only INVALID and EMPTY are cached; ERROR (network, 429, 5xx) is retried next run.
+VALID = "valid"
+EMPTY = "empty"
+INVALID = "invalid"
+ERROR = "error"
+
+# Apply links that name a board: boards.greenhouse.io/<slug>/..., job-boards.greenhouse.io/<slug>/...,
+# Greenhouse embeds (...embed/job_app?for=<slug>) and jobs.lever.co/<site>/....
+# A slug starts and ends with a letter or digit, so sentence punctuation after a bare link is not kept.
+# EU-hosted boards (job-boards.eu.greenhouse.io, jobs.eu.lever.co) are served by other APIs and skipped.
+_BOARD_URL_RES = {
+    "greenhouse": re.compile(
+        r"https?://(?:boards|job-boards)\.greenhouse\.io/"
+        r"(?:embed/job_(?:app|board)\?(?:[^\s\"'<>]*?&)?for=)?([a-z0-9](?:[a-z0-9_-]*[a-z0-9])?)",
+        re.IGNORECASE,
+    ),
+    "lever": re.compile(r"https?://jobs\.lever\.co/([a-z0-9](?:[a-z0-9._-]*[a-z0-9])?)", re.IGNORECASE),
+}
+_NOT_SLUGS = frozenset({"embed"})
 
 
 def _project_root() -> Path:
@@ -61,65 +109,259 @@ def _append_slugs(path: Path, slugs: list[str], existing: set[str]) -> None:
     LOG.info("Appended %d slugs to %s", len(added), path.name)
 
 
-def main() -> None:
+def harvest_candidates(jobs: Iterable[dict[str, Any]]) -> dict[str, Counter[str]]:
+    """Per API, how many jobs link to each board (via their URL or snippet); a job counts once per board."""
+    counts: dict[str, Counter[str]] = {api: Counter() for api in _BOARD_URL_RES}
+    for job in jobs:
+        text = f"{job.get('url') or ''} {job.get('snippet') or ''}"
+        for api, pattern in _BOARD_URL_RES.items():
+            slugs = {m.lower() for m in pattern.findall(text)} - _NOT_SLUGS
+            counts[api].update(slugs)
+    return counts
+
+
+def _configured(config_dir: Path) -> dict[str, set[str]]:
+    """Greenhouse slugs and Lever ids listed in companies.yaml."""
+    try:
+        with open(config_dir / "companies.yaml", encoding="utf-8") as f:
+            cfg = yaml.safe_load(f) or {}
+    except OSError:
+        cfg = {}
+    out: dict[str, set[str]] = {"greenhouse": set(), "lever": set()}
+    if not isinstance(cfg, dict):
+        return out
+    for api, keys, field in (
+        ("greenhouse", ("greenhouse", "greenhouse_non_crypto"), "slug"),
+        ("lever", ("lever",), "id"),
+    ):
+        for key in keys:
+            for entry in cfg.get(key) or []:
+                if isinstance(entry, dict) and entry.get(field):
+                    out[api].add(str(entry[field]).strip().lower())
+    return out
+
+
+def _load_jobs(path: Path) -> list[dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    jobs = data.get("jobs") if isinstance(data, dict) else data
+    return [j for j in jobs or [] if isinstance(j, dict)]
+
+
+class DiscoveryState:
+    """Negative-result cache: {api: {slug: {"status": ..., "checked_at": epoch}}} persisted as JSON."""
+
+    def __init__(self, path: Path, ttl_days: float = NEGATIVE_TTL_DAYS) -> None:
+        self.path = path
+        self.ttl_sec = ttl_days * 86400
+        self._data: dict[str, dict[str, dict[str, Any]]] = {}
+        if path.exists():
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    self._data = data
+            except (OSError, ValueError) as e:
+                LOG.warning("Ignoring unreadable discovery state %s: %s", path, e)
+
+    def is_fresh_negative(self, api: str, slug: str, now: float) -> bool:
+        rec = self._data.get(api, {}).get(slug)
+        return bool(rec) and now - float(rec.get("checked_at") or 0) < self.ttl_sec
+
+    def mark(self, api: str, slug: str, status: str, now: float) -> None:
+        self._data.setdefault(api, {})[slug] = {"status": status, "checked_at": now}
+
+    def forget(self, api: str, slug: str) -> None:
+        self._data.get(api, {}).pop(slug, None)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def _probe_greenhouse(slug: str) -> str:
+    try:
+        r = http_client.get(f"{GREENHOUSE_API}/{slug}/jobs", timeout=10)
+    except Exception as e:
+        LOG.debug("Greenhouse %s: %s", slug, e)
+        return ERROR
+    if r.status_code == 200:
+        try:
+            data = r.json()
+        except ValueError:
+            return INVALID
+        return VALID if isinstance(data, dict) and data.get("jobs") is not None else INVALID
+    return INVALID if r.status_code in (400, 404, 410) else ERROR
+
+
+def _probe_lever(site_id: str) -> str:
+    try:
+        r = http_client.get(f"{LEVER_API}/{site_id}", params={"mode": "json"}, timeout=10)
+    except Exception as e:
+        LOG.debug("Lever %s: %s", site_id, e)
+        return ERROR
+    if r.status_code == 200:
+        try:
+            data = r.json()
+        except ValueError:
+            return INVALID
+        if not isinstance(data, list):
+            return INVALID
+        return VALID if data else EMPTY
+    return INVALID if r.status_code in (400, 404, 410) else ERROR
+
+
+def _discover(
+    api: str,
+    candidates: list[str],
+    existing: set[str],
+    probe: Callable[[str], str],
+    out_path: Path,
+    state: DiscoveryState,
+    *,
+    workers: int,
+    bucket: TokenBucket,
+    limit: int | None = None,
+) -> list[str]:
+    """
+    Probe candidates (in order, at most `limit`) not already known or negatively cached;
+    append valid ones to out_path.
+    """
+    now = time.time()
+    todo = [c for c in candidates if c not in existing and not state.is_fresh_negative(api, c, now)]
+    LOG.info(
+        "%s: %d candidates, %d already known, %d cached negative, %d to probe",
+        api,
+        len(candidates),
+        sum(1 for c in candidates if c in existing),
+        sum(1 for c in candidates if c not in existing and c not in todo),
+        len(todo) if limit is None else min(limit, len(todo)),
+    )
+    if limit is not None:
+        todo = todo[:limit]
+
+    def _task(slug: str) -> tuple[str, str]:
+        bucket.acquire()
+        return slug, probe(slug)
+
+    valid: list[str] = []
+    pending: list[str] = []
+    counts = {VALID: 0, EMPTY: 0, INVALID: 0, ERROR: 0}
+    try:
+        for i, (slug, status) in enumerate(
+            fetch_concurrently(
+                todo,
+                _task,
+                label=f"Discover {api}",
+                max_workers=workers,
+            ),
+            1,
+        ):
+            counts[status] += 1
+            if status == VALID:
+                valid.append(slug)
+                pending.append(slug)
+                state.forget(api, slug)
+            elif status in (EMPTY, INVALID):
+                state.mark(api, slug, status, time.time())
+            if i % CHECKPOINT_EVERY == 0:
+                _append_slugs(out_path, pending, existing)
+                existing |= set(pending)
+                pending = []
+                state.save()
+                LOG.info("%s: checked %d/%d, %d valid so far", api, i, len(todo), len(valid))
+    finally:
+        _append_slugs(out_path, pending, existing)
+        existing |= set(pending)
+        state.save()
+    LOG.info(
+        "%s: %d valid, %d empty, %d invalid, %d errors (total known: %d)",
+        api,
+        counts[VALID],
+        counts[EMPTY],
+        counts[INVALID],
+        counts[ERROR],
+        len(existing),
+    )
+    return valid
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Discover Greenhouse boards and Lever sites from seed lists.")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="parallel probes per API (at most)")
+    parser.add_argument("--rate", type=float, default=REQUEST_RATE_PER_SEC, help="requests/second per API")
+    parser.add_argument("--ttl-days", type=float, default=NEGATIVE_TTL_DAYS, help="re-probe invalid/empty slugs after N days")
+    parser.add_argument("--full", action="store_true", help="ignore the negative-result cache")
+    parser.add_argument(
+        "--from-jobs",
+        nargs="?",
+        const=Path("data/jobs.json"),
+        type=Path,
+        metavar="JOBS_JSON",
+        help="probe boards linked from harvested jobs (default data/jobs.json) instead of the seed lists",
+    )
+    parser.add_argument("--limit", type=int, help="probe at most N candidates per API (highest ranked first)")
+    args = parser.parse_args(argv)
+
     root = _project_root()
     config_dir = root / "config"
+    harvested: dict[str, Counter[str]] | None = None
+    if args.from_jobs is not None:
+        jobs_path = args.from_jobs if args.from_jobs.is_absolute() else root / args.from_jobs
+        jobs = _load_jobs(jobs_path)
+        harvested = harvest_candidates(jobs)
+        LOG.info(
+            "Harvested %d Greenhouse and %d Lever boards from %d jobs in %s",
+            len(harvested["greenhouse"]),
+            len(harvested["lever"]),
+            len(jobs),
+            jobs_path,
+        )
+    configured = _configured(config_dir)
 
     seed_gh = config_dir / "seed_greenhouse_slugs.txt"
     seed_lever = config_dir / "seed_lever_sites.txt"
     out_gh = config_dir / "greenhouse_slugs.txt"
     out_lever = config_dir / "lever_sites.txt"
+    state = DiscoveryState(root / ".cache" / "discovery_state.json", 0 if args.full else args.ttl_days)
+    host_limits.configure(root / ".cache" / "host_limits.json")
 
-    existing_gh = _load_existing(out_gh)
-    existing_lever = _load_existing(out_lever)
-
-    # Greenhouse discovery
-    gh_candidates = _load_seed(seed_gh)
-    if not gh_candidates:
-        LOG.info("No seed file or empty: %s", seed_gh)
-    else:
-        valid_gh = []
-        for i, slug in enumerate(gh_candidates):
-            if slug in existing_gh or slug in valid_gh:
+    for api, seed_path, out_path, probe in (
+        ("greenhouse", seed_gh, out_gh, _probe_greenhouse),
+        ("lever", seed_lever, out_lever, _probe_lever),
+    ):
+        existing = _load_existing(out_path)
+        if harvested is not None:
+            counts = harvested[api]
+            unknown = [s for s in counts if s not in existing and s not in configured[api]]
+            candidates = sorted(unknown, key=lambda s: (-counts[s], s))
+            if candidates:
+                top = ", ".join(f"{s} ({counts[s]})" for s in candidates[:10])
+                LOG.info("%s: %d unknown boards linked from jobs, top: %s", api, len(candidates), top)
+        else:
+            candidates = _load_seed(seed_path)
+            if not candidates:
+                LOG.info("No seed file or empty: %s", seed_path)
                 continue
-            time.sleep(REQUEST_DELAY_SEC)
-            try:
-                r = requests.get(f"{GREENHOUSE_API}/{slug}/jobs", timeout=10)
-                if r.status_code == 200:
-                    data = r.json()
-                    if data.get("jobs") is not None:
-                        valid_gh.append(slug)
-                        if len(valid_gh) % 50 == 0:
-                            LOG.info("Greenhouse: %d valid so far (checked %d)", len(valid_gh), i + 1)
-            except Exception as e:
-                LOG.debug("Greenhouse %s: %s", slug, e)
-        _append_slugs(out_gh, valid_gh, existing_gh)
-        existing_gh |= set(valid_gh)
-        LOG.info("Greenhouse: %d new boards discovered (total in file: %d)", len(valid_gh), len(existing_gh))
-
-    # Lever discovery
-    lever_candidates = _load_seed(seed_lever)
-    if not lever_candidates:
-        LOG.info("No seed file or empty: %s", seed_lever)
-    else:
-        valid_lever = []
-        for i, site_id in enumerate(lever_candidates):
-            if site_id in existing_lever or site_id in valid_lever:
-                continue
-            time.sleep(REQUEST_DELAY_SEC)
-            try:
-                r = requests.get(f"{LEVER_API}/{site_id}", params={"mode": "json"}, timeout=10)
-                if r.status_code == 200:
-                    data = r.json()
-                    if isinstance(data, list) and len(data) > 0:
-                        valid_lever.append(site_id)
-                        if len(valid_lever) % 50 == 0:
-                            LOG.info("Lever: %d valid so far (checked %d)", len(valid_lever), i + 1)
-            except Exception as e:
-                LOG.debug("Lever %s: %s", site_id, e)
-        _append_slugs(out_lever, valid_lever, existing_lever)
-        existing_lever |= set(valid_lever)
-        LOG.info("Lever: %d new sites discovered (total in file: %d)", len(valid_lever), len(existing_lever))
+        if not candidates:
+            continue
+        _discover(
+            api,
+            candidates,
+            existing | configured[api],
+            probe,
+            out_path,
+            state,
+            workers=args.workers,
+            bucket=TokenBucket(args.rate, REQUEST_BURST),
+            limit=args.limit,
+        )
+
+    http_client.log_stats()
+    host_limits.save()
 
 
 if __name__ == "__main__":
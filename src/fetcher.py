@@ -0,0 +1,84 @@
+"""
+Bounded-concurrency fetch engine shared by the board scrapers.
+Runs one task per board on a thread pool and yields results in input order so
+output stays deterministic. Only a window of WINDOW_PER_WORKER x workers tasks is
+submitted ahead of the result being consumed, so one slow board holds back at most
+that many finished results rather than the whole harvest. How many requests reach
+one host at a time is decided per request by src.host_limits (adaptive), not here.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import TypeVar
+
+LOG = logging.getLogger(__name__)
+
+MAX_WORKERS = 16
+WINDOW_PER_WORKER = 2
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def fetch_concurrently(
+    items: Iterable[T],
+    task: Callable[[T], R],
+    *,
+    label: str,
+    max_workers: int = MAX_WORKERS,
+) -> Iterator[R]:
+    """
+    Run task(item) for every item on a thread pool and yield results in input order.
+    A task that raises is logged and skipped.
+    Logs wall-clock vs. summed task time when the iterator is exhausted.
+    """
+    items = list(items)
+    if not items:
+        return
+    busy = [0.0]
+    busy_lock = threading.Lock()
+
+    def _run(item: T) -> R:
+        t0 = time.perf_counter()
+        try:
+            return task(item)
+        finally:
+            elapsed = time.perf_counter() - t0
+            with busy_lock:
+                busy[0] += elapsed
+
+    started = time.perf_counter()
+    workers = max(1, min(max_workers, len(items)))
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"fetch-{label}")
+    try:
+        todo = iter(items)
+        pending = deque((item, pool.submit(_run, item)) for item in islice(todo, WINDOW_PER_WORKER * workers))
+        while pending:
+            item, fut = pending.popleft()
+            # Refill before waiting, so the workers stay busy while the head finishes.
+            for nxt in islice(todo, 1):
+                pending.append((nxt, pool.submit(_run, nxt)))
+            try:
+                result = fut.result()
+            except Exception as e:
+                LOG.warning("%s task %r failed: %s", label, item, e)
+                continue
+            yield result
+    finally:
+        # Consumer stopped early (break, Ctrl-C): drop tasks that have not started.
+        pool.shutdown(wait=True, cancel_futures=True)
+    wall = time.perf_counter() - started
+    LOG.info(
+        "%s: %d tasks in %.2fs wall (%.2fs summed request time, %.1fx, %d workers)",
+        label,
+        len(items),
+        wall,
+        busy[0],
+        busy[0] / wall if wall > 0 else 0.0,
+        workers,
+    )
@@ -1,9 +1,34 @@
 """
 Keyword-based filter: keep jobs whose title or description/snippet
 contains at least one of the configured keywords (case-insensitive).
+
+Matching is on whole tokens (runs of [a-z0-9]), so short terms like "dao" or "l2"
+only match as words ("DAO", "L2 rollups"), not inside unrelated words ("Daoust",
+"html2"). A trailing plural "s" is allowed ("NFTs", "smart contracts"), and
+multi-word keywords match across any separator ("layer 2", "layer-2").
+Keywords are compiled once into token lookup tables, so the cost per job no longer
+grows with the number of keywords. With short keyword lists a plain substring probe
+rejects most jobs first and only the candidates are tokenized.
 """
 
-from typing import Any
+import logging
+import re
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+
+from src.normalize import Job
+
+LOG = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# Up to this many probe strings, a substring pre-check is cheaper than tokenizing every job.
+PREFILTER_MAX_KEYWORDS = 48
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased [a-z0-9]+ tokens of text (the unit keywords are matched on)."""
+    return _TOKEN_RE.findall(text.lower())
 
 
 def load_keywords(keywords: list[str]) -> list[str]:
@@ -11,26 +36,103 @@ def load_keywords(keywords: list[str]) -> list[str]:
     return [k.strip().lower() for k in keywords if k and k.strip()]
 
 
+class KeywordMatcher:
+    """All keywords compiled into token tables; match() reports which keyword hit."""
+
+    def __init__(self, keywords: list[str]) -> None:
+        self.keywords = list(dict.fromkeys(load_keywords(keywords)))
+        self._rank = {kw: i for i, kw in enumerate(self.keywords)}
+        # token (and its plural) -> keyword, for one-word keywords
+        self._single: dict[str, str] = {}
+        # first token -> [(all tokens, keyword)], for multi-word keywords
+        self._multi: dict[str, list[tuple[tuple[str, ...], str]]] = {}
+        # Every match contains the keyword's first token as a substring.
+        probes: dict[str, None] = {}
+        for kw in self.keywords:
+            toks = tuple(_TOKEN_RE.findall(kw))
+            if toks:
+                probes[toks[0]] = None
+            if len(toks) == 1:
+                self._single.setdefault(toks[0], kw)
+                self._single.setdefault(toks[0] + "s", kw)
+            elif toks:
+                self._multi.setdefault(toks[0], []).append((toks, kw))
+        self._single_keys = frozenset(self._single)
+        self._multi_keys = frozenset(self._multi)
+        self._probes = tuple(probes) if len(probes) <= PREFILTER_MAX_KEYWORDS else None
+
+    def _multi_hits(self, tokens: list[str], firsts: set[str]) -> list[str]:
+        hits = []
+        for i, tok in enumerate(tokens):
+            if tok not in firsts:
+                continue
+            for toks, kw in self._multi[tok]:
+                window = tokens[i : i + len(toks)]
+                if len(window) == len(toks) and (
+                    tuple(window) == toks or (window[:-1] == list(toks[:-1]) and window[-1] == toks[-1] + "s")
+                ):
+                    hits.append(kw)
+        return hits
+
+    def match_text(self, text: str) -> str | None:
+        """Keyword found in text (earliest in the configured list wins), or None."""
+        text = text.lower()
+        if self._probes is not None and not any(p in text for p in self._probes):
+            return None
+        tokens = _TOKEN_RE.findall(text)
+        hits = [self._single[t] for t in self._single_keys.intersection(tokens)]
+        firsts = self._multi_keys.intersection(tokens)
+        if firsts:
+            hits.extend(self._multi_hits(tokens, firsts))
+        return min(hits, key=self._rank.__getitem__) if hits else None
+
+    def match(self, job: Job) -> str | None:
+        """Keyword found in the job's title or snippet, or None."""
+        if job.snippet:
+            return self.match_text(job.title + "\n" + job.snippet)
+        return self.match_text(job.title)
+
+
+@lru_cache(maxsize=8)
+def _matcher(keywords: tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(list(keywords))
+
+
 def job_matches_keywords(
-    job: dict[str, Any],
+    job: Job,
     keywords: list[str],
 ) -> bool:
     """Return True if the job's title or snippet contains any keyword."""
     if not keywords:
         return True
-    text_parts = [
-        (job.get("title") or ""),
-        (job.get("snippet") or ""),
-        (job.get("description") or ""),
-    ]
-    combined = " ".join(text_parts).lower()
-    return any(kw in combined for kw in keywords)
+    return _matcher(tuple(keywords)).match(job) is not None
+
+
+def iter_filter_jobs(
+    jobs: Iterable[Job],
+    keywords: list[str],
+) -> Iterator[Job]:
+    """
+    Streaming keyword filter: yields matching jobs as they arrive and drops the rest.
+    Logs how often each keyword matched once the input is exhausted.
+    """
+    matcher = _matcher(tuple(load_keywords(keywords)))
+    if not matcher.keywords:
+        yield from jobs
+        return
+    hits: Counter[str] = Counter()
+    for j in jobs:
+        kw = matcher.match(j)
+        if kw is not None:
+            hits[kw] += 1
+            yield j
+    if hits:
+        LOG.info("Keyword matches: %s", ", ".join(f"{k}={n}" for k, n in hits.most_common()))
 
 
 def filter_jobs_by_keywords(
-    jobs: list[dict[str, Any]],
+    jobs: list[Job],
     keywords: list[str],
-) -> list[dict[str, Any]]:
+) -> list[Job]:
     """Return only jobs that match at least one keyword."""
-    norm = load_keywords(keywords)
-    return [j for j in jobs if job_matches_keywords(j, norm)]
+    return list(iter_filter_jobs(jobs, keywords))
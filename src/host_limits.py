@@ -0,0 +1,191 @@
+"""
+Adaptive per-host concurrency (AIMD) for outgoing requests.
+Every host has a concurrency limit; a request waits for a free slot and, once answered,
+moves the limit:
+  - answered normally while the host was busy up to its limit -> limit + 1/limit
+    (about +1 per round of `limit` responses)
+  - HTTP 429/503, a timeout, or time to response headers above SPIKE_FACTOR x the
+    host's baseline latency -> limit x DECREASE, at most once per round: requests that
+    started before the last cut do not cut again
+Limits stay within MIN_LIMIT..MAX_LIMIT. configure() loads the limits and baseline
+latencies learned by earlier runs from .cache/host_limits.json and save() writes them
+back, so a run starts close to each host's capacity instead of probing it again.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+LOG = logging.getLogger(__name__)
+
+STATE_VERSION = 1
+START_LIMIT = 4.0
+MIN_LIMIT = 1.0
+# http_client keeps this many pooled connections per host; more would open throwaway ones.
+MAX_LIMIT = 16.0
+DECREASE = 0.5
+SPIKE_FACTOR = 3.0
+# A response slower than the baseline by less than this is never a spike (jitter on fast hosts).
+SPIKE_MIN_SEC = 0.5
+BASELINE_ALPHA = 0.1
+THROTTLE_STATUSES = frozenset({429, 503})
+# Learned limits older than this are dropped; the host may have changed its policy.
+STALE_DAYS = 30
+
+
+@dataclass
+class Slot:
+    """One request's hold on a host; set status (or timed_out) before the block ends."""
+
+    epoch: int
+    busy: bool  # the host was at its limit when this slot was taken
+    started: float
+    status: int | None = None
+    timed_out: bool = False
+
+
+class HostLimit:
+    """Concurrency limit of one host, adjusted by the outcome of each request."""
+
+    def __init__(self, host: str, limit: float = START_LIMIT, baseline: float | None = None) -> None:
+        self.host = host
+        self.limit = min(MAX_LIMIT, max(MIN_LIMIT, limit))
+        self.baseline = baseline  # smoothed seconds to response headers
+        self.in_flight = 0
+        self.cuts = 0
+        self._epoch = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> Slot:
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+            return Slot(self._epoch, self.in_flight >= int(self.limit), time.perf_counter())
+
+    def release(self, slot: Slot) -> None:
+        elapsed = time.perf_counter() - slot.started
+        with self._cond:
+            self.in_flight -= 1
+            reason = None
+            if slot.timed_out:
+                reason = "timeout"
+            elif slot.status in THROTTLE_STATUSES:
+                reason = f"HTTP {slot.status}"
+            elif self.baseline is not None and elapsed > max(
+                self.baseline * SPIKE_FACTOR, self.baseline + SPIKE_MIN_SEC
+            ):
+                reason = f"{elapsed:.2f}s response (baseline {self.baseline:.2f}s)"
+            if reason is not None:
+                if slot.epoch == self._epoch:
+                    old = self.limit
+                    self.limit = max(MIN_LIMIT, self.limit * DECREASE)
+                    self._epoch += 1
+                    self.cuts += 1
+                    LOG.debug("Host %s: concurrency %.1f -> %.1f (%s)", self.host, old, self.limit, reason)
+            elif slot.busy:
+                self.limit = min(MAX_LIMIT, self.limit + 1 / self.limit)
+            # Slow answers count too, so the baseline follows a host that has become slower for good.
+            if slot.status is not None and slot.status < 500 and slot.status not in THROTTLE_STATUSES:
+                self.baseline = (
+                    elapsed
+                    if self.baseline is None
+                    else BASELINE_ALPHA * elapsed + (1 - BASELINE_ALPHA) * self.baseline
+                )
+            self._cond.notify_all()
+
+
+_hosts: dict[str, HostLimit] = {}
+_saved: dict[str, dict[str, Any]] = {}
+_path: Path | None = None
+_lock = threading.Lock()
+
+
+def configure(path: Path) -> None:
+    """Load limits learned by earlier runs from `path` (save() writes back to it)."""
+    global _path
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    cutoff = time.time() - STALE_DAYS * 86400
+    hosts = data.get("hosts") if isinstance(data, dict) and data.get("version") == STATE_VERSION else None
+    with _lock:
+        _path = path
+        _hosts.clear()
+        _saved.clear()
+        for host, entry in (hosts or {}).items():
+            if isinstance(entry, dict) and float(entry.get("updated") or 0) >= cutoff:
+                _saved[host] = entry
+    LOG.info("Host limits: %d hosts loaded from %s", len(_saved), path)
+
+
+def get(host: str) -> HostLimit:
+    with _lock:
+        hl = _hosts.get(host)
+        if hl is None:
+            entry = _saved.get(host) or {}
+            baseline_ms = entry.get("baseline_ms")
+            hl = HostLimit(
+                host,
+                float(entry.get("limit") or START_LIMIT),
+                baseline_ms / 1000 if baseline_ms else None,
+            )
+            _hosts[host] = hl
+        return hl
+
+
+@contextmanager
+def slot(host: str) -> Iterator[Slot]:
+    """Hold one of `host`'s slots for the block; the caller fills in the outcome."""
+    hl = get(host)
+    s = hl.acquire()
+    try:
+        yield s
+    finally:
+        hl.release(s)
+
+
+def snapshot() -> dict[str, dict[str, Any]]:
+    """Current limit, baseline latency and number of cuts per host used in this process."""
+    with _lock:
+        hosts = dict(_hosts)
+    return {
+        host: {
+            "limit": round(hl.limit, 2),
+            "baseline_ms": round(hl.baseline * 1000, 1) if hl.baseline is not None else None,
+            "cuts": hl.cuts,
+        }
+        for host, hl in sorted(hosts.items())
+    }
+
+
+def save() -> None:
+    """Write the learned limits (hosts not used this run keep their saved entry)."""
+    if _path is None:
+        return
+    now = round(time.time())
+    hosts = dict(_saved)
+    for host, entry in snapshot().items():
+        hosts[host] = {"limit": entry["limit"], "baseline_ms": entry["baseline_ms"], "updated": now}
+        LOG.info(
+            "Host %s: concurrency limit %.1f (%d cuts this run), baseline %s ms",
+            host,
+            entry["limit"],
+            entry["cuts"],
+            entry["baseline_ms"],
+        )
+    _path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _path.with_name(_path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": STATE_VERSION, "hosts": dict(sorted(hosts.items()))}, f, indent=1)
+    os.replace(tmp, _path)
+    LOG.info("Host limits: wrote %d hosts to %s", len(hosts), _path)
@@ -0,0 +1,291 @@
+"""
+Persistent conditional-request cache for board and feed responses.
+One JSON file per request under .cache/http/ holds the validators (ETag, Last-Modified),
+a SHA-256 of the last body and the jobs normalized from it, so an unchanged board is
+neither re-downloaded (304 Not Modified) nor re-normalized (same body hash).
+fetch_stream() does the same for large bodies without holding them in memory: the
+response is hashed while it is spooled to a temporary file, and the parser reads it
+from there.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import requests
+
+from src import http_client
+from src.normalize import Job
+
+LOG = logging.getLogger(__name__)
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "http"
+# fetch_stream() keeps bodies up to this size in memory and spills larger ones to disk.
+SPOOL_BYTES = 1024 * 1024
+
+
+@dataclass
+class CacheStats:
+    requests: int = 0
+    not_modified: int = 0
+    same_body: int = 0
+    misses: int = 0
+    bytes_saved: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.not_modified + self.same_body
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.requests if self.requests else 0.0
+
+
+_directory = CACHE_DIR
+_enabled = True
+_stats = CacheStats()
+_stats_lock = threading.Lock()
+
+
+def configure(*, directory: Path | None = None, enabled: bool | None = None) -> None:
+    """Change the cache directory or turn the cache off (every request becomes a plain GET)."""
+    global _directory, _enabled
+    if directory is not None:
+        _directory = Path(directory)
+    if enabled is not None:
+        _enabled = enabled
+
+
+def _entry_path(url: str, params: dict[str, Any] | None, variant: str) -> Path:
+    raw = json.dumps([url, sorted((params or {}).items()), variant], ensure_ascii=False)
+    return _directory / f"{hashlib.sha256(raw.encode('utf-8')).hexdigest()}.json"
+
+
+def _load(path: Path) -> dict[str, Any] | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry if isinstance(entry, dict) and isinstance(entry.get("jobs"), list) else None
+
+
+def _jobs(entry: dict[str, Any]) -> list[Job]:
+    return [Job.from_dict(d) for d in entry["jobs"]]
+
+
+def _store(path: Path, entry: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entry, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _count(field: str, saved: int = 0) -> None:
+    with _stats_lock:
+        _stats.requests += 1
+        setattr(_stats, field, getattr(_stats, field) + 1)
+        _stats.bytes_saved += saved
+
+
+@dataclass
+class Fetched:
+    jobs: list[Job]
+    sha256: str  # of the body the jobs came from ("" when unknown)
+    cache: str = ""  # "not_modified", "same_body", "miss", "skipped", or "" when the cache is off
+    items: int | None = None  # elements in the body, for parsers that return Parsed
+
+
+@dataclass
+class Parsed:
+    """fetch_stream() parser result that also reports how many elements the body held."""
+
+    jobs: list[Job]
+    items: int
+
+
+def _items(entry: dict[str, Any]) -> int | None:
+    items = entry.get("items")
+    return items if isinstance(items, int) else None
+
+
+def fetch(
+    url: str,
+    parse: Callable[[requests.Response, list[Job]], list[Job]],
+    *,
+    params: dict[str, Any] | None = None,
+    variant: str = "",
+    timeout: float = http_client.DEFAULT_TIMEOUT,
+) -> Fetched:
+    """
+    Conditional GET of url; returns the jobs parse(response, previous_jobs) builds
+    from it, where previous_jobs are the jobs cached for the last body ([] if none).
+    Sends If-None-Match / If-Modified-Since from the previous response. On 304, or
+    when the body hashes the same as last time, the cached jobs are returned
+    without calling parse. variant separates entries for the same URL that are
+    normalized differently (e.g. the display name of a board).
+    Raises on HTTP errors like a plain GET + raise_for_status().
+    """
+    if not _enabled:
+        r = http_client.get(url, params=params, timeout=timeout)
+        r.raise_for_status()
+        return Fetched(parse(r, []), hashlib.sha256(r.content or b"").hexdigest())
+
+    path = _entry_path(url, params, variant)
+    entry = _load(path)
+    r = http_client.get(url, params=params, headers=_validators(entry), timeout=timeout)
+    if r.status_code == 304 and entry:
+        _count("not_modified", int(entry.get("size") or 0))
+        return Fetched(_jobs(entry), entry.get("sha256") or "", "not_modified")
+    r.raise_for_status()
+
+    body = r.content or b""
+    digest = hashlib.sha256(body).hexdigest()
+    if entry and entry.get("sha256") == digest:
+        jobs = _jobs(entry)
+        outcome = "same_body"
+        _count("same_body")
+    else:
+        jobs = parse(r, _jobs(entry) if entry else [])
+        outcome = "miss"
+        _count("misses")
+    _store_response(path, url, r, digest, len(body), jobs)
+    return Fetched(jobs, digest, outcome)
+
+
+def _validators(entry: dict[str, Any] | None) -> dict[str, str] | None:
+    """Conditional request headers from a cache entry."""
+    headers: dict[str, str] = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers or None
+
+
+def _store_response(
+    path: Path, url: str, r: requests.Response, digest: str, size: int, jobs: list[Job], items: int | None = None
+) -> None:
+    entry = {
+        "url": url,
+        "etag": r.headers.get("ETag"),
+        "last_modified": r.headers.get("Last-Modified"),
+        "sha256": digest,
+        "size": size,
+        "jobs": [j.to_dict() for j in jobs],
+    }
+    if items is not None:
+        entry["items"] = items
+    _store(path, entry)
+
+
+def _spool(r: requests.Response) -> tuple[BinaryIO, str, int]:
+    """Read a streamed body into a spooled temp file; returns (file at offset 0, sha256, size)."""
+    body = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in http_client.iter_body(r):
+        digest.update(chunk)
+        body.write(chunk)
+        size += len(chunk)
+    body.seek(0)
+    return body, digest.hexdigest(), size  # type: ignore[return-value]
+
+
+def fetch_stream(
+    url: str,
+    parse: Callable[[BinaryIO, list[Job]], list[Job] | Parsed],
+    *,
+    params: dict[str, Any] | None = None,
+    variant: str = "",
+    timeout: float = http_client.DEFAULT_TIMEOUT,
+) -> Fetched:
+    """
+    fetch() for large bodies: parse(body_file, previous_jobs) reads the body from a
+    temporary file (in memory up to SPOOL_BYTES, on disk beyond), so the response is
+    never held in memory whole. Same caching, outcomes and errors as fetch(). A parser
+    that returns Parsed has its element count cached and returned as Fetched.items.
+    """
+    path = _entry_path(url, params, variant)
+    entry = _load(path) if _enabled else None
+    r = http_client.get(url, params=params, headers=_validators(entry), timeout=timeout, stream=True)
+    with r:
+        if r.status_code == 304 and entry:
+            _count("not_modified", int(entry.get("size") or 0))
+            return Fetched(_jobs(entry), entry.get("sha256") or "", "not_modified", _items(entry))
+        r.raise_for_status()
+        body, digest, size = _spool(r)
+    with body:
+        if not _enabled:
+            result = parse(body, [])
+            if isinstance(result, Parsed):
+                return Fetched(result.jobs, digest, items=result.items)
+            return Fetched(result, digest)
+        if entry and entry.get("sha256") == digest:
+            jobs, items = _jobs(entry), _items(entry)
+            outcome = "same_body"
+            _count("same_body")
+        else:
+            result = parse(body, _jobs(entry) if entry else [])
+            jobs, items = (result.jobs, result.items) if isinstance(result, Parsed) else (result, None)
+            outcome = "miss"
+            _count("misses")
+    _store_response(path, url, r, digest, size, jobs, items)
+    return Fetched(jobs, digest, outcome, items)
+
+
+def cached(url: str, *, params: dict[str, Any] | None = None, variant: str = "") -> Fetched | None:
+    """The jobs cached for url, without a request (None if nothing is cached or the cache is off)."""
+    if not _enabled:
+        return None
+    entry = _load(_entry_path(url, params, variant))
+    if entry is None:
+        return None
+    return Fetched(_jobs(entry), entry.get("sha256") or "", "skipped", _items(entry))
+
+
+def fetch_jobs(
+    url: str,
+    parse: Callable[[requests.Response], list[Job]],
+    *,
+    params: dict[str, Any] | None = None,
+    variant: str = "",
+    timeout: float = http_client.DEFAULT_TIMEOUT,
+) -> list[Job]:
+    """fetch() for parsers that do not use the previous jobs; returns just the jobs."""
+    return fetch(url, lambda r, _previous: parse(r), params=params, variant=variant, timeout=timeout).jobs
+
+
+def stats() -> CacheStats:
+    with _stats_lock:
+        return CacheStats(**vars(_stats))
+
+
+def reset_stats() -> None:
+    global _stats
+    with _stats_lock:
+        _stats = CacheStats()
+
+
+def log_stats() -> None:
+    st = stats()
+    if not st.requests:
+        return
+    LOG.info(
+        "HTTP cache: %d requests, %d not modified, %d unchanged body, %d fetched (%.0f%% hit rate), %.1f KiB saved",
+        st.requests,
+        st.not_modified,
+        st.same_body,
+        st.misses,
+        st.hit_rate * 100,
+        st.bytes_saved / 1024,
+    )
@@ -0,0 +1,243 @@
+"""
+Shared HTTP client for every scraper and for board discovery.
+One pooled requests.Session (keep-alive connections per host, compressed transfer),
+retries with jittered exponential backoff that honour Retry-After, and per-host
+request/byte counters. tracking() additionally collects the counters of the requests
+made inside a block (e.g. one board) for per-board run metrics.
+get(..., stream=True) leaves the body unread; iter_body() reads it in chunks and
+counts its bytes once it is consumed.
+Every attempt holds one of its host's slots (src.host_limits) until the response
+headers arrive; the per-host limit adapts to 429/503s, timeouts and latency.
+"""
+
+import logging
+import random
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src import host_limits
+
+try:
+    import brotli  # noqa: F401  (urllib3 decodes "br" when this is installed)
+except ImportError:
+    brotli = None  # type: ignore
+
+LOG = logging.getLogger(__name__)
+
+USER_AGENT = "crypto-jobs-scraper/1.0 (+python-requests)"
+DEFAULT_TIMEOUT = 15
+MAX_RETRIES = 3
+BACKOFF_BASE_SEC = 0.5
+BACKOFF_MAX_SEC = 30.0
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Hosts kept in the pool / keep-alive connections kept per host.
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 16
+
+
+@dataclass
+class HostStats:
+    requests: int = 0
+    retries: int = 0
+    errors: int = 0
+    bytes_wire: int = 0
+    bytes_body: int = 0
+
+
+@dataclass
+class RequestStats(HostStats):
+    status: int | None = None  # of the last response (None after a network error)
+
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+_stats: dict[str, HostStats] = {}
+_stats_lock = threading.Lock()
+_tracked: ContextVar[RequestStats | None] = ContextVar("http_tracked", default=None)
+
+
+def session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            s.headers.update(
+                {
+                    "User-Agent": USER_AGENT,
+                    "Accept-Encoding": "gzip, deflate, br" if brotli else "gzip, deflate",
+                    "Connection": "keep-alive",
+                }
+            )
+            _session = s
+        return _session
+
+
+def _host_stats(host: str) -> HostStats:
+    st = _stats.get(host)
+    if st is None:
+        st = HostStats()
+        _stats[host] = st
+    return st
+
+
+def _wire_bytes(resp: requests.Response, body: int) -> int:
+    try:
+        return int(resp.raw.tell())
+    except Exception:
+        return body
+
+
+def _record(host: str, resp: requests.Response | None, *, retry: bool = False, streamed: bool = False) -> None:
+    body = wire = 0
+    if resp is not None and not streamed:
+        body = len(resp.content or b"")
+        wire = _wire_bytes(resp, body)
+    error = resp is None or resp.status_code >= 400
+    tracked = _tracked.get()
+    with _stats_lock:
+        for st in (_host_stats(host), tracked):
+            if st is None:
+                continue
+            st.requests += 1
+            st.retries += retry
+            st.errors += error
+            st.bytes_body += body
+            st.bytes_wire += wire
+        if tracked is not None:
+            tracked.status = resp.status_code if resp is not None else None
+
+
+def iter_body(resp: requests.Response, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Decoded body chunks of a stream=True response; closes it and counts its bytes when done."""
+    body = 0
+    try:
+        for chunk in resp.iter_content(chunk_size):
+            body += len(chunk)
+            yield chunk
+    finally:
+        wire = _wire_bytes(resp, body)
+        resp.close()
+        tracked = _tracked.get()
+        with _stats_lock:
+            for st in (_host_stats(urlparse(resp.url).netloc), tracked):
+                if st is not None:
+                    st.bytes_body += body
+                    st.bytes_wire += wire
+
+
+@contextmanager
+def tracking() -> Iterator[RequestStats]:
+    """Count the requests made in this block (in this thread) into a fresh RequestStats."""
+    stats = RequestStats()
+    token = _tracked.set(stats)
+    try:
+        yield stats
+    finally:
+        _tracked.reset(token)
+
+
+def _backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff for the given 0-based attempt."""
+    return random.uniform(0, min(BACKOFF_MAX_SEC, BACKOFF_BASE_SEC * (2**attempt)))
+
+
+def _retry_after(resp: requests.Response) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    value = (resp.headers.get("Retry-After") or "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(tz=timezone.utc)).total_seconds())
+
+
+def get(
+    url: str,
+    *,
+    params: dict[str, Any] | None = None,
+    headers: dict[str, str] | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    retries: int = MAX_RETRIES,
+    stream: bool = False,
+) -> requests.Response:
+    """
+    GET url through the shared session.
+    Connection errors, timeouts and 429/5xx responses are retried up to `retries`
+    times (waiting for a free slot of the host each time); the final response is
+    returned as-is (callers decide on raise_for_status).
+    With stream=True the body is not read; use iter_body() (or close the response).
+    """
+    host = urlparse(url).netloc
+    sess = session()
+    attempt = 0
+    while True:
+        try:
+            with host_limits.slot(host) as slot:
+                try:
+                    resp = sess.get(url, params=params, headers=headers, timeout=timeout, stream=stream)
+                except requests.Timeout:
+                    slot.timed_out = True
+                    raise
+                slot.status = resp.status_code
+        except (requests.ConnectionError, requests.Timeout) as e:
+            _record(host, None, retry=attempt > 0)
+            if attempt >= retries:
+                raise
+            delay = _backoff(attempt)
+            LOG.debug("GET %s: %s; retry %d in %.2fs", url, e, attempt + 1, delay)
+        else:
+            _record(host, resp, retry=attempt > 0, streamed=stream)
+            if resp.status_code not in RETRY_STATUSES or attempt >= retries:
+                return resp
+            retry_after = _retry_after(resp)
+            delay = retry_after if retry_after is not None else _backoff(attempt)
+            LOG.debug("GET %s: HTTP %d; retry %d in %.2fs", url, resp.status_code, attempt + 1, delay)
+            resp.close()
+        attempt += 1
+        time.sleep(min(delay, BACKOFF_MAX_SEC))
+
+
+def host_stats() -> dict[str, HostStats]:
+    """Snapshot of per-host counters since process start (or reset_stats)."""
+    with _stats_lock:
+        return {h: HostStats(**vars(s)) for h, s in _stats.items()}
+
+
+def reset_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def log_stats() -> None:
+    """Log one line per host: requests, retries, errors, bytes on the wire vs. decoded."""
+    for host, st in sorted(host_stats().items()):
+        LOG.info(
+            "HTTP %s: %d requests (%d retries, %d errors), %.1f KiB wire / %.1f KiB body",
+            host,
+            st.requests,
+            st.retries,
+            st.errors,
+            st.bytes_wire / 1024,
+            st.bytes_body / 1024,
+        )
@@ -0,0 +1,242 @@
+"""
+Persistent job store (SQLite, stdlib only) keyed on normalize.dedupe_key.
+Each run upserts the jobs it saw; rows keep first_seen / last_seen / closed_at,
+and data/jobs.json is exported from the open rows. changed_at marks the run that
+last added, modified, reopened or closed a row so consumers can read only those.
+Rows are read in one canonical order (company, case-insensitively, then URL) and the
+published rows leave out last_seen, so an export of unchanged data is byte-identical.
+Open rows also carry a dashboard id (pub_id, see assign_ids) that stays with the row
+while it is open, so the dashboard shards of unchanged postings do not move.
+"""
+
+import json
+import logging
+import sqlite3
+from itertools import count
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from src.normalize import JOB_FIELDS, Job, dedupe_key
+
+LOG = logging.getLogger(__name__)
+
+# Canonical order of exported rows; the key only breaks ties between rows with the same URL.
+_ORDER = "lower(company), company, url, key"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    key TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    company TEXT NOT NULL,
+    url TEXT NOT NULL,
+    location TEXT,
+    posted_date TEXT,
+    source TEXT NOT NULL,
+    snippet TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    closed_at TEXT,
+    changed_at TEXT NOT NULL,
+    seen_order INTEGER NOT NULL DEFAULT 0,
+    merged_sources TEXT,
+    pub_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS jobs_changed_at ON jobs (changed_at);
+CREATE INDEX IF NOT EXISTS jobs_closed_at ON jobs (closed_at);
+CREATE TABLE IF NOT EXISTS runs (
+    run_at TEXT PRIMARY KEY,
+    seen INTEGER NOT NULL,
+    added INTEGER NOT NULL,
+    updated INTEGER NOT NULL,
+    closed INTEGER NOT NULL
+);
+"""
+
+
+def store_key(job: Job) -> str | None:
+    """Stable string form of the dedupe key (used as the primary key)."""
+    key = dedupe_key(job)
+    return json.dumps(key, ensure_ascii=False) if key else None
+
+
+@dataclass
+class RunDiff:
+    run_at: str
+    seen: int = 0
+    added: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    closed: list[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.updated or self.closed)
+
+
+class JobStore:
+    """SQLite-backed job history. Use as a context manager."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.row_factory = sqlite3.Row
+        self._db.executescript(_SCHEMA)
+        columns = {r["name"] for r in self._db.execute("PRAGMA table_info(jobs)")}
+        if "merged_sources" not in columns:
+            self._db.execute("ALTER TABLE jobs ADD COLUMN merged_sources TEXT")
+        if "pub_id" not in columns:
+            self._db.execute("ALTER TABLE jobs ADD COLUMN pub_id INTEGER")
+
+    def __enter__(self) -> "JobStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def record_run(self, jobs: Iterable[Job], run_at: str, *, close_missing: bool = True) -> RunDiff:
+        """
+        Upsert every job seen in this run and close open rows that were not seen
+        (unless close_missing is False, for runs that covered only some sources).
+        New keys are added; rows whose fields changed (or that were closed) are
+        updated and reopened; unchanged rows only get last_seen bumped.
+        """
+        diff = RunDiff(run_at=run_at)
+        db = self._db
+        with db:
+            for order, job in enumerate(jobs):
+                key = store_key(job)
+                if key is None:
+                    continue
+                values = tuple(getattr(job, f) for f in JOB_FIELDS)
+                row = db.execute(
+                    f"SELECT {', '.join(JOB_FIELDS)}, closed_at, last_seen FROM jobs WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row["last_seen"] == run_at:
+                    continue  # duplicate within the run; first occurrence wins
+                diff.seen += 1
+                if row is None:
+                    db.execute(
+                        f"INSERT INTO jobs (key, {', '.join(JOB_FIELDS)}, first_seen, last_seen, changed_at, seen_order)"
+                        f" VALUES (?, {', '.join('?' * len(JOB_FIELDS))}, ?, ?, ?, ?)",
+                        (key, *values, run_at, run_at, run_at, order),
+                    )
+                    diff.added.append(key)
+                elif tuple(row[f] for f in JOB_FIELDS) != values or row["closed_at"] is not None:
+                    db.execute(
+                        f"UPDATE jobs SET {', '.join(f'{f} = ?' for f in JOB_FIELDS)},"
+                        " last_seen = ?, closed_at = NULL, changed_at = ?, seen_order = ? WHERE key = ?",
+                        (*values, run_at, run_at, order, key),
+                    )
+                    diff.updated.append(key)
+                else:
+                    db.execute(
+                        "UPDATE jobs SET last_seen = ?, seen_order = ? WHERE key = ?",
+                        (run_at, order, key),
+                    )
+            if close_missing:
+                diff.closed = [
+                    r["key"]
+                    for r in db.execute(
+                        "SELECT key FROM jobs WHERE closed_at IS NULL AND last_seen < ?", (run_at,)
+                    )
+                ]
+                db.execute(
+                    "UPDATE jobs SET closed_at = ?, changed_at = ? WHERE closed_at IS NULL AND last_seen < ?",
+                    (run_at, run_at, run_at),
+                )
+            db.execute(
+                "INSERT OR REPLACE INTO runs (run_at, seen, added, updated, closed) VALUES (?, ?, ?, ?, ?)",
+                (run_at, diff.seen, len(diff.added), len(diff.updated), len(diff.closed)),
+            )
+        LOG.info(
+            "Job store: %d seen, %d added, %d updated, %d closed",
+            diff.seen,
+            len(diff.added),
+            len(diff.updated),
+            len(diff.closed),
+        )
+        return diff
+
+    def record_merges(self, run_at: str, merged: dict[tuple[str, str, str], set[str]]) -> None:
+        """Set merged_sources for rows seen in this run (copies from other sources folded into them)."""
+        with self._db:
+            self._db.execute(
+                "UPDATE jobs SET merged_sources = NULL WHERE last_seen = ? AND merged_sources IS NOT NULL",
+                (run_at,),
+            )
+            self._db.executemany(
+                "UPDATE jobs SET merged_sources = ? WHERE key = ?",
+                [
+                    (json.dumps(sorted(sources), ensure_ascii=False), json.dumps(key, ensure_ascii=False))
+                    for key, sources in merged.items()
+                ],
+            )
+
+    def assign_ids(self) -> int:
+        """
+        Give every open row a dashboard id: closed rows release theirs, and new rows take
+        the lowest free ids in first_seen order. Returns the size of the id space (highest
+        id + 1); ids released and not taken again are holes.
+        """
+        db = self._db
+        with db:
+            db.execute("UPDATE jobs SET pub_id = NULL WHERE closed_at IS NOT NULL AND pub_id IS NOT NULL")
+            taken = {r[0] for r in db.execute("SELECT pub_id FROM jobs WHERE pub_id IS NOT NULL")}
+            new = [
+                r[0]
+                for r in db.execute(
+                    "SELECT key FROM jobs WHERE closed_at IS NULL AND pub_id IS NULL ORDER BY first_seen, key"
+                )
+            ]
+            free = (i for i in count() if i not in taken)
+            db.executemany("UPDATE jobs SET pub_id = ? WHERE key = ?", ((next(free), key) for key in new))
+            (highest,) = db.execute("SELECT max(pub_id) FROM jobs").fetchone()
+        return 0 if highest is None else highest + 1
+
+    def _rows(
+        self, where: str, params: tuple[Any, ...] = (), *, order: str = _ORDER, columns: str = ""
+    ) -> Iterator[dict[str, Any]]:
+        cur = self._db.execute(
+            f"SELECT {', '.join(JOB_FIELDS)}, first_seen, last_seen, closed_at, merged_sources{columns} FROM jobs"
+            f" WHERE {where} ORDER BY {order}",
+            params,
+        )
+        for row in cur:
+            job = dict(row)
+            merged = job.pop("merged_sources")
+            if merged:
+                job["merged_sources"] = json.loads(merged)
+            yield job
+
+    def open_jobs(self) -> Iterator[dict[str, Any]]:
+        """Open jobs in canonical order, without last_seen (it changes on every run)."""
+        for row in self._rows("closed_at IS NULL"):
+            del row["last_seen"], row["closed_at"]
+            yield row
+
+    def published_jobs(self) -> Iterator[tuple[int, dict[str, Any]]]:
+        """(dashboard id, job) for every open job, in id order; call assign_ids() first."""
+        for row in self._rows("closed_at IS NULL AND pub_id IS NOT NULL", order="pub_id", columns=", pub_id"):
+            del row["last_seen"], row["closed_at"]
+            yield row.pop("pub_id"), row
+
+    def changed_since(self, since: str) -> Iterator[dict[str, Any]]:
+        """Rows added, modified, reopened or closed at or after `since` (ISO timestamp)."""
+        return self._rows("changed_at >= ?", (since,))
+
+    def jobs_by_key(self, keys: Iterable[str]) -> list[dict[str, Any]]:
+        """Rows for the given store keys in canonical order, without last_seen."""
+        db = self._db
+        with db:
+            db.execute("CREATE TEMP TABLE IF NOT EXISTS wanted (key TEXT PRIMARY KEY)")
+            db.execute("DELETE FROM wanted")
+            db.executemany("INSERT OR IGNORE INTO wanted (key) VALUES (?)", ((k,) for k in keys))
+        out = list(self._rows("key IN (SELECT key FROM wanted)"))
+        for row in out:
+            del row["last_seen"]
+        return out
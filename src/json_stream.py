@@ -0,0 +1,117 @@
+"""
+Incremental JSON array reader for large API responses.
+iter_array() yields the elements of a top-level array (or of the array under one key
+of a top-level object, e.g. Greenhouse's {"jobs": [...]}) while reading the document
+chunk by chunk, so memory holds one chunk plus the element being decoded rather than
+the whole body. Stdlib only: json.JSONDecoder.raw_decode over a sliding text buffer.
+"""
+
+import codecs
+import json
+from collections.abc import Iterable, Iterator
+from typing import Any, BinaryIO
+
+CHUNK_BYTES = 64 * 1024
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_NUMBER_START = frozenset("-0123456789")
+_AFTER_NUMBER = frozenset(_WHITESPACE + ",]}")
+
+
+def read_chunks(f: BinaryIO, size: int = CHUNK_BYTES) -> Iterator[bytes]:
+    return iter(lambda: f.read(size), b"")
+
+
+class _Reader:
+    """Text buffer over a byte-chunk stream; consumed text is dropped as more is read."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk to the buffer; False once the input is exhausted."""
+        if self.eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self.eof = True
+            text = self._decoder.decode(b"", final=True)
+        else:
+            text = self._decoder.decode(chunk)
+        self.buf = self.buf[self.pos :] + text
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it ("" at end of input)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"expected {char!r}, found {found or 'end of input'!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next JSON value, reading more input until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number is complete only once a delimiter follows it: "12" may go on as
+            # "12.5" or "12e3" in the next chunk, and "1.5e" decodes as 1.5.
+            if (
+                self.buf[self.pos] in _NUMBER_START
+                and (end == len(self.buf) or self.buf[end] not in _AFTER_NUMBER)
+                and self.fill()
+            ):
+                continue
+            self.pos = end
+            return value
+
+
+def iter_array(chunks: Iterable[bytes], key: str | None = None) -> Iterator[Any]:
+    """
+    Elements of the top-level array, or of the array under `key` in a top-level object
+    (values of other keys are decoded and dropped). Yields nothing when `key` is missing
+    or not an array. Raises ValueError on malformed JSON.
+    """
+    r = _Reader(chunks)
+    if key is not None:
+        r.expect("{")
+        while True:
+            if r.peek() == "}":
+                return
+            name = r.value()
+            r.expect(":")
+            if name == key and r.peek() == "[":
+                break
+            r.value()
+            if r.peek() == ",":
+                r.pos += 1
+    r.expect("[")
+    if r.peek() == "]":
+        return
+    while True:
+        yield r.value()
+        char = r.peek()
+        if char == ",":
+            r.pos += 1
+        elif char == "]":
+            return
+        else:
+            raise ValueError(f"expected ',' or ']' in array, found {char or 'end of input'!r}")
@@ -0,0 +1,146 @@
+"""
+Merge the partial results of sharded runs (python -m src.run --shard i/N) into the
+normal outputs: reads data/partials/jobs.I-of-N.ndjson.gz for I = 1..N, applies the
+keyword filter and dedupe once over all shards, records the run in .cache/jobs.db and
+writes data/jobs.json, jobs_delta.json, last_run.txt and run_metrics.json (with the
+workers' per-board metrics) exactly as an unsharded run would.
+Refuses to merge an incomplete set: the jobs of a missing shard would all be closed.
+Also refuses partials of different runs (a failed worker leaves yesterday's partial
+behind, whose jobs may be closed by now): their run ids differ or, without run ids,
+they were written more than MAX_RUN_SPREAD apart. --allow-mixed-runs merges them anyway.
+Run from repo root: python -m src.merge [--shards N] [--partials DIR] [--run-id ID] [--allow-mixed-runs]
+    [--format compact|pretty] [--no-compress] [--ndjson] [--no-archive] [--root DIR]
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import fields
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from src import metrics, partials
+from src.filters import iter_filter_jobs
+from src.metrics import BoardMetrics, StageTimer, write_run_metrics
+from src.normalize import Job
+from src.run import add_output_args, load_keywords, publish
+
+LOG = logging.getLogger(__name__)
+
+# Partials whose run_at times are further apart than this probably come from different runs.
+MAX_RUN_SPREAD = timedelta(hours=12)
+
+
+def _read_jobs(paths: list[Path], timer: StageTimer) -> Iterator[Job]:
+    for path in paths:
+        before = timer.items.get("partials", 0)
+        yield from timer.wrap("partials", partials.iter_partial(path))
+        LOG.info("Read %s: %d jobs", path.name, timer.items["partials"] - before)
+
+
+def _worker_metrics(directory: Path, headers: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Load each worker's run metrics, folding its board rows into this run's; returns a per-shard summary."""
+    known = {f.name for f in fields(BoardMetrics)}
+    summary = []
+    for header in headers:
+        shard = (int(header.get("shard") or 0), int(header.get("shards") or 0))
+        path = partials.metrics_path(directory, shard)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            LOG.warning("Shard %s metrics (%s): %s", partials.shard_label(shard), path, e)
+            data = {}
+        rows = data.get("boards") or []
+        metrics.add_boards(BoardMetrics(**{k: v for k, v in row.items() if k in known}) for row in rows)
+        summary.append(
+            {
+                "shard": partials.shard_label(shard),
+                "run_at": header.get("run_at"),
+                "wall_seconds": data.get("wall_seconds"),
+                "peak_rss_mib": data.get("peak_rss_mib"),
+            }
+        )
+    return summary
+
+
+def _mixed_runs(headers: list[dict[str, Any]], run_id: str | None) -> str | None:
+    """Why the partials do not look like one run (None when they do)."""
+    labels = [f"{h.get('shard')}-of-{h.get('shards')}" for h in headers]
+    ids = [h.get("run_id") for h in headers]
+    if run_id is not None:
+        other = [f"{label} ({i})" for label, i in zip(labels, ids) if i != run_id]
+        if other:
+            return f"partials not from run {run_id}: {', '.join(other)}"
+    if len(set(ids)) > 1:
+        return "partials come from different runs: " + ", ".join(f"{label} ({i})" for label, i in zip(labels, ids))
+    if ids[0] is None:
+        run_times = sorted(datetime.fromisoformat(h["run_at"]) for h in headers if h.get("run_at"))
+        if run_times and run_times[-1] - run_times[0] > MAX_RUN_SPREAD:
+            return f"partials were written {run_times[-1] - run_times[0]} apart and carry no run id"
+    return None
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Merge sharded run partials into data/jobs.json.")
+    add_output_args(parser)
+    parser.add_argument("--shards", type=int, help="shard count N of the set to merge (default: the only N present)")
+    parser.add_argument("--partials", type=Path, help="directory holding the partial files (default: data/partials)")
+    parser.add_argument("--run-id", help="merge only if every partial carries this run id")
+    parser.add_argument(
+        "--allow-mixed-runs",
+        action="store_true",
+        help="merge partials of different runs (or too far apart in time) instead of refusing",
+    )
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    root = args.root.resolve() if args.root else Path(__file__).resolve().parent.parent
+    os.chdir(root)
+    metrics.reset_boards()
+    data_dir = root / "data"
+    directory = args.partials.resolve() if args.partials else data_dir / partials.PARTIALS_DIR
+    try:
+        paths = partials.find_partials(directory, args.shards)
+    except ValueError as e:
+        raise SystemExit(f"merge: {e}") from e
+
+    headers = [partials.read_header(p) for p in paths]
+    problem = _mixed_runs(headers, args.run_id)
+    if problem:
+        if not args.allow_mixed_runs:
+            raise SystemExit(f"merge: {problem}; pass --allow-mixed-runs to merge them anyway")
+        LOG.warning("Merging anyway (--allow-mixed-runs): %s", problem)
+    shard_summary = _worker_metrics(directory, headers)
+
+    timer = StageTimer()
+    jobs: Iterable[Job] = _read_jobs(paths, timer)
+    keywords_list = load_keywords(root / "config")
+    if keywords_list:
+        jobs = timer.wrap("filter", iter_filter_jobs(jobs, keywords_list))
+    run_at = datetime.now(tz=timezone.utc).isoformat()
+    # Workers that ran only some sources (--sources) cannot tell which jobs of the others are gone.
+    close_missing = all(h.get("sources") is None for h in headers)
+    changed_at = publish(jobs, data_dir, args, timer, run_at, close_missing=close_missing)
+    LOG.info(
+        "Merged %d shards: %d jobs read, %d kept",
+        len(paths),
+        timer.items.get("partials", 0),
+        timer.items.get("dedupe", 0),
+    )
+
+    write_run_metrics(
+        data_dir / "run_metrics.json",
+        run_at=run_at,
+        wall_seconds=time.perf_counter() - started,
+        timer=timer,
+        extra={"data_changed_at": changed_at, "shards": shard_summary},
+    )
+
+
+if __name__ == "__main__":
+    main()
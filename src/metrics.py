@@ -0,0 +1,279 @@
+"""
+Run metrics: wall time and item counts per pipeline stage, per-board fetch metrics
+(time, HTTP status, bytes, retries, jobs before and after the keyword filter) with
+p50/p95/max latency per source, peak RSS, HTTP/cache counters and the adaptive
+per-host concurrency limits, written to
+data/run_metrics.json so runs can be compared.
+Stages are nested generators (sources -> filter -> dedupe -> store); each stage's
+time excludes the time spent waiting on the stages that feed it.
+profiled() runs a block under cProfile (all threads) and tracemalloc for --profile.
+"""
+
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, TypeVar
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore
+
+from src import host_limits, http_cache, http_client
+
+LOG = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class StageTimer:
+    """Exclusive wall time and item count per named stage (single consumer thread)."""
+
+    def __init__(self) -> None:
+        self.seconds: dict[str, float] = {}
+        self.items: dict[str, int] = {}
+        # One [time spent in nested stages] cell per stage currently running.
+        self._stack: list[list[float]] = []
+
+    def _enter(self) -> tuple[list[float], float]:
+        cell = [0.0]
+        self._stack.append(cell)
+        return cell, time.perf_counter()
+
+    def _exit(self, name: str, cell: list[float], t0: float) -> None:
+        elapsed = time.perf_counter() - t0
+        self._stack.pop()
+        self.seconds[name] = self.seconds.get(name, 0.0) + elapsed - cell[0]
+        if self._stack:
+            self._stack[-1][0] += elapsed
+
+    def wrap(self, name: str, items: Iterable[T]) -> Iterator[T]:
+        """Pass items through, charging the time spent producing them to stage `name`."""
+        it = iter(items)
+        self.items.setdefault(name, 0)
+        while True:
+            cell, t0 = self._enter()
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+            finally:
+                self._exit(name, cell, t0)
+            self.items[name] += 1
+            yield item
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Charge the time spent in a block (minus wrapped stages it pulls from) to `name`."""
+        cell, t0 = self._enter()
+        try:
+            yield
+        finally:
+            self._exit(name, cell, t0)
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        return {
+            name: {"seconds": round(sec, 4), **({"items": self.items[name]} if name in self.items else {})}
+            for name, sec in self.seconds.items()
+        }
+
+
+@dataclass
+class BoardMetrics:
+    source: str
+    board: str
+    seconds: float = 0.0
+    status: int | None = None
+    requests: int = 0
+    retries: int = 0
+    bytes: int = 0
+    cache: str = ""
+    jobs: int = 0
+    matched: int = 0
+    error: str | None = None
+
+
+_boards: list[BoardMetrics] = []
+_boards_lock = threading.Lock()
+# Board whose jobs the pipeline is consuming right now (set by the scrapers as they yield).
+_current: BoardMetrics | None = None
+
+
+@contextmanager
+def track_board(source: str, board: str) -> Iterator[BoardMetrics]:
+    """Time one board/feed fetch and collect its HTTP counters; the caller sets jobs/cache."""
+    m = BoardMetrics(source=source, board=board)
+    t0 = time.perf_counter()
+    with http_client.tracking() as req:
+        try:
+            yield m
+        finally:
+            m.seconds = round(time.perf_counter() - t0, 4)
+            m.status = req.status
+            m.requests = req.requests
+            m.retries = req.retries
+            m.bytes = req.bytes_wire
+            with _boards_lock:
+                _boards.append(m)
+
+
+def consuming(board: BoardMetrics | None) -> None:
+    """Mark `board` as the source of the jobs yielded next (see count_matched)."""
+    global _current
+    _current = board
+
+
+def count_matched(jobs: Iterable[T]) -> Iterator[T]:
+    """Pass filtered jobs through, crediting each to the board it came from."""
+    for j in jobs:
+        if _current is not None:
+            _current.matched += 1
+        yield j
+
+
+def add_boards(rows: Iterable[BoardMetrics]) -> None:
+    """Include board metrics collected by another process (src.merge reads them from the partials)."""
+    with _boards_lock:
+        _boards.extend(rows)
+
+
+def boards() -> list[BoardMetrics]:
+    with _boards_lock:
+        return list(_boards)
+
+
+def reset_boards() -> None:
+    global _current
+    with _boards_lock:
+        _boards.clear()
+    _current = None
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def source_summary(rows: list[BoardMetrics]) -> dict[str, dict[str, Any]]:
+    """Per source: board count (failed, skipped by the scheduler), job counts, HTTP totals and p50/p95/max board latency."""
+    out: dict[str, dict[str, Any]] = {}
+    for source in sorted({m.source for m in rows}):
+        part = [m for m in rows if m.source == source]
+        latency = sorted(m.seconds for m in part)
+        out[source] = {
+            "boards": len(part),
+            "failed": sum(1 for m in part if m.error),
+            "skipped": sum(1 for m in part if m.cache == "skipped"),
+            "jobs": sum(m.jobs for m in part),
+            "matched": sum(m.matched for m in part),
+            "requests": sum(m.requests for m in part),
+            "retries": sum(m.retries for m in part),
+            "bytes": sum(m.bytes for m in part),
+            "p50_seconds": _percentile(latency, 50),
+            "p95_seconds": _percentile(latency, 95),
+            "max_seconds": latency[-1] if latency else 0.0,
+        }
+    return out
+
+
+def peak_rss_mib() -> float | None:
+    """Peak resident set size of this process in MiB (None where unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+def write_run_metrics(
+    path: Path,
+    *,
+    run_at: str,
+    wall_seconds: float,
+    timer: StageTimer,
+    extra: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Write data/run_metrics.json (plus any `extra` top-level keys) and return what was written."""
+    rows = boards()
+    metrics = {
+        "run_at": run_at,
+        "wall_seconds": round(wall_seconds, 3),
+        "peak_rss_mib": peak_rss_mib(),
+        "stages": timer.as_dict(),
+        "sources": source_summary(rows),
+        "boards": [asdict(m) for m in sorted(rows, key=lambda m: (m.source, m.board))],
+        "http": {host: asdict(st) for host, st in sorted(http_client.host_stats().items())},
+        "host_limits": host_limits.snapshot(),
+        "cache": asdict(http_cache.stats()),
+        **(extra or {}),
+    }
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(metrics, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    os.replace(tmp, path)
+    LOG.info("Wrote %s", path)
+    return metrics
+
+
+@contextmanager
+def profiled(out_dir: Path, *, top: int = 30) -> Iterator[None]:
+    """
+    Run the block under cProfile (the calling thread and every thread started inside
+    it) and tracemalloc. Writes out_dir/run.prof (pstats) and out_dir/run.txt with the
+    top functions by cumulative and own time and the largest allocation sites.
+    """
+    profiles: list[cProfile.Profile] = []
+    lock = threading.Lock()
+
+    def _start_thread_profile(*_args: Any) -> None:
+        p = cProfile.Profile()
+        with lock:
+            profiles.append(p)
+        p.enable()
+
+    main = cProfile.Profile()
+    tracemalloc.start()
+    threading.setprofile(_start_thread_profile)
+    main.enable()
+    try:
+        yield
+    finally:
+        main.disable()
+        threading.setprofile(None)  # type: ignore[arg-type]
+        snapshot = tracemalloc.take_snapshot()
+        _current_mem, peak_mem = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        out_dir.mkdir(parents=True, exist_ok=True)
+        stats = pstats.Stats(main)
+        with lock:
+            for p in profiles:
+                stats.add(p)
+        stats.dump_stats(out_dir / "run.prof")
+        report = io.StringIO()
+        stats.stream = report  # type: ignore[attr-defined]
+        report.write(f"Threads profiled: {len(profiles) + 1}\n\n== Top {top} by cumulative time ==\n")
+        stats.sort_stats("cumulative").print_stats(top)
+        report.write(f"== Top {top} by own time ==\n")
+        stats.sort_stats("tottime").print_stats(top)
+        report.write(f"== Largest allocation sites still held (peak traced: {peak_mem / 2**20:.1f} MiB) ==\n")
+        noise = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen *>"))
+        for stat in snapshot.filter_traces(noise).statistics("lineno")[:top]:
+            report.write(f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  {stat.traceback}\n")
+        with open(out_dir / "run.txt", "w", encoding="utf-8") as f:
+            f.write(report.getvalue())
+        LOG.info("Profile written to %s (run.txt, run.prof)", out_dir)
@@ -1,9 +1,89 @@
 """
 Normalize job records to a common schema for merging and display.
 Schema: title, company, url, location, posted_date, source, snippet
+Scrapers build Job records (slotted, with interned source/company strings);
+Job.to_dict() gives the JSON form with exactly these keys in this order.
+
+Deduplication works on two levels:
+- exact: (company, title, url identity), where the URL identity is the ATS job id
+  when one can be read from the URL (gh_jid, Greenhouse/Lever/LinkedIn/Indeed paths)
+  and the canonical URL otherwise (tracking params, fragments and "www." removed);
+- near-duplicate: MinHash signatures of the normalized title words, bucketed with
+  LSH banding per normalized company, so only jobs of the same company sharing a band
+  are compared (no O(n^2) scan). Candidates must have title-word Jaccard >=
+  NEAR_DUP_THRESHOLD and no differing level words ("II", "Senior", "Lead", ...).
 """
 
+import logging
+import re
+import sys
+import zlib
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
 from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+LOG = logging.getLogger(__name__)
+
+JOB_FIELDS = ("title", "company", "url", "location", "posted_date", "source", "snippet")
+
+# Query parameters that only track where a click came from (utm_* is matched by prefix).
+# Generic names such as source, ref or t are kept: some boards use them to pick the posting.
+TRACKING_PARAMS = frozenset(
+    {
+        "gh_src", "lever-source", "lever-origin", "lever-via", "trk", "trackingid",
+        "fbclid", "gclid", "msclkid", "mc_cid", "mc_eid", "_hsenc", "_hsmi",
+    }
+)
+NEAR_DUP_THRESHOLD = 0.8
+_MINHASH_PERMS = 32
+_LSH_BANDS = 8
+_LSH_ROWS = _MINHASH_PERMS // _LSH_BANDS
+_MERSENNE = (1 << 61) - 1
+_MINHASH_SEEDS = [
+    ((i * 0x9E3779B97F4A7C15 + 1) % _MERSENNE | 1, (i * 0xC2B2AE3D27D4EB4F + 7) % _MERSENNE)
+    for i in range(1, _MINHASH_PERMS + 1)
+]
+_COMPANY_SUFFIXES = frozenset({"inc", "llc", "ltd", "limited", "corp", "corporation", "co", "gmbh", "ag", "sa", "plc"})
+# Title decorations some sources add and others do not.
+_TITLE_NOISE = frozenset({"remote", "hybrid", "onsite", "anywhere", "worldwide", "fulltime"})
+# Words that make two otherwise similar titles different roles.
+_LEVEL_WORDS = frozenset(
+    {"i", "ii", "iii", "iv", "v", "1", "2", "3", "4", "5", "senior", "sr", "staff", "principal", "lead",
+     "junior", "jr", "associate", "head", "director", "manager", "vp", "intern", "chief"}
+)
+_BRACKETED = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+@dataclass(slots=True)
+class Job:
+    """One normalized posting. Build it with normalize_job()."""
+
+    title: str
+    company: str
+    url: str
+    location: str | None
+    posted_date: str | None
+    source: str
+    snippet: str | None
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON form: the schema keys in JOB_FIELDS order."""
+        return {
+            "title": self.title,
+            "company": self.company,
+            "url": self.url,
+            "location": self.location,
+            "posted_date": self.posted_date,
+            "source": self.source,
+            "snippet": self.snippet,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Job":
+        """Rebuild a Job from its JSON form (normalized again, so old records are safe)."""
+        return normalize_job(**{f: data.get(f) for f in JOB_FIELDS})
 
 
 def normalize_job(
@@ -15,33 +95,202 @@ def normalize_job(
     location: str | None = None,
     posted_date: str | None = None,
     snippet: str | None = None,
-) -> dict[str, Any]:
-    """Build a normalized job dict. All required fields must be non-empty."""
-    return {
-        "title": (title or "").strip(),
-        "company": (company or "").strip(),
-        "url": (url or "").strip(),
-        "location": (location or "").strip() or None,
-        "posted_date": (posted_date or "").strip() or None,
-        "source": (source or "").strip(),
-        "snippet": (snippet or "").strip() or None,
-    }
+) -> Job:
+    """Build a normalized Job. All required fields must be non-empty."""
+    return Job(
+        title=(title or "").strip(),
+        # Few distinct values shared by many jobs: keep one copy of each string.
+        company=sys.intern((company or "").strip()),
+        url=(url or "").strip(),
+        location=(location or "").strip() or None,
+        posted_date=(posted_date or "").strip() or None,
+        source=sys.intern((source or "").strip()),
+        snippet=(snippet or "").strip() or None,
+    )
+
+
+def canonical_url(url: str) -> str:
+    """Lowercase scheme/host, drop "www.", fragments, tracking params and trailing slashes; sort the query."""
+    url = (url or "").strip()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    if not parts.netloc:
+        return url
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_")
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(((parts.scheme or "https").lower(), host, path, urlencode(query), ""))
+
+
+_GREENHOUSE_PATH = re.compile(r"/[^/]+/jobs/(\d+)")
+_LEVER_PATH = re.compile(r"^/[^/]+/([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})", re.I)
+_LINKEDIN_PATH = re.compile(r"/jobs/view/(?:[^/]*-)?(\d+)")
+
+
+def url_identity(url: str) -> str:
+    """ATS job identity (e.g. "greenhouse:7327070", "lever:<uuid>") or the canonical URL."""
+    canon = canonical_url(url)
+    try:
+        parts = urlsplit(canon)
+    except ValueError:
+        return canon
+    host = parts.netloc
+    params = dict(parse_qsl(parts.query))
+    if params.get("gh_jid", "").isdigit():
+        return f"greenhouse:{params['gh_jid']}"
+    if host.endswith("greenhouse.io"):
+        m = _GREENHOUSE_PATH.search(parts.path)
+        if m:
+            return f"greenhouse:{m.group(1)}"
+    if host.endswith("lever.co"):
+        m = _LEVER_PATH.search(parts.path)
+        if m:
+            return f"lever:{m.group(1).lower()}"
+    if host.endswith("linkedin.com"):
+        m = _LINKEDIN_PATH.search(parts.path)
+        if m:
+            return f"linkedin:{m.group(1)}"
+        if params.get("currentJobId", "").isdigit():
+            return f"linkedin:{params['currentJobId']}"
+    if "indeed." in host and params.get("jk"):
+        return f"indeed:{params['jk']}"
+    return canon
+
 
+def dedupe_key(job: Job) -> tuple[str, str, str] | None:
+    """(company, title, url identity) of a job, or None if any part is empty."""
+    key = (job.company, job.title, url_identity(job.url))
+    if not key[0] or not key[1] or not key[2]:
+        return None
+    return key
 
-def deduplicate_jobs(jobs: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    """Deduplicate by (company, title, url). Keeps first occurrence."""
+
+def _company_tokens(company: str) -> tuple[str, ...]:
+    return tuple(w for w in _WORD_RE.findall(company.lower()) if w not in _COMPANY_SUFFIXES)
+
+
+def _title_words(title: str, company: str) -> frozenset[str]:
+    """Title words without bracketed parts, noise words, or a leading "Company - " prefix."""
+    words = _WORD_RE.findall(_BRACKETED.sub(" ", title.lower()))
+    prefix = list(_company_tokens(company))
+    if prefix and words[: len(prefix)] == prefix and len(words) > len(prefix):
+        words = words[len(prefix) :]
+    return frozenset(w for w in words if w not in _TITLE_NOISE)
+
+
+def _minhash(words: frozenset[str]) -> tuple[int, ...]:
+    hashes = [zlib.crc32(w.encode("utf-8")) for w in words] or [0]
+    return tuple(min((a * h + b) % _MERSENNE for h in hashes) for a, b in _MINHASH_SEEDS)
+
+
+def _similar_titles(a: frozenset[str], b: frozenset[str], threshold: float) -> bool:
+    union = a | b
+    if not union:
+        return True
+    diff = a ^ b
+    return len(a & b) / len(union) >= threshold and not (diff & _LEVEL_WORDS)
+
+
+class Deduplicator:
+    """
+    Streaming dedupe: exact keys first, then MinHash/LSH near-duplicate detection on
+    normalized company + title words across different sources (two postings from the
+    same source are separate jobs). The first occurrence wins; `merged` maps the kept
+    job's dedupe key to the other sources whose copies were dropped, exact or near.
+    """
+
+    def __init__(self, *, near_duplicates: bool = True, threshold: float = NEAR_DUP_THRESHOLD) -> None:
+        self.near_duplicates = near_duplicates
+        self.threshold = threshold
+        self.merged: dict[tuple[str, str, str], set[str]] = {}
+        self.exact_dropped = 0
+        self.near_dropped = 0
+        # dedupe key -> (key, source) of the job kept for it
+        self._seen: dict[tuple[str, str, str], tuple[tuple[str, str, str], str]] = {}
+        # (band, company tokens, band of the signature) -> indexes into _kept
+        self._buckets: dict[tuple[int, tuple[str, ...], tuple[int, ...]], list[int]] = {}
+        self._kept: list[tuple[tuple[str, str, str], tuple[str, ...], frozenset[str], str]] = []
+
+    def _find_near(
+        self, company: tuple[str, ...], words: frozenset[str], source: str, bands: list
+    ) -> int | None:
+        checked: set[int] = set()
+        for band in bands:
+            for idx in self._buckets.get(band, ()):
+                if idx in checked:
+                    continue
+                checked.add(idx)
+                _key, other_company, other_words, other_source = self._kept[idx]
+                if (
+                    other_source != source
+                    and other_company == company
+                    and _similar_titles(words, other_words, self.threshold)
+                ):
+                    return idx
+        return None
+
+    def __call__(self, jobs: Iterable[Job]) -> Iterator[Job]:
+        for j in jobs:
+            key = dedupe_key(j)
+            if key is None:
+                continue
+            source = j.source
+            kept = self._seen.get(key)
+            if kept is not None:
+                kept_key, kept_source = kept
+                if kept_source != source:
+                    self.merged.setdefault(kept_key, set()).add(source)
+                self.exact_dropped += 1
+                continue
+            self._seen[key] = (key, source)
+            if not self.near_duplicates:
+                yield j
+                continue
+            company = _company_tokens(key[0])
+            words = _title_words(key[1], key[0])
+            sig = _minhash(words)
+            bands = [(b, company, sig[b * _LSH_ROWS : (b + 1) * _LSH_ROWS]) for b in range(_LSH_BANDS)]
+            idx = self._find_near(company, words, source, bands)
+            if idx is not None:
+                kept_key, _c, _s, kept_source = self._kept[idx]
+                self.merged.setdefault(kept_key, set()).add(source)
+                self._seen[key] = (kept_key, kept_source)
+                self.near_dropped += 1
+                continue
+            idx = len(self._kept)
+            self._kept.append((key, company, words, source))
+            for band in bands:
+                self._buckets.setdefault(band, []).append(idx)
+            yield j
+        LOG.info(
+            "Dedupe: %d exact duplicates, %d near duplicates; %d jobs absorbed copies from other sources",
+            self.exact_dropped,
+            self.near_dropped,
+            len(self.merged),
+        )
+
+
+def iter_deduplicated(jobs: Iterable[Job]) -> Iterator[Job]:
+    """Streaming exact dedupe by (company, title, url identity): yields first occurrences."""
     seen: set[tuple[str, str, str]] = set()
-    out: list[dict[str, Any]] = []
     for j in jobs:
-        key = (
-            (j.get("company") or "").strip(),
-            (j.get("title") or "").strip(),
-            (j.get("url") or "").strip(),
-        )
-        if not key[0] or not key[1] or not key[2]:
+        key = dedupe_key(j)
+        if key is None:
             continue
         if key in seen:
             continue
         seen.add(key)
-        out.append(j)
-    return out
+        yield j
+
+
+def deduplicate_jobs(jobs: list[Job]) -> list[Job]:
+    """Deduplicate by (company, title, url identity). Keeps first occurrence."""
+    return list(iter_deduplicated(jobs))
@@ -0,0 +1,172 @@
+"""
+Output stage: write {"jobs": [...], "count": N} incrementally, one job at a time.
+Styles:
+  compact — one job per line with compact separators (default; smallest, diff-friendly)
+  pretty  — the original json.dump(indent=2) layout, byte for byte
+Optional siblings written in the same pass: jobs.json.gz (deterministic: mtime 0),
+jobs.json.br (when the brotli module is installed) and jobs.ndjson (one job per line).
+write_delta() writes jobs_delta.json ({"run_at", "previous_run_at", "added", "updated",
+"removed"}) in the same styles.
+Every file is written to a temp path and renamed into place. When the new jobs.json
+is byte-identical to the existing one (and every enabled sibling exists), the temp
+files are dropped and nothing on disk changes.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # type: ignore
+
+LOG = logging.getLogger(__name__)
+
+STYLES = ("compact", "pretty")
+
+
+@dataclass(frozen=True)
+class Written:
+    count: int  # jobs written
+    changed: bool  # False when the existing files were kept as they were
+
+
+class _BrotliWriter:
+    """Minimal binary file wrapper that brotli-compresses what is written."""
+
+    def __init__(self, raw: BinaryIO) -> None:
+        self._raw = raw
+        self._comp = brotli.Compressor(quality=11)
+
+    def write(self, data: bytes) -> None:
+        out = self._comp.process(data)
+        if out:
+            self._raw.write(out)
+
+    def close(self) -> None:
+        self._raw.write(self._comp.finish())
+        self._raw.close()
+
+
+def _encode(job: dict[str, Any], style: str) -> str:
+    if style == "pretty":
+        body = json.dumps(job, indent=2, ensure_ascii=False)
+        return "\n".join("    " + line for line in body.splitlines())
+    return json.dumps(job, ensure_ascii=False, separators=(",", ":"))
+
+
+def _frame(style: str) -> tuple[str, str, str, str]:
+    """(head, separator, tail-with-jobs, tail-when-empty) around the encoded jobs."""
+    if style == "pretty":
+        return '{\n  "jobs": [\n', ",\n", '\n  ],\n  "count": %d\n}', '{\n  "jobs": [],\n  "count": %d\n}'
+    return '{"jobs":[\n', ",\n", '\n],"count":%d}\n', '{"jobs":[],"count":%d}\n'
+
+
+def _sha256_file(path: Path) -> str | None:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+    except OSError:
+        return None
+
+
+def write_jobs_json(
+    path: Path,
+    jobs: Iterable[dict[str, Any]],
+    *,
+    style: str = "compact",
+    gzip_sibling: bool = True,
+    brotli_sibling: bool = True,
+    ndjson: bool = False,
+) -> Written:
+    """Stream jobs to path (and its enabled siblings); keeps the old files when nothing changed."""
+    if style not in STYLES:
+        raise ValueError(f"unknown output style {style!r}; expected one of {STYLES}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    targets: list[tuple[Path, Path, Any]] = []
+
+    def _open(final: Path, opener: Any) -> Any:
+        tmp = final.with_name(final.name + ".tmp")
+        fh = opener(tmp)
+        targets.append((tmp, final, fh))
+        return fh
+
+    main_fh = _open(path, lambda p: open(p, "wb"))
+    compressed = []
+    if gzip_sibling:
+        compressed.append(
+            _open(path.with_name(path.name + ".gz"), lambda p: gzip.GzipFile(p, "wb", compresslevel=9, mtime=0))
+        )
+    if brotli_sibling and brotli is not None:
+        compressed.append(_open(path.with_name(path.name + ".br"), lambda p: _BrotliWriter(open(p, "wb"))))
+    nd_fh = _open(path.with_suffix(".ndjson"), lambda p: open(p, "wb")) if ndjson else None
+
+    digest = hashlib.sha256()
+
+    def _emit(text: str) -> None:
+        data = text.encode("utf-8")
+        digest.update(data)
+        main_fh.write(data)
+        for fh in compressed:
+            fh.write(data)
+
+    head, sep, tail, empty = _frame(style)
+    count = 0
+    try:
+        for job in jobs:
+            _emit((head if count == 0 else sep) + _encode(job, style))
+            if nd_fh is not None:
+                nd_fh.write((json.dumps(job, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8"))
+            count += 1
+        _emit((tail if count else empty) % count)
+    except BaseException:
+        for tmp, _final, fh in targets:
+            fh.close()
+            tmp.unlink(missing_ok=True)
+        raise
+    for _tmp, _final, fh in targets:
+        fh.close()
+    if _sha256_file(path) == digest.hexdigest() and all(final.exists() for _tmp, final, _fh in targets):
+        for tmp, _final, _fh in targets:
+            tmp.unlink()
+        LOG.info("%s unchanged (%d jobs); kept the existing files", path, count)
+        return Written(count, changed=False)
+    for tmp, final, _fh in targets:
+        os.replace(tmp, final)
+    LOG.info(
+        "Wrote %s (%d jobs, %s: %s)",
+        path,
+        count,
+        style,
+        ", ".join(f"{final.name} {final.stat().st_size / 1024:.1f} KiB" for _tmp, final, _fh in targets),
+    )
+    return Written(count, changed=True)
+
+
+def write_delta(path: Path, delta: dict[str, Any], *, style: str = "compact") -> None:
+    """Write jobs_delta.json: scalar keys as given, job lists one job per line (compact) or indented (pretty)."""
+    if style not in STYLES:
+        raise ValueError(f"unknown output style {style!r}; expected one of {STYLES}")
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        if style == "pretty":
+            json.dump(delta, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        else:
+            parts = []
+            for key, value in delta.items():
+                if isinstance(value, list) and value:
+                    value_text = "[\n" + ",\n".join(_encode(j, style) for j in value) + "\n]"
+                else:
+                    value_text = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+                parts.append(json.dumps(key) + ":" + value_text)
+            f.write("{" + ",".join(parts) + "}\n")
+    os.replace(tmp, path)
+    LOG.info("Wrote %s", path)
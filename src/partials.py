@@ -0,0 +1,132 @@
+"""
+Sharded runs: deterministic assignment of boards, feeds and search terms to shard i
+of N, and the partial result files that shard workers (python -m src.run --shard i/N)
+write for python -m src.merge.
+  data/partials/jobs.I-of-N.ndjson.gz    header line {"shard": I, "shards": N, "run_at": ..., "run_id": ...,
+                                         "sources": ...},
+                                         then one keyword-matched job per line
+  data/partials/run_metrics.I-of-N.json  the worker's run metrics
+Assignment hashes a stable key (slug, site id, feed host, search term), so a board
+stays on the same shard when the lists around it change.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any, TypeVar
+
+from src.normalize import Job
+
+LOG = logging.getLogger(__name__)
+
+T = TypeVar("T")
+Shard = tuple[int, int]  # (i, N), 1 <= i <= N
+
+PARTIALS_DIR = "partials"
+_PARTIAL_RE = re.compile(r"^jobs\.(\d+)-of-(\d+)\.ndjson\.gz$")
+
+
+def parse_shard(value: str) -> Shard:
+    """'2/4' -> (2, 4). Raises ValueError unless 1 <= i <= N."""
+    i, sep, n = value.partition("/")
+    if not sep or not i.strip().isdigit() or not n.strip().isdigit():
+        raise ValueError(f"expected i/N, got {value!r}")
+    shard = int(i), int(n)
+    if not 1 <= shard[0] <= shard[1]:
+        raise ValueError(f"shard {value!r} out of range (1 <= i <= N)")
+    return shard
+
+
+def shard_label(shard: Shard) -> str:
+    return f"{shard[0]}-of-{shard[1]}"
+
+
+def in_shard(key: str, shard: Shard) -> bool:
+    digest = hashlib.sha1(key.strip().lower().encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shard[1] == shard[0] - 1
+
+
+def select(items: Iterable[T], key: Callable[[T], str], shard: Shard | None) -> list[T]:
+    """The items of shard (all of them when shard is None)."""
+    if shard is None:
+        return list(items)
+    return [item for item in items if in_shard(key(item), shard)]
+
+
+def partial_path(directory: Path, shard: Shard) -> Path:
+    return directory / f"jobs.{shard_label(shard)}.ndjson.gz"
+
+
+def metrics_path(directory: Path, shard: Shard) -> Path:
+    return directory / f"run_metrics.{shard_label(shard)}.json"
+
+
+def write_partial(
+    path: Path,
+    jobs: Iterable[Job],
+    *,
+    shard: Shard,
+    run_at: str,
+    run_id: str | None = None,
+    sources: list[str] | None = None,
+) -> int:
+    """
+    Stream jobs to a gzipped NDJSON partial (temp file + rename). Returns the job count.
+    run_id: shared by the workers of one sharded run (src.merge checks it).
+    sources: the sources the worker ran, when only some of them (--sources).
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    count = 0
+    with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as f:
+        header = {"shard": shard[0], "shards": shard[1], "run_at": run_at, "run_id": run_id, "sources": sources}
+        f.write(json.dumps(header) + "\n")
+        for job in jobs:
+            f.write(json.dumps(job.to_dict(), ensure_ascii=False, separators=(",", ":")) + "\n")
+            count += 1
+    os.replace(tmp, path)
+    LOG.info("Wrote %s (%d jobs)", path, count)
+    return count
+
+
+def find_partials(directory: Path, shards: int | None = None) -> list[Path]:
+    """
+    The partial files of one complete set (shard 1..N), in shard order. N is `shards`,
+    or the only N present. Raises ValueError if N is ambiguous or a shard is missing:
+    merging an incomplete set would close every job of the missing shards.
+    """
+    found: dict[int, dict[int, Path]] = {}
+    for path in directory.glob("jobs.*-of-*.ndjson.gz"):
+        m = _PARTIAL_RE.match(path.name)
+        if m:
+            found.setdefault(int(m.group(2)), {})[int(m.group(1))] = path
+    if shards is None:
+        if len(found) != 1:
+            raise ValueError(
+                f"expected partials of one shard count in {directory}, found {sorted(found) or 'none'}; pass --shards N"
+            )
+        shards = next(iter(found))
+    have = found.get(shards, {})
+    missing = [i for i in range(1, shards + 1) if i not in have]
+    if missing:
+        raise ValueError(f"missing partials for shard(s) {missing} of {shards} in {directory}")
+    return [have[i] for i in range(1, shards + 1)]
+
+
+def read_header(path: Path) -> dict[str, Any]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.loads(f.readline() or "{}")
+
+
+def iter_partial(path: Path) -> Iterator[Job]:
+    """Jobs of one partial file, in the order they were written."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        f.readline()  # header
+        for line in f:
+            if line.strip():
+                yield Job.from_dict(json.loads(line))
@@ -1,25 +1,36 @@
 """
-Orchestrator: load config, run all scrapers, merge, dedupe, filter by keywords,
-write data/jobs.json and data/last_run.txt.
-Run from repo root: python src/run.py
+Orchestrator: load config, run the scraper plugins (all, or --sources), dedupe, filter by keywords,
+record the run in .cache/jobs.db, and write data/jobs.json, data/jobs_delta.json,
+data/run_metrics.json, data/last_run.txt and a history snapshot under .cache/archive/.
+With --shard i/N only shard i of every source list is scraped and the keyword-matched
+jobs go to a partial file under data/partials/; python -m src.merge combines them.
+Run from repo root: python -m src.run [--format compact|pretty] [--no-compress] [--ndjson] [--no-archive] [--root DIR]
+    [--sources NAME,...] [--full-sweep] [--shard i/N [--run-id ID]] [--profile]
 """
 
+import argparse
 import json
 import logging
 import os
+import time
+from collections.abc import Iterable, Iterator
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any
 
 import yaml
 
-from src.filters import filter_jobs_by_keywords, load_keywords
-from src.normalize import deduplicate_jobs
-from src.scrapers import (
-    fetch_crypto_board_jobs,
-    fetch_greenhouse_jobs,
-    fetch_jobspy_jobs,
-    fetch_lever_jobs,
-)
+from src import archive, host_limits, http_cache, http_client
+from src.filters import iter_filter_jobs
+from src.job_store import JobStore
+from src import metrics, partials
+from src.metrics import StageTimer, write_run_metrics
+from src.normalize import Deduplicator, Job
+from src.partials import Shard
+from src.scheduler import Scheduler
+from src.output import STYLES, write_delta, write_jobs_json
+from src.shards import write_shards
+from src.scrapers import PLUGINS, SourceContext, parse_sources
 
 logging.basicConfig(
     level=logging.INFO,
@@ -38,114 +49,267 @@ def _load_yaml(path: Path) -> dict | list:
         return yaml.safe_load(f) or {}
 
 
-def _load_slugs_from_file(path: Path, key_slug: str, key_name: str) -> list[dict]:
-    """Load one slug/id per line from a text file (# = comment). Returns list of dicts."""
-    if not path.exists():
-        return []
-    out = []
-    with open(path, encoding="utf-8") as f:
-        for line in f:
-            line = line.split("#")[0].strip()
-            if not line:
-                continue
-            out.append({key_slug: line, key_name: line})
-    return out
+def load_keywords(config_dir: Path) -> list[str]:
+    """Keywords from config/keywords.yaml (a list, or a mapping with a `keywords` list)."""
+    keywords_cfg = _load_yaml(config_dir / "keywords.yaml")
+    if isinstance(keywords_cfg, dict) and "keywords" in keywords_cfg:
+        return list(keywords_cfg["keywords"] or [])
+    if isinstance(keywords_cfg, list):
+        return list(keywords_cfg)
+    return []
+
+
+def _counted(timer: StageTimer, stage: str, label: str, jobs: Iterable[Job]) -> Iterator[Job]:
+    """Pass jobs through as stage `stage` of timer, logging how many went by once exhausted."""
+    yield from timer.wrap(stage, jobs)
+    LOG.info("%s: %d jobs", label, timer.items[stage])
+
+
+def _iter_source_jobs(
+    companies_cfg: dict,
+    config_dir: Path,
+    timer: StageTimer,
+    sources: list[str],
+    scheduler: Scheduler | None = None,
+    shard: Shard | None = None,
+) -> Iterator[Job]:
+    """
+    Yield normalized jobs from each source plugin in `sources`, one source after another.
+    A plugin's module is imported only when its turn comes.
+    scheduler (optional) decides which Greenhouse boards / Lever sites are polled.
+    shard (optional) limits every source list to the boards, feeds and terms of that shard.
+    """
+    ctx = SourceContext(companies_cfg, config_dir, scheduler, shard)
+    for name in sources:
+        plugin = PLUGINS[name]
+        yield from _counted(timer, name, plugin.label, plugin.load()(ctx))
+
+
+def _shard_arg(value: str) -> Shard:
+    try:
+        return partials.parse_shard(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
+
+def _sources_arg(value: str) -> list[str]:
+    try:
+        return parse_sources(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
+
+def add_output_args(parser: argparse.ArgumentParser) -> None:
+    """--format, --no-compress, --ndjson, --no-archive and --root (shared with src.merge)."""
+    parser.add_argument(
+        "--format",
+        choices=STYLES,
+        default="compact",
+        help="jobs.json layout: compact (one job per line) or pretty (indent=2)",
+    )
+    parser.add_argument("--no-compress", action="store_true", help="skip the jobs.json.gz / .br siblings")
+    parser.add_argument("--ndjson", action="store_true", help="also write data/jobs.ndjson")
+    parser.add_argument("--no-archive", action="store_true", help="skip the history snapshot in .cache/archive/")
+    parser.add_argument(
+        "--root",
+        type=Path,
+        help="project directory holding config/, data/ and .cache/ (default: the repo root)",
+    )
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Scrape crypto/web3 jobs and write data/jobs.json.")
+    add_output_args(parser)
+    parser.add_argument(
+        "--shard",
+        type=_shard_arg,
+        metavar="i/N",
+        help="scrape only shard i of N of every source and write data/partials/ for src.merge",
+    )
+    parser.add_argument(
+        "--run-id",
+        default=os.environ.get("GITHUB_RUN_ID"),
+        help="id shared by all shard workers of one run, checked by src.merge (default: $GITHUB_RUN_ID)",
+    )
+    parser.add_argument(
+        "--sources",
+        type=_sources_arg,
+        metavar="NAME,...",
+        help=f"run only these sources ({', '.join(PLUGINS)}); jobs of the others stay open in the store",
+    )
+    parser.add_argument(
+        "--full-sweep",
+        action="store_true",
+        help="poll every board this run, whatever the scheduler in companies.yaml would skip",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="run under cProfile + tracemalloc; report in .cache/profile/run.txt (slower)",
+    )
+    return parser.parse_args(argv)
 
 
-def main() -> None:
-    root = _project_root()
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
+    if not args.profile:
+        _run(args)
+        return
+    root = args.root.resolve() if args.root else _project_root()
+    with metrics.profiled(root / ".cache" / "profile"):
+        _run(args)
+
+
+def _run(args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    root = args.root.resolve() if args.root else _project_root()
     os.chdir(root)
+    if args.root:
+        http_cache.configure(directory=root / ".cache" / "http")
+    http_client.reset_stats()
+    metrics.reset_boards()
+    http_cache.reset_stats()
+    host_limits.configure(root / ".cache" / "host_limits.json")
 
     config_dir = root / "config"
-    companies_path = config_dir / "companies.yaml"
-    keywords_path = config_dir / "keywords.yaml"
     data_dir = root / "data"
     data_dir.mkdir(parents=True, exist_ok=True)
 
-    companies_cfg = _load_yaml(companies_path)
+    companies_cfg = _load_yaml(config_dir / "companies.yaml")
     if not isinstance(companies_cfg, dict):
         companies_cfg = {}
-    keywords_cfg = _load_yaml(keywords_path)
-    if isinstance(keywords_cfg, dict) and "keywords" in keywords_cfg:
-        keywords_list = list(keywords_cfg["keywords"] or [])
-    elif isinstance(keywords_cfg, list):
-        keywords_list = list(keywords_cfg)
-    else:
-        keywords_list = []
-
-    all_jobs: list[dict] = []
-
-    # Greenhouse: YAML lists + optional greenhouse_slugs.txt (one slug per line)
-    greenhouse_list: list[dict] = []
-    for key in ("greenhouse", "greenhouse_non_crypto"):
-        part = companies_cfg.get(key) or []
-        if isinstance(part, list):
-            greenhouse_list.extend(part)
-    extra_gh = _load_slugs_from_file(config_dir / "greenhouse_slugs.txt", "slug", "name")
-    if extra_gh:
-        greenhouse_list = greenhouse_list + extra_gh
-        LOG.info("Greenhouse: %d from YAML + %d from greenhouse_slugs.txt", len(greenhouse_list) - len(extra_gh), len(extra_gh))
-    if greenhouse_list:
-        jobs = fetch_greenhouse_jobs(greenhouse_list)
-        all_jobs.extend(jobs)
-        LOG.info("Greenhouse: %d jobs", len(jobs))
-
-    # Lever: YAML list + optional lever_sites.txt (one site id per line)
-    lever_list = list(companies_cfg.get("lever") or [])
-    if not isinstance(lever_list, list):
-        lever_list = []
-    extra_lever = _load_slugs_from_file(config_dir / "lever_sites.txt", "id", "name")
-    if extra_lever:
-        lever_list = lever_list + extra_lever
-        LOG.info("Lever: %d from YAML + %d from lever_sites.txt", len(lever_list) - len(extra_lever), len(extra_lever))
-    if lever_list:
-        jobs = fetch_lever_jobs(lever_list)
-        all_jobs.extend(jobs)
-        LOG.info("Lever: %d jobs", len(jobs))
-
-    crypto_boards_list = companies_cfg.get("crypto_boards") or []
-    if isinstance(crypto_boards_list, list):
-        jobs = fetch_crypto_board_jobs(crypto_boards_list)
-        all_jobs.extend(jobs)
-        LOG.info("Crypto boards: %d jobs", len(jobs))
-
-    # JobSpy: LinkedIn, Indeed, etc. (optional; requires python-jobspy)
-    jobspy_cfg = companies_cfg.get("jobspy")
-    if isinstance(jobspy_cfg, dict) and jobspy_cfg.get("enabled"):
-        terms = jobspy_cfg.get("search_terms") or ["blockchain", "crypto", "web3"]
-        sites = jobspy_cfg.get("sites") or ["linkedin", "indeed"]
-        wanted = jobspy_cfg.get("results_wanted") or 40
-        hours = jobspy_cfg.get("hours_old")
-        jobs = fetch_jobspy_jobs(
-            search_terms=terms,
-            site_name=sites,
-            results_wanted=wanted,
-            hours_old=hours,
-        )
-        all_jobs.extend(jobs)
-        LOG.info("JobSpy: %d jobs", len(jobs))
-
-    all_jobs = deduplicate_jobs(all_jobs)
-    LOG.info("After dedupe: %d jobs", len(all_jobs))
+    keywords_list = load_keywords(config_dir)
 
+    # Streaming pipeline: scrapers -> keyword filter -> dedupe -> job store.
+    # Non-matching jobs are dropped as soon as they are parsed, so only the
+    # filtered output (plus the dedupe key set) is ever held in memory.
+    shard: Shard | None = args.shard
+    state_name = f"board_state.{partials.shard_label(shard)}.json" if shard else "board_state.json"
+    scheduler = Scheduler.from_config(
+        companies_cfg.get("scheduler"), root / ".cache" / state_name, full_sweep=args.full_sweep, sources=args.sources
+    )
+    if scheduler is not None and shard and scheduler.request_budget is not None:
+        scheduler.request_budget = -(-scheduler.request_budget // shard[1])
+    timer = StageTimer()
+    sources: list[str] = args.sources or list(PLUGINS)
+    jobs: Iterable[Job] = _iter_source_jobs(companies_cfg, config_dir, timer, sources, scheduler, shard)
     if keywords_list:
-        all_jobs = filter_jobs_by_keywords(all_jobs, keywords_list)
-        LOG.info("After keyword filter: %d jobs", len(all_jobs))
-
-    jobs_path = data_dir / "jobs.json"
-    with open(jobs_path, "w", encoding="utf-8") as f:
-        json.dump(
-            {"jobs": all_jobs, "count": len(all_jobs)},
-            f,
-            indent=2,
-            ensure_ascii=False,
-        )
-    LOG.info("Wrote %s", jobs_path)
-
-    last_run_path = data_dir / "last_run.txt"
+        jobs = _counted(timer, "filter", "After keyword filter", iter_filter_jobs(jobs, keywords_list))
+    jobs = metrics.count_matched(jobs)
+
+    run_at = datetime.now(tz=timezone.utc).isoformat()
+    extra: dict[str, Any] = {}
+    if shard:
+        partials_dir = data_dir / partials.PARTIALS_DIR
+        with timer.stage("partial"):
+            partials.write_partial(
+                partials.partial_path(partials_dir, shard),
+                jobs,
+                shard=shard,
+                run_at=run_at,
+                run_id=args.run_id,
+                sources=args.sources,
+            )
+        metrics_path = partials.metrics_path(partials_dir, shard)
+    else:
+        extra["data_changed_at"] = publish(jobs, data_dir, args, timer, run_at, close_missing=args.sources is None)
+        metrics_path = data_dir / "run_metrics.json"
+    http_client.log_stats()
+    http_cache.log_stats()
+    host_limits.save()
+    if scheduler is not None:
+        scheduler.update(metrics.boards())
+        scheduler.save()
+
+    write_run_metrics(
+        metrics_path,
+        run_at=run_at,
+        wall_seconds=time.perf_counter() - started,
+        timer=timer,
+        extra=extra,
+    )
+
+
+def store_path(data_dir: Path) -> Path:
+    """
+    The job store, .cache/jobs.db next to data_dir: it changes on every run, so it is kept
+    (in CI by actions/cache) but never committed or published. A data/jobs.db left by
+    earlier versions is moved there.
+    """
+    path = data_dir.parent / ".cache" / "jobs.db"
+    legacy = data_dir / "jobs.db"
+    if legacy.exists() and not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(legacy, path)
+        LOG.info("Moved %s to %s", legacy, path)
+    return path
+
+
+def _read_text(path: Path) -> str:
+    try:
+        return path.read_text(encoding="utf-8").strip()
+    except OSError:
+        return ""
+
+
+def publish(
+    jobs: Iterable[Job],
+    data_dir: Path,
+    args: argparse.Namespace,
+    timer: StageTimer,
+    run_at: str,
+    *,
+    close_missing: bool = True,
+) -> str:
+    """
+    Dedupe keyword-matched jobs, record them in the job store and write data/jobs.json
+    (plus siblings per args), the dashboard shards, jobs_delta.json, last_run.txt and a
+    snapshot in .cache/archive/. When jobs.json comes out byte-identical, the other files are left untouched too, so
+    a run that found no changes leaves nothing in data/ to commit. last_run.txt therefore
+    holds the time of the last run that changed the data; every run's own time is in
+    run_metrics.json, which is not committed.
+    close_missing=False (runs of only some sources) leaves unseen jobs open.
+    Returns the time of the last data change (run_at when this run changed the data).
+    """
+    dedupe = Deduplicator()
+    jobs = _counted(timer, "dedupe", "After dedupe", dedupe(jobs))
+    with JobStore(store_path(data_dir)) as store:
+        with timer.stage("store"):
+            diff = store.record_run(jobs, run_at, close_missing=close_missing)
+            store.record_merges(run_at, dedupe.merged)
+        with timer.stage("export"):
+            written = write_jobs_json(
+                data_dir / "jobs.json",
+                store.open_jobs(),
+                style=args.format,
+                gzip_sibling=not args.no_compress,
+                brotli_sibling=not args.no_compress,
+                ndjson=args.ndjson,
+            )
+        last_run_path = data_dir / "last_run.txt"
+        previous_run_at = _read_text(last_run_path)
+        if not written.changed and previous_run_at and (data_dir / "manifest.json").exists():
+            LOG.info("No changes since the run of %s; left the published files as they were", previous_run_at)
+            return previous_run_at
+        with timer.stage("shards"):
+            store.assign_ids()
+            write_shards(data_dir, store.published_jobs(), generated_at=run_at)
+        if not args.no_archive:
+            with timer.stage("archive"):
+                archive.write_snapshot(data_dir.parent / ".cache" / archive.ARCHIVE_DIR, store.open_jobs(), run_at)
+        delta = {
+            "run_at": run_at,
+            "previous_run_at": previous_run_at or None,
+            "added": store.jobs_by_key(diff.added),
+            "updated": store.jobs_by_key(diff.updated),
+            "removed": store.jobs_by_key(diff.closed),
+        }
+
+    write_delta(data_dir / "jobs_delta.json", delta, style=args.format)
     with open(last_run_path, "w", encoding="utf-8") as f:
-        f.write(datetime.now(tz=timezone.utc).isoformat())
+        f.write(run_at)
     LOG.info("Wrote %s", last_run_path)
+    return run_at
 
 
 if __name__ == "__main__":
@@ -0,0 +1,211 @@
+"""
+Adaptive polling for Greenhouse boards and Lever sites.
+Per-board history lives in .cache/board_state.json: when the board's content last
+changed, its posting velocity (content changes per day, smoothed), and how many jobs
+and keyword-matching jobs it had on its last poll. After each poll a board is
+scheduled:
+  - new, or changed within active_days, with matching jobs -> polled every run
+  - new or changed, without matching jobs                   -> again after base_interval_days
+  - unchanged or failing                                    -> interval doubles, up to max_interval_days
+Due boards are polled in priority order (never-seen boards, then matching boards by
+velocity, then the most overdue) up to request_budget per run; the rest stay due for
+the next run. Every full_sweep_days (and with --full-sweep) all boards are polled.
+A board that is not polled yields the jobs cached for it by http_cache, so it stays
+open in the job store; a board with nothing cached is always polled.
+A run of only some sources (--sources) keeps the history of the others, and only a
+full sweep of every scheduled source restarts the full_sweep_days clock.
+"""
+
+import json
+import logging
+import os
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any
+
+from src.metrics import BoardMetrics
+
+LOG = logging.getLogger(__name__)
+
+STATE_VERSION = 1
+DAY = 86400.0
+# Runs start a little earlier or later each day; a board due within this window counts as due.
+SLACK_SECONDS = 3600.0
+VELOCITY_ALPHA = 0.3
+SCHEDULED_SOURCES = ("greenhouse", "lever")
+
+
+@dataclass
+class BoardState:
+    last_polled: float = 0.0
+    last_changed: float = 0.0
+    interval_days: float = 0.0
+    velocity: float = 0.0  # content changes per day (exponential moving average)
+    jobs: int = 0
+    matched: int = 0
+    polls: int = 0
+    failures: int = 0
+
+    @property
+    def next_due(self) -> float:
+        return self.last_polled + self.interval_days * DAY
+
+
+class Scheduler:
+    """Decides which boards to poll this run and learns from the run's board metrics."""
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        request_budget: int | None = 400,
+        base_interval_days: float = 2.0,
+        max_interval_days: float = 8.0,
+        active_days: float = 3.0,
+        min_matched: int = 1,
+        full_sweep_days: float = 14.0,
+        full_sweep: bool = False,
+        sources: Iterable[str] | None = None,
+        now: float | None = None,
+    ) -> None:
+        self.path = path
+        # Scheduled sources this run covers (--sources); the history of the others is kept as it is.
+        self.sources = frozenset(SCHEDULED_SOURCES if sources is None else set(sources) & set(SCHEDULED_SOURCES))
+        self.request_budget = request_budget
+        self.base_interval_days = base_interval_days
+        self.max_interval_days = max_interval_days
+        self.active_days = active_days
+        self.min_matched = min_matched
+        self.full_sweep_days = full_sweep_days
+        self.now = time.time() if now is None else now
+        self.boards: dict[str, BoardState] = {}
+        self.last_full_sweep = 0.0
+        self._load()
+        self.full_sweep = full_sweep or self.now - self.last_full_sweep >= full_sweep_days * DAY - SLACK_SECONDS
+        self._planned: set[str] = set()
+        self._poll: set[str] = set()
+
+    @classmethod
+    def from_config(
+        cls, cfg: Any, path: Path, *, full_sweep: bool = False, sources: Iterable[str] | None = None
+    ) -> "Scheduler | None":
+        """Scheduler for the `scheduler:` section of companies.yaml; None unless enabled."""
+        if not isinstance(cfg, dict) or not cfg.get("enabled"):
+            return None
+        options = {
+            k: cfg[k]
+            for k in (
+                "request_budget",
+                "base_interval_days",
+                "max_interval_days",
+                "active_days",
+                "min_matched",
+                "full_sweep_days",
+            )
+            if cfg.get(k) is not None
+        }
+        return cls(path, full_sweep=full_sweep, sources=sources, **options)
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != STATE_VERSION:
+            return
+        known = {f.name for f in fields(BoardState)}
+        for key, raw in (data.get("boards") or {}).items():
+            if isinstance(raw, dict):
+                self.boards[key] = BoardState(**{k: v for k, v in raw.items() if k in known})
+        self.last_full_sweep = float(data.get("last_full_sweep") or 0.0)
+
+    def _priority(self, key: str) -> tuple[Any, ...]:
+        st = self.boards.get(key)
+        if st is None:
+            return (0, 0.0, 0.0)
+        return (1 if st.matched >= self.min_matched else 2, -st.velocity, st.next_due)
+
+    def plan(self, source: str, boards: Iterable[str]) -> None:
+        """Choose which of `boards` (slugs / site ids of one source) to poll this run."""
+        keys = [f"{source}:{b}" for b in dict.fromkeys(boards) if b]
+        self._planned.update(keys)
+        if self.full_sweep:
+            self._poll.update(keys)
+            LOG.info("Scheduler %s: full sweep, polling all %d boards", source, len(keys))
+            return
+        due = [k for k in keys if k not in self.boards or self.boards[k].next_due <= self.now + SLACK_SECONDS]
+        due.sort(key=self._priority)
+        budget = self.request_budget
+        if budget is not None:
+            budget = max(0, budget - len(self._poll))
+        poll = due if budget is None else due[:budget]
+        self._poll.update(poll)
+        LOG.info(
+            "Scheduler %s: polling %d of %d boards (%d due, %d deferred by the request budget)",
+            source,
+            len(poll),
+            len(keys),
+            len(due),
+            len(due) - len(poll),
+        )
+
+    def should_poll(self, source: str, board: str) -> bool:
+        key = f"{source}:{board}"
+        return key not in self._planned or key in self._poll
+
+    def update(self, rows: Iterable[BoardMetrics]) -> None:
+        """Record this run's polls (board metrics with matched counts filled in)."""
+        for m in rows:
+            if m.source not in SCHEDULED_SOURCES or m.cache == "skipped":
+                continue
+            key = f"{m.source}:{m.board}"
+            st = self.boards.get(key)
+            if st is None:
+                st = self.boards[key] = BoardState()
+            first = st.polls == 0
+            # Without the cache (cache == "") a change cannot be told apart from a re-fetch.
+            # A first poll says nothing about activity either.
+            changed = not first and not m.error and m.cache not in ("not_modified", "same_body")
+            if not first:
+                rate = (1.0 if changed else 0.0) * DAY / max(self.now - st.last_polled, SLACK_SECONDS)
+                st.velocity = round(VELOCITY_ALPHA * rate + (1 - VELOCITY_ALPHA) * st.velocity, 4)
+            if changed:
+                st.last_changed = self.now
+            if m.error:
+                st.failures += 1
+            else:
+                st.failures = 0
+                st.jobs, st.matched = m.jobs, m.matched
+            active = first or self.now - st.last_changed < self.active_days * DAY
+            if not m.error and active and st.matched >= self.min_matched:
+                # Matching boards seen for the first time are polled again next run to learn their pace.
+                st.interval_days = 0.0
+            elif changed or (first and not m.error):
+                st.interval_days = self.base_interval_days
+            else:
+                st.interval_days = min(self.max_interval_days, max(self.base_interval_days, st.interval_days * 2))
+            st.last_polled = self.now
+            st.polls += 1
+
+    def save(self) -> None:
+        """
+        Write the board state. Boards of the sources run are kept if they were planned
+        (boards dropped from config are forgotten); boards of other sources keep their entry.
+        """
+        if self.full_sweep and self.sources == frozenset(SCHEDULED_SOURCES):
+            self.last_full_sweep = self.now
+        boards = {
+            k: asdict(st)
+            for k, st in sorted(self.boards.items())
+            if k in self._planned or k.partition(":")[0] not in self.sources
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": STATE_VERSION, "last_full_sweep": self.last_full_sweep, "boards": boards}, f)
+        os.replace(tmp, self.path)
+        every_run = sum(1 for k in boards if self.boards[k].interval_days == 0)
+        LOG.info("Scheduler: %d boards tracked, %d polled every run; wrote %s", len(boards), every_run, self.path)
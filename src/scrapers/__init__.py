@@ -1,11 +1,114 @@
-from .greenhouse import fetch_greenhouse_jobs
-from .lever import fetch_lever_jobs
-from .crypto_boards import fetch_crypto_board_jobs
-from .jobspy_scraper import fetch_jobspy_jobs
+"""
+Scraper plugins, by source name. A plugin is a module with
+    iter_jobs(ctx: SourceContext) -> Iterator[Job]
+that reads its own section of companies.yaml (and any slug files) and yields
+normalized jobs, or nothing when the source is not configured. Modules are imported
+only when their source runs, so a Greenhouse-only run never imports JobSpy/pandas or
+feedparser. To add a source, write the module and add it to PLUGINS (or register()
+it); run.py runs every registered source, or the ones picked with --sources.
+The fetch_* functions are still importable from here (loaded on first access).
+"""
+
+import importlib
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TypeVar
+
+from src import partials
+from src.normalize import Job
+from src.partials import Shard
+from src.scheduler import Scheduler
+
+T = TypeVar("T")
+
+
+@dataclass
+class SourceContext:
+    config: dict[str, Any]  # companies.yaml
+    config_dir: Path
+    scheduler: Scheduler | None = None
+    shard: Shard | None = None
+
+    def select(self, items: Iterable[T], key: Callable[[T], str]) -> list[T]:
+        """The items of this run's shard (all of them in an unsharded run)."""
+        return partials.select(items, key, self.shard)
+
+
+@dataclass(frozen=True)
+class Plugin:
+    name: str  # used by --sources and as the stage name in run metrics
+    module: str
+    label: str  # for log lines
+
+    def load(self) -> Callable[[SourceContext], Iterator[Job]]:
+        return importlib.import_module(self.module).iter_jobs
+
+
+PLUGINS: dict[str, Plugin] = {
+    p.name: p
+    for p in (
+        Plugin("greenhouse", "src.scrapers.greenhouse", "Greenhouse"),
+        Plugin("lever", "src.scrapers.lever", "Lever"),
+        Plugin("crypto_boards", "src.scrapers.crypto_boards", "Crypto boards"),
+        Plugin("jobspy", "src.scrapers.jobspy_scraper", "JobSpy"),
+    )
+}
+
+_LAZY = {
+    "fetch_greenhouse_jobs": "src.scrapers.greenhouse",
+    "fetch_lever_jobs": "src.scrapers.lever",
+    "fetch_crypto_board_jobs": "src.scrapers.crypto_boards",
+    "fetch_jobspy_jobs": "src.scrapers.jobspy_scraper",
+}
+
+
+def register(name: str, module: str, label: str | None = None) -> None:
+    """Add (or replace) a source; it runs after the built-in ones."""
+    PLUGINS[name] = Plugin(name, module, label or name)
+
+
+def parse_sources(value: str) -> list[str]:
+    """'greenhouse,lever' -> ["greenhouse", "lever"] in registry order. Raises ValueError on unknown names."""
+    names = {n.strip() for n in value.split(",") if n.strip()}
+    unknown = sorted(names - PLUGINS.keys())
+    if unknown:
+        raise ValueError(f"unknown source(s) {', '.join(unknown)}; choose from {', '.join(PLUGINS)}")
+    if not names:
+        raise ValueError("no sources given")
+    return [n for n in PLUGINS if n in names]
+
+
+def load_slugs_from_file(path: Path, key_slug: str, key_name: str) -> list[dict]:
+    """Load one slug/id per line from a text file (# = comment). Returns list of dicts."""
+    if not path.exists():
+        return []
+    out = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#")[0].strip()
+            if not line:
+                continue
+            out.append({key_slug: line, key_name: line})
+    return out
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module), name)
+
 
 __all__ = [
-    "fetch_greenhouse_jobs",
-    "fetch_lever_jobs",
+    "PLUGINS",
+    "Plugin",
+    "SourceContext",
     "fetch_crypto_board_jobs",
+    "fetch_greenhouse_jobs",
     "fetch_jobspy_jobs",
+    "fetch_lever_jobs",
+    "load_slugs_from_file",
+    "parse_sources",
+    "register",
 ]
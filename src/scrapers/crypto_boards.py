@@ -1,8 +1,21 @@
 """
 Crypto job boards: RSS feeds and simple APIs.
+
+Feeds are fetched concurrently (per-host concurrency is adapted by src.host_limits) and
+yielded in config order.
+A changed feed body is parsed in one pass with a pull parser; entries whose link was
+in the previous body reuse the job cached for it by http_cache, and only new links
+are normalized; the whole body is still read and parsed. A feed whose jobs have the
+same links, in the same order, as a feed earlier in the list (an alias such as /rss
+vs /feed, even when lastBuildDate or other timestamps differ) is cached like any
+other feed, but its jobs are not yielded again.
+feedparser, when installed, is the fallback for feeds that are not well-formed XML.
 """
 
+import hashlib
 import logging
+import xml.etree.ElementTree as ET
+from collections.abc import Iterable, Iterator
 from typing import Any
 from urllib.parse import urlparse
 
@@ -13,65 +26,200 @@ try:
 except ImportError:
     feedparser = None  # type: ignore
 
-from src.normalize import normalize_job
+from src import http_cache, metrics
+from src.fetcher import fetch_concurrently
+from src.metrics import BoardMetrics
+from src.normalize import Job, normalize_job
+from src.scrapers import SourceContext
 
 LOG = logging.getLogger(__name__)
 
+MAX_WORKERS = 8
+SNIPPET_CHARS = 500
+_CHUNK = 64 * 1024
+_ENTRY_TAGS = frozenset({"item", "entry"})
+
+
+def _local(tag: Any) -> str:
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+def _entry_fields(el: ET.Element) -> dict[str, str]:
+    """title/link/summary/author/source/published of one RSS <item> or Atom <entry>."""
+    fields: dict[str, str] = {}
+    for child in el:
+        name = _local(child.tag)
+        if name == "link":
+            href = child.get("href")
+            if href and child.get("rel", "alternate") == "alternate":
+                fields.setdefault("link", href.strip())
+            elif child.text and child.text.strip():
+                fields.setdefault("link", child.text.strip())
+            continue
+        if name in ("description", "content", "encoded"):
+            name = "summary"
+        elif name in ("pubDate", "date"):
+            name = "published"
+        elif name == "creator":
+            name = "author"
+        if name == "author" and len(child):
+            text = next(("".join(c.itertext()) for c in child if _local(c.tag) == "name"), "")
+        else:
+            text = "".join(child.itertext())
+        text = text.strip()
+        if text:
+            fields.setdefault(name, text)
+    return fields
+
+
+def _entry_link(el: ET.Element) -> str:
+    """Link of one entry as _entry_fields reads it ("" if none), without reading the other fields."""
+    for child in el:
+        if _local(child.tag) == "link":
+            href = child.get("href")
+            if href and child.get("rel", "alternate") == "alternate":
+                return href.strip()
+            if child.text and child.text.strip():
+                return child.text.strip()
+    return ""
+
+
+def _links_digest(links: Iterable[str]) -> str:
+    """Digest of an ordered list of entry links: equal for feeds that list the same entries."""
+    h = hashlib.sha256()
+    for link in links:
+        h.update(link.encode("utf-8") + b"\n")
+    return h.hexdigest()
+
+
+def _iter_entries(body: bytes) -> Iterator[ET.Element]:
+    """<item>/<entry> elements of an RSS/Atom document in document order, parsed chunk by chunk."""
+    parser = ET.XMLPullParser(events=("end",))
+    for start in range(0, len(body), _CHUNK):
+        parser.feed(body[start : start + _CHUNK])
+        for _event, el in parser.read_events():
+            if _local(el.tag) in _ENTRY_TAGS:
+                yield el
+                el.clear()
+    parser.close()
+
 
-def _parse_rss_feed(
-    feed_url: str,
+def _entry_job(
+    title: str,
+    link: str,
+    summary: str,
+    source_title: str,
+    author: str,
+    published: str | None,
     source_name: str,
-) -> list[dict[str, Any]]:
-    """Parse an RSS/Atom feed and return normalized jobs."""
-    out: list[dict[str, Any]] = []
-    if not feedparser:
-        LOG.warning("feedparser not installed; skipping RSS %s", feed_url)
-        return out
-    try:
-        resp = requests.get(feed_url, timeout=15)
-        resp.raise_for_status()
-        feed = feedparser.parse(resp.content)
-    except Exception as e:
-        LOG.warning("RSS %s (%s): %s", feed_url, source_name, e)
-        return out
+) -> Job | None:
+    """Normalize one feed entry; None if it has no title or link."""
+    title = (title or "").strip()
+    link = (link or "").strip()
+    if not title or not link:
+        return None
+    # Try to get company from source tag or author
+    company = (source_title or "").strip() or (author or "").strip()
+    # Some feeds put company in title like "Company Name - Job Title"
+    if not company and " - " in title:
+        company = title.split(" - ", 1)[0].strip()
+    return normalize_job(
+        title=title,
+        company=company or source_name,
+        url=link,
+        source=source_name,
+        location=None,
+        posted_date=published,
+        snippet=(summary or "")[:SNIPPET_CHARS] or None,
+    )
+
+
+def _jobs_from_feedparser(body: bytes, source_name: str) -> list[Job]:
+    """Full parse with feedparser (lenient with malformed feeds)."""
+    out: list[Job] = []
+    feed = feedparser.parse(body)
     for entry in feed.get("entries") or []:
-        title = (entry.get("title") or "").strip()
-        link = (entry.get("link") or "").strip()
-        if not title or not link:
-            continue
-        summary = (entry.get("summary") or entry.get("description") or "")[:500]
-        # Try to get company from source tag or author
-        company = ""
         src = entry.get("source") or {}
-        if isinstance(src, dict) and src.get("title"):
-            company = str(src.get("title", "")).strip()
-        if not company and entry.get("author"):
-            company = str(entry.get("author", "")).strip()
-        # Some feeds put company in title like "Company Name - Job Title"
-        if not company and " - " in title:
-            company = title.split(" - ", 1)[0].strip()
-        normalized = normalize_job(
-            title=title,
-            company=company or source_name,
-            url=link,
-            source=source_name,
-            location=None,
-            posted_date=entry.get("published"),
-            snippet=summary or None,
+        job = _entry_job(
+            entry.get("title") or "",
+            entry.get("link") or "",
+            entry.get("summary") or entry.get("description") or "",
+            str(src.get("title") or "") if isinstance(src, dict) else "",
+            str(entry.get("author") or ""),
+            entry.get("published"),
+            source_name,
         )
-        out.append(normalized)
+        if job is not None:
+            out.append(job)
     return out
 
 
+def _jobs_from_feed(body: bytes, source_name: str, previous: list[Job]) -> list[Job]:
+    """
+    Normalize the entries of one feed body. An entry whose link was in the previous
+    body reuses that job instead of being normalized again.
+    """
+    cached = {j.url: j for j in previous}
+    out: list[Job] = []
+    try:
+        for el in _iter_entries(body):
+            job = cached.get(_entry_link(el))
+            if job is None:
+                fields = _entry_fields(el)
+                job = _entry_job(
+                    fields.get("title", ""),
+                    fields.get("link", ""),
+                    fields.get("summary", ""),
+                    fields.get("source", ""),
+                    fields.get("author", ""),
+                    fields.get("published"),
+                    source_name,
+                )
+                if job is None:
+                    continue
+            out.append(job)
+    except ET.ParseError as e:
+        if feedparser is None:
+            raise
+        LOG.debug("RSS %s: not well-formed (%s); falling back to feedparser", source_name, e)
+        return _jobs_from_feedparser(body, source_name)
+    LOG.debug("RSS %s: %d entries, %d reused", source_name, len(out), sum(j.url in cached for j in out))
+    return out
+
+
+def _fetch_feed(feed_url: str, source_name: str) -> tuple[str, str, BoardMetrics, http_cache.Fetched]:
+    """
+    Fetch (cached) and parse one RSS/Atom feed. Returns no jobs on error. Aliases are
+    parsed and cached like any feed (the feed they mirror may fail or be removed later);
+    fetch_crypto_board_jobs skips their jobs.
+    """
+
+    def _parse(r: requests.Response, previous: list[Job]) -> list[Job]:
+        return _jobs_from_feed(r.content or b"", source_name, previous)
+
+    with metrics.track_board("rss", feed_url) as m:
+        try:
+            fetched = http_cache.fetch(feed_url, _parse, variant=source_name, timeout=15)
+        except Exception as e:
+            LOG.warning("RSS %s (%s): %s", feed_url, source_name, e)
+            m.error = str(e)
+            fetched = http_cache.Fetched([], "")
+        m.cache, m.jobs = fetched.cache, len(fetched.jobs)
+    return feed_url, source_name, m, fetched
+
+
 def fetch_crypto_board_jobs(
     boards: list[dict[str, Any]],
-) -> list[dict[str, Any]]:
+    *,
+    max_workers: int = MAX_WORKERS,
+) -> Iterator[Job]:
     """
     Fetch jobs from crypto job board URLs (RSS or API).
     boards: list of {url: str, name: str (optional)}
-    Returns list of normalized job dicts.
+    Yields normalized jobs feed by feed, in the order of boards; a feed listing the
+    same entries as an earlier one yields nothing.
     """
-    out: list[dict[str, Any]] = []
+    feeds: list[tuple[str, str]] = []
     for b in boards:
         url = (b.get("url") or "").strip()
         name = (b.get("name") or _name_from_url(url) or "crypto_board").strip()
@@ -79,11 +227,38 @@ def fetch_crypto_board_jobs(
             continue
         # Treat as RSS if it looks like feed or we get XML
         if "rss" in url.lower() or "feed" in url.lower() or url.endswith(".xml"):
-            out.extend(_parse_rss_feed(url, name))
+            feeds.append((url, name))
             continue
         # Optional: future API endpoints could be added here
         LOG.debug("Skipping unknown board format: %s", url)
-    return out
+
+    yielded: dict[str, str] = {}
+    for url, name, m, fetched in fetch_concurrently(
+        feeds,
+        lambda f: _fetch_feed(*f),
+        label="RSS",
+        max_workers=max_workers,
+    ):
+        digest = _links_digest(j.url for j in fetched.jobs) if fetched.jobs else ""
+        if digest in yielded:
+            LOG.info("RSS %s (%s): same entries as %s; skipped", url, name, yielded[digest])
+            m.cache, m.jobs = "alias", 0
+            continue
+        if digest:
+            yielded[digest] = url
+        metrics.consuming(m)
+        yield from fetched.jobs
+    metrics.consuming(None)
+
+
+def iter_jobs(ctx: SourceContext) -> Iterator[Job]:
+    """Plugin entry: feeds from companies.yaml (crypto_boards)."""
+    boards = ctx.config.get("crypto_boards") or []
+    if not isinstance(boards, list):
+        return
+    # By host, so alias feeds (/rss vs /feed) land on the same shard.
+    boards = ctx.select(boards, lambda b: f"rss:{urlparse(b.get('url') or '').netloc or b.get('url') or ''}")
+    yield from fetch_crypto_board_jobs(boards)
 
 
 def _name_from_url(url: str) -> str:
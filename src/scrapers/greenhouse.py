@@ -1,54 +1,112 @@
 """
 Greenhouse job board API client.
 GET https://boards-api.greenhouse.io/v1/boards/{board_token}/jobs
+Responses are parsed posting by posting from the response stream.
+With a scheduler, boards it does not poll this run yield their cached jobs.
 """
 
 import logging
-from typing import Any
+import os
+from collections.abc import Iterator
+from typing import Any, BinaryIO
 
-import requests
-
-from src.normalize import normalize_job
+from src import http_cache, metrics
+from src.fetcher import MAX_WORKERS, fetch_concurrently
+from src.json_stream import iter_array, read_chunks
+from src.metrics import BoardMetrics
+from src.normalize import Job, normalize_job
+from src.scheduler import Scheduler
+from src.scrapers import SourceContext, load_slugs_from_file
 
 LOG = logging.getLogger(__name__)
-BASE = "https://boards-api.greenhouse.io/v1/boards"
+# Overridable so benchmarks can point the scraper at a local stand-in server.
+BASE = os.environ.get("GREENHOUSE_API_BASE", "https://boards-api.greenhouse.io/v1/boards")
+
+
+def _parse_board(body: BinaryIO, name: str) -> list[Job]:
+    """Normalize one Greenhouse board response, one posting at a time."""
+    out: list[Job] = []
+    for j in iter_array(read_chunks(body), key="jobs"):
+        if not isinstance(j, dict):
+            continue
+        loc = j.get("location") or {}
+        loc_name = loc.get("name") if isinstance(loc, dict) else None
+        normalized = normalize_job(
+            title=j.get("title") or "",
+            company=name,
+            url=j.get("absolute_url") or "",
+            source="greenhouse",
+            location=loc_name,
+            posted_date=j.get("updated_at"),
+            snippet=None,
+        )
+        if normalized.url and normalized.title:
+            out.append(normalized)
+    return out
+
+
+def _fetch_board(company: dict[str, Any], scheduler: Scheduler | None) -> tuple[BoardMetrics | None, list[Job]]:
+    """Fetch and normalize one Greenhouse board (cached). Returns no jobs on error."""
+    slug = (company.get("slug") or "").strip()
+    name = (company.get("name") or slug or "").strip()
+    if not slug:
+        return None, []
+    url = f"{BASE}/{slug}/jobs"
+    if scheduler is not None and not scheduler.should_poll("greenhouse", slug):
+        fetched = http_cache.cached(url, variant=name)
+        if fetched is not None:
+            with metrics.track_board("greenhouse", slug) as m:
+                m.cache, m.jobs = fetched.cache, len(fetched.jobs)
+            return m, fetched.jobs
+    with metrics.track_board("greenhouse", slug) as m:
+        try:
+            fetched = http_cache.fetch_stream(
+                url, lambda body, _prev: _parse_board(body, name), variant=name, timeout=15
+            )
+        except Exception as e:
+            LOG.warning("Greenhouse %s (%s): %s", slug, name, e)
+            m.error = str(e)
+            return m, []
+        m.cache, m.jobs = fetched.cache, len(fetched.jobs)
+        return m, fetched.jobs
 
 
 def fetch_greenhouse_jobs(
     companies: list[dict[str, Any]],
-) -> list[dict[str, Any]]:
+    *,
+    max_workers: int = MAX_WORKERS,
+    scheduler: Scheduler | None = None,
+) -> Iterator[Job]:
     """
-    Fetch jobs from Greenhouse for each company.
+    Fetch jobs from Greenhouse for each company, max_workers boards at a time.
     companies: list of {slug: str, name: str}
-    Returns list of normalized job dicts.
+    scheduler: optional; only the boards it plans to poll are requested.
+    Yields normalized jobs board by board, in the order of companies.
     """
-    out: list[dict[str, Any]] = []
-    for c in companies:
-        slug = (c.get("slug") or "").strip()
-        name = (c.get("name") or slug or "").strip()
-        if not slug:
-            continue
-        try:
-            url = f"{BASE}/{slug}/jobs"
-            r = requests.get(url, timeout=15)
-            r.raise_for_status()
-            data = r.json()
-        except Exception as e:
-            LOG.warning("Greenhouse %s (%s): %s", slug, name, e)
-            continue
-        jobs = data.get("jobs") or []
-        for j in jobs:
-            loc = j.get("location") or {}
-            loc_name = loc.get("name") if isinstance(loc, dict) else None
-            normalized = normalize_job(
-                title=j.get("title") or "",
-                company=name,
-                url=j.get("absolute_url") or "",
-                source="greenhouse",
-                location=loc_name,
-                posted_date=j.get("updated_at"),
-                snippet=None,
-            )
-            if normalized["url"] and normalized["title"]:
-                out.append(normalized)
-    return out
+    if scheduler is not None:
+        scheduler.plan("greenhouse", ((c.get("slug") or "").strip() for c in companies))
+    for m, jobs in fetch_concurrently(
+        companies,
+        lambda c: _fetch_board(c, scheduler),
+        label="Greenhouse",
+        max_workers=max_workers,
+    ):
+        metrics.consuming(m)
+        yield from jobs
+    metrics.consuming(None)
+
+
+def iter_jobs(ctx: SourceContext) -> Iterator[Job]:
+    """Plugin entry: boards from companies.yaml (greenhouse, greenhouse_non_crypto) + greenhouse_slugs.txt."""
+    companies: list[dict[str, Any]] = []
+    for key in ("greenhouse", "greenhouse_non_crypto"):
+        part = ctx.config.get(key) or []
+        if isinstance(part, list):
+            companies.extend(part)
+    extra = load_slugs_from_file(ctx.config_dir / "greenhouse_slugs.txt", "slug", "name")
+    if extra:
+        LOG.info("Greenhouse: %d from YAML + %d from greenhouse_slugs.txt", len(companies), len(extra))
+        companies.extend(extra)
+    companies = ctx.select(companies, lambda c: f"greenhouse:{c.get('slug') or ''}")
+    if companies:
+        yield from fetch_greenhouse_jobs(companies, scheduler=ctx.scheduler)
@@ -2,63 +2,71 @@
 JobSpy-based scraper for LinkedIn, Indeed, Glassdoor, etc.
 Uses https://github.com/speedyapply/JobSpy — install with: pip install python-jobspy
 Optional: if not installed, this module logs and returns [].
+
+Search terms run in parallel (max_workers at a time, fewer while src.host_limits has
+cut the "jobspy" limit after rate-limit errors or slow searches). Each result DataFrame is
+converted with column operations: URLs already seen for an earlier term are dropped
+first, then the remaining rows are turned into jobs in one pass.
 """
 
 import logging
+from collections.abc import Iterator
 from typing import Any
 
-from src.normalize import normalize_job
+from src import host_limits, metrics
+from src.fetcher import fetch_concurrently
+from src.metrics import BoardMetrics
+from src.normalize import Job, normalize_job
+from src.scrapers import SourceContext
 
 LOG = logging.getLogger(__name__)
 
+# JobSpy already queries every site of a term in parallel; keep the term fan-out small.
+MAX_WORKERS = 3
+SNIPPET_CHARS = 500
+
 try:
     from jobspy import scrape_jobs
 except ImportError:
     scrape_jobs = None  # type: ignore
 
 
-def _get(row: Any, *keys: str, default: str = "") -> str:
-    """Get first present key from a pandas Series / dict (case-insensitive)."""
-    for col in keys:
-        for k in (col, col.lower(), col.upper()):
-            try:
-                if hasattr(row, "get") and k in row:
-                    v = row.get(k)
-                elif hasattr(row, "__getitem__"):
-                    v = row[k] if k in row else getattr(row, k, None)
-                else:
-                    v = getattr(row, k, None)
-            except (KeyError, TypeError):
-                continue
-            if v is not None and str(v).strip():
-                return str(v).strip()
-    return default
-
-
-def _row_to_job(row: Any, site: str) -> dict[str, Any] | None:
-    """Convert a JobSpy dataframe row to our normalized job dict."""
-    title = _get(row, "title", "TITLE")
-    company = _get(row, "company", "COMPANY")
-    url = _get(row, "job_url", "JOB_URL")
-    if not title or not url:
-        return None
-    city = _get(row, "city", "CITY")
-    state = _get(row, "state", "STATE")
-    location = ", ".join(filter(None, [city, state])) or None
-    desc = _get(row, "description", "DESCRIPTION")
-    snippet = (desc[:500] if desc else None) or None
-    posted = _get(row, "date_posted", "DATE_POSTED") or None
-    source = (_get(row, "site", "SITE") or site or "jobspy").lower()
-
-    return normalize_job(
-        title=title,
-        company=company or "Unknown",
-        url=url,
-        source=source,
-        location=location,
-        posted_date=posted or None,
-        snippet=snippet,
-    )
+def _text(df: Any, name: str) -> Any:
+    """Column `name` (any case) as stripped strings, "" where missing/NaN."""
+    columns = {str(c).lower(): c for c in df.columns}
+    col = columns.get(name)
+    if col is None:
+        return df.index.to_series().map(lambda _i: "")
+    return df[col].fillna("").astype(str).str.strip()
+
+
+def _frame_to_jobs(df: Any, seen_urls: set[str]) -> list[Job]:
+    """Convert a JobSpy DataFrame to jobs, skipping rows without title/URL and URLs in seen_urls."""
+    title = _text(df, "title")
+    url = _text(df, "job_url")
+    keep = (title != "") & (url != "") & ~url.duplicated() & ~url.isin(seen_urls)
+    if not keep.any():
+        return []
+    df = df[keep]
+    title, url = title[keep], url[keep]
+    company = _text(df, "company").replace("", "Unknown")
+    location = (_text(df, "city") + ", " + _text(df, "state")).str.strip(", ")
+    snippet = _text(df, "description").str.slice(0, SNIPPET_CHARS)
+    posted = _text(df, "date_posted")
+    source = _text(df, "site").str.lower().replace("", "jobspy")
+    seen_urls.update(url)
+    return [
+        normalize_job(t, c, u, s, location=loc, posted_date=p, snippet=sn)
+        for t, c, u, s, loc, p, sn in zip(
+            title.tolist(),
+            company.tolist(),
+            url.tolist(),
+            source.tolist(),
+            location.tolist(),
+            posted.tolist(),
+            snippet.tolist(),
+        )
+    ]
 
 
 def fetch_jobspy_jobs(
@@ -67,50 +75,75 @@ def fetch_jobspy_jobs(
     site_name: list[str] | None = None,
     results_wanted: int = 50,
     hours_old: int | None = None,
+    max_workers: int = MAX_WORKERS,
     **kwargs: Any,
-) -> list[dict[str, Any]]:
+) -> Iterator[Job]:
     """
     Scrape jobs via JobSpy (LinkedIn, Indeed, etc.) for each search term.
     search_terms: e.g. ["blockchain", "crypto", "web3"]
     site_name: e.g. ["linkedin", "indeed"] (default: ["linkedin", "indeed"])
     results_wanted: per search term, per site (JobSpy caps ~1000 per search).
     hours_old: only jobs posted in the last N hours (optional).
-    Returns list of normalized job dicts.
+    max_workers: search terms scraped at once.
+    Yields normalized jobs term by term (in the order of search_terms), skipping URLs already yielded.
     """
     if scrape_jobs is None:
         LOG.warning("python-jobspy not installed; skip JobSpy scraper. pip install python-jobspy")
-        return []
+        return
 
     sites = site_name or ["linkedin", "indeed"]
-    out: list[dict[str, Any]] = []
-    for term in search_terms:
-        try:
-            df = scrape_jobs(
-                site_name=sites,
-                search_term=term,
-                results_wanted=results_wanted,
-                hours_old=hours_old,
-                verbose=0,
-                **kwargs,
-            )
-        except Exception as e:
-            LOG.warning("JobSpy search_term=%r: %s", term, e)
-            continue
+    # JobSpy makes its own requests, so a whole search holds one slot of this pseudo-host.
+    limit_key = f"jobspy:{','.join(sites)}"
+
+    def _search(term: str) -> tuple[str, BoardMetrics, Any]:
+        with metrics.track_board("jobspy", term) as m, host_limits.slot(limit_key) as slot:
+            try:
+                df = scrape_jobs(
+                    site_name=sites,
+                    search_term=term,
+                    results_wanted=results_wanted,
+                    hours_old=hours_old,
+                    verbose=0,
+                    **kwargs,
+                )
+            except Exception as e:
+                LOG.warning("JobSpy search_term=%r: %s", term, e)
+                m.error = str(e)
+                if "429" in m.error or "too many requests" in m.error.lower():
+                    slot.status = 429
+                return term, m, None
+            slot.status = 200
+        return term, m, df
+
+    seen_urls: set[str] = set()
+    for term, m, df in fetch_concurrently(
+        list(dict.fromkeys(search_terms)),
+        _search,
+        label="JobSpy",
+        max_workers=max_workers,
+    ):
         if df is None or df.empty:
             continue
-        n = 0
-        for _, row in df.iterrows():
-            job = _row_to_job(row, site="")
-            if job and job.get("url") and job.get("title"):
-                out.append(job)
-                n += 1
-        LOG.info("JobSpy %r: %d jobs", term, n)
-    # Dedupe by url within this batch
-    seen_urls: set[str] = set()
-    deduped: list[dict[str, Any]] = []
-    for j in out:
-        u = (j.get("url") or "").strip()
-        if u and u not in seen_urls:
-            seen_urls.add(u)
-            deduped.append(j)
-    return deduped
+        jobs = _frame_to_jobs(df, seen_urls)
+        m.jobs = len(jobs)
+        LOG.info("JobSpy %r: %d rows, %d new jobs", term, len(df), len(jobs))
+        metrics.consuming(m)
+        yield from jobs
+    metrics.consuming(None)
+
+
+def iter_jobs(ctx: SourceContext) -> Iterator[Job]:
+    """Plugin entry: the jobspy section of companies.yaml (only when enabled: true)."""
+    cfg = ctx.config.get("jobspy")
+    if not isinstance(cfg, dict) or not cfg.get("enabled"):
+        return
+    terms = ctx.select(cfg.get("search_terms") or ["blockchain", "crypto", "web3"], lambda t: f"jobspy:{t}")
+    if not terms:
+        return
+    yield from fetch_jobspy_jobs(
+        search_terms=terms,
+        site_name=cfg.get("sites") or ["linkedin", "indeed"],
+        results_wanted=cfg.get("results_wanted") or 40,
+        hours_old=cfg.get("hours_old"),
+        max_workers=cfg.get("max_workers") or MAX_WORKERS,
+    )
@@ -1,17 +1,30 @@
 """
 Lever job postings API client.
-GET https://api.lever.co/v0/postings/{site}?mode=json
+GET https://api.lever.co/v0/postings/{site}?mode=json&skip=N&limit=PAGE_SIZE
+Sites are read a page at a time, and each page is parsed posting by posting from the
+response stream, so memory does not grow with the size of the descriptions.
+With a scheduler, sites it does not poll this run yield their cached jobs.
 """
 
 import logging
-from typing import Any
+import os
+from collections.abc import Iterator
+from typing import Any, BinaryIO
 
-import requests
-
-from src.normalize import normalize_job
+from src import http_cache, metrics
+from src.fetcher import MAX_WORKERS, fetch_concurrently
+from src.json_stream import iter_array, read_chunks
+from src.metrics import BoardMetrics
+from src.normalize import Job, normalize_job
+from src.scheduler import Scheduler
+from src.scrapers import SourceContext, load_slugs_from_file
 
 LOG = logging.getLogger(__name__)
-BASE = "https://api.lever.co/v0/postings"
+# Overridable so benchmarks can point the scraper at a local stand-in server.
+BASE = os.environ.get("LEVER_API_BASE", "https://api.lever.co/v0/postings")
+PAGE_SIZE = 100
+MAX_PAGES = 50
+SNIPPET_CHARS = 500
 
 
 def _location_from_categories(categories: Any) -> str | None:
@@ -26,44 +39,144 @@ def _location_from_categories(categories: Any) -> str | None:
     return None
 
 
+def _parse_site(body: BinaryIO, name: str) -> http_cache.Parsed:
+    """Normalize one page of Lever postings, one posting at a time; items counts every posting read."""
+    out: list[Job] = []
+    items = 0
+    for j in iter_array(read_chunks(body)):
+        items += 1
+        if not isinstance(j, dict):
+            continue
+        title = j.get("text") or ""
+        url_str = j.get("hostedUrl") or ""
+        loc = _location_from_categories(j.get("categories"))
+        snippet = (j.get("descriptionPlain") or j.get("openingPlain") or "")[:SNIPPET_CHARS]
+        normalized = normalize_job(
+            title=title,
+            company=name,
+            url=url_str,
+            source="lever",
+            location=loc,
+            posted_date=None,
+            snippet=snippet or None,
+        )
+        if normalized.url and normalized.title:
+            out.append(normalized)
+    return http_cache.Parsed(out, items)
+
+
+def _last_page(fetched: http_cache.Fetched) -> bool:
+    """A short page is the last one. Counts the postings in the body, not the jobs kept from them."""
+    items = fetched.items if fetched.items is not None else len(fetched.jobs)
+    return items < PAGE_SIZE
+
+
+def _variant(name: str) -> str:
+    # Separate from cache entries written before the posting count was stored, which would
+    # otherwise be served without it for as long as the page does not change.
+    return f"{name}\x00items"
+
+
+def _page_params(page: int) -> dict[str, Any]:
+    return {"mode": "json", "skip": page * PAGE_SIZE, "limit": PAGE_SIZE}
+
+
+def _cached_site(url: str, name: str) -> list[Job] | None:
+    """All cached pages of a site, or None if any page is missing from the cache."""
+    jobs: list[Job] = []
+    for page in range(MAX_PAGES):
+        fetched = http_cache.cached(url, params=_page_params(page), variant=_variant(name))
+        if fetched is None:
+            return None
+        jobs.extend(fetched.jobs)
+        if _last_page(fetched):
+            break
+    return jobs
+
+
+def _fetch_pages(url: str, name: str) -> tuple[str, list[Job]]:
+    """Fetch a site page by page (cached) until a short page. Returns (cache outcome, jobs)."""
+    jobs: list[Job] = []
+    seen: set[str] = set()
+    outcomes: set[str] = set()
+    for page in range(MAX_PAGES):
+        fetched = http_cache.fetch_stream(
+            url,
+            lambda body, _prev: _parse_site(body, name),
+            params=_page_params(page),
+            variant=_variant(name),
+            timeout=15,
+        )
+        outcomes.add(fetched.cache)
+        if fetched.jobs and fetched.jobs[0].url in seen:
+            break  # the server ignores skip/limit and sent the first page again
+        jobs.extend(fetched.jobs)
+        seen.update(j.url for j in fetched.jobs)
+        if _last_page(fetched):
+            break
+    for outcome in ("miss", "", "same_body"):
+        if outcome in outcomes:
+            return outcome, jobs
+    return "not_modified", jobs
+
+
+def _fetch_site(company: dict[str, Any], scheduler: Scheduler | None) -> tuple[BoardMetrics | None, list[Job]]:
+    """Fetch and normalize one Lever site (cached). Returns no jobs on error."""
+    site_id = (company.get("id") or "").strip()
+    name = (company.get("name") or site_id or "").strip()
+    if not site_id:
+        return None, []
+    url = f"{BASE}/{site_id}"
+    if scheduler is not None and not scheduler.should_poll("lever", site_id):
+        cached = _cached_site(url, name)
+        if cached is not None:
+            with metrics.track_board("lever", site_id) as m:
+                m.cache, m.jobs = "skipped", len(cached)
+            return m, cached
+    with metrics.track_board("lever", site_id) as m:
+        try:
+            m.cache, jobs = _fetch_pages(url, name)
+        except Exception as e:
+            LOG.warning("Lever %s (%s): %s", site_id, name, e)
+            m.error = str(e)
+            return m, []
+        m.jobs = len(jobs)
+        return m, jobs
+
+
 def fetch_lever_jobs(
     companies: list[dict[str, Any]],
-) -> list[dict[str, Any]]:
+    *,
+    max_workers: int = MAX_WORKERS,
+    scheduler: Scheduler | None = None,
+) -> Iterator[Job]:
     """
-    Fetch jobs from Lever for each company.
+    Fetch jobs from Lever for each company, max_workers sites at a time.
     companies: list of {id: str, name: str}
-    Returns list of normalized job dicts.
+    scheduler: optional; only the sites it plans to poll are requested.
+    Yields normalized jobs site by site, in the order of companies.
     """
-    out: list[dict[str, Any]] = []
-    for c in companies:
-        site_id = (c.get("id") or "").strip()
-        name = (c.get("name") or site_id or "").strip()
-        if not site_id:
-            continue
-        try:
-            url = f"{BASE}/{site_id}"
-            r = requests.get(url, params={"mode": "json"}, timeout=15)
-            r.raise_for_status()
-            jobs = r.json()
-        except Exception as e:
-            LOG.warning("Lever %s (%s): %s", site_id, name, e)
-            continue
-        if not isinstance(jobs, list):
-            continue
-        for j in jobs:
-            title = j.get("text") or ""
-            url_str = j.get("hostedUrl") or ""
-            loc = _location_from_categories(j.get("categories"))
-            snippet = (j.get("descriptionPlain") or j.get("openingPlain") or "")[:500]
-            normalized = normalize_job(
-                title=title,
-                company=name,
-                url=url_str,
-                source="lever",
-                location=loc,
-                posted_date=None,
-                snippet=snippet or None,
-            )
-            if normalized["url"] and normalized["title"]:
-                out.append(normalized)
-    return out
+    if scheduler is not None:
+        scheduler.plan("lever", ((c.get("id") or "").strip() for c in companies))
+    for m, jobs in fetch_concurrently(
+        companies,
+        lambda c: _fetch_site(c, scheduler),
+        label="Lever",
+        max_workers=max_workers,
+    ):
+        metrics.consuming(m)
+        yield from jobs
+    metrics.consuming(None)
+
+
+def iter_jobs(ctx: SourceContext) -> Iterator[Job]:
+    """Plugin entry: sites from companies.yaml (lever) + lever_sites.txt."""
+    companies = ctx.config.get("lever") or []
+    companies = list(companies) if isinstance(companies, list) else []
+    extra = load_slugs_from_file(ctx.config_dir / "lever_sites.txt", "id", "name")
+    if extra:
+        LOG.info("Lever: %d from YAML + %d from lever_sites.txt", len(companies), len(extra))
+        companies.extend(extra)
+    companies = ctx.select(companies, lambda c: f"lever:{c.get('id') or ''}")
+    if companies:
+        yield from fetch_lever_jobs(companies, scheduler=ctx.scheduler)
@@ -0,0 +1,327 @@
+"""
+Local query server for the job list: loads data/jobs.json into memory once, indexes it,
+and answers filtered, sorted, paginated queries, so a client fetches one page of results
+instead of the whole file.
+  GET /jobs?q=&source=&location=&posted=&posted_since=&posted_until=&sort=&page=&per_page=
+      q             words matched as prefixes of title/company/snippet words (all must match)
+      source        exact source name; repeat for any of several (likewise location, posted)
+      location      exact location (case-insensitive)
+      posted        posting month, YYYY-MM
+      posted_since, posted_until   posted date range, YYYY-MM-DD (until is inclusive)
+      sort          posted_date (newest first, default), first_seen (newest first), company, title
+    -> {"total", "page", "per_page", "pages", "jobs": [...],
+        "facets": {"source": {...}, "location": {top locations}, "posted": {month: n}}}
+  GET /health -> {"jobs", "version", "loaded_at"}
+Responses carry an ETag built from the data version and the query; If-None-Match gets a
+304. A watcher thread re-reads jobs.json when it changes and swaps the new index in
+whole, so a request sees either the old data or the new, never a mix.
+Run from repo root: python -m src.serve [--host H] [--port P] [--jobs JOBS_JSON] [--root DIR]
+    [--reload-seconds S]
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterable
+from datetime import date, datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+from src.filters import tokenize
+from src.shards import posted_epoch
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 200
+TOP_LOCATIONS = 20
+RELOAD_SECONDS = 2.0
+SORTS = ("posted_date", "first_seen", "company", "title")
+_LIST_PARAMS = ("source", "location", "posted")
+_PARAMS = frozenset(("q", "posted_since", "posted_until", "sort", "page", "per_page", *_LIST_PARAMS))
+
+
+class JobIndex:
+    """Immutable in-memory index over one version of jobs.json."""
+
+    def __init__(self, jobs: list[dict[str, Any]], version: str) -> None:
+        self.jobs = jobs
+        self.version = version
+        self.loaded_at = datetime.now(tz=timezone.utc).isoformat(timespec="seconds")
+        postings: dict[str, list[int]] = {}
+        self.facets: dict[str, dict[str, set[int]]] = {name: {} for name in _LIST_PARAMS}
+        self.posted: list[int] = []
+        self._labels: dict[str, str] = {}  # lowercased location -> first spelling seen
+        for i, j in enumerate(jobs):
+            text = f"{j.get('title') or ''} {j.get('company') or ''} {j.get('snippet') or ''}"
+            for tok in dict.fromkeys(tokenize(text)):
+                postings.setdefault(tok, []).append(i)
+            epoch = posted_epoch(j.get("posted_date"))
+            self.posted.append(epoch)
+            month = datetime.fromtimestamp(epoch, tz=timezone.utc).strftime("%Y-%m") if epoch else ""
+            location = (j.get("location") or "").strip()
+            self._labels.setdefault(location.lower(), location)
+            for name, value in (("source", j.get("source") or ""), ("location", location.lower()), ("posted", month)):
+                self.facets[name].setdefault(value, set()).add(i)
+        self.vocab = sorted(postings)
+        self.postings = {tok: frozenset(ids) for tok, ids in postings.items()}
+        ids = range(len(jobs))
+        first_seen = [j.get("first_seen") or "" for j in jobs]
+        self.orders = {
+            "posted_date": sorted(ids, key=lambda i: (-self.posted[i], i)),
+            # Newest first; ties in ascending id, like the other orders.
+            "first_seen": sorted(ids, key=lambda i: (first_seen[i], -i), reverse=True),
+            "company": sorted(ids, key=lambda i: ((jobs[i].get("company") or "").casefold(), i)),
+            "title": sorted(ids, key=lambda i: ((jobs[i].get("title") or "").casefold(), i)),
+        }
+
+    @classmethod
+    def load(cls, path: Path) -> "JobIndex":
+        with open(path, "rb") as f:
+            body = f.read()
+        data = json.loads(body)
+        jobs = data.get("jobs") if isinstance(data, dict) else None
+        if not isinstance(jobs, list):
+            raise ValueError(f"{path} has no jobs list")
+        return cls(jobs, hashlib.sha256(body).hexdigest()[:16])
+
+    def _prefix(self, prefix: str) -> set[int]:
+        """Jobs with a word starting with `prefix`."""
+        out: set[int] = set()
+        for k in range(bisect.bisect_left(self.vocab, prefix), len(self.vocab)):
+            tok = self.vocab[k]
+            if not tok.startswith(prefix):
+                break
+            out |= self.postings[tok]
+        return out
+
+    def _any_of(self, facet: str, values: Iterable[str]) -> set[int]:
+        out: set[int] = set()
+        for value in values:
+            out |= self.facets[facet].get(value, set())
+        return out
+
+    def search(self, params: dict[str, list[str]]) -> dict[str, Any]:
+        """Answer one /jobs query. Raises ValueError on bad parameters."""
+        unknown = sorted(params.keys() - _PARAMS)
+        if unknown:
+            raise ValueError(f"unknown parameter(s): {', '.join(unknown)}")
+        one = {k: v[-1] for k, v in params.items()}
+        sort = one.get("sort") or "posted_date"
+        if sort not in SORTS:
+            raise ValueError(f"sort must be one of {', '.join(SORTS)}")
+        page = _int_param(one, "page", 1, 1, None)
+        per_page = _int_param(one, "per_page", DEFAULT_PER_PAGE, 1, MAX_PER_PAGE)
+
+        matched: set[int] | None = None
+        for word in dict.fromkeys(tokenize(one.get("q") or "")):
+            hits = self._prefix(word)
+            matched = hits if matched is None else matched & hits
+        for name in _LIST_PARAMS:
+            values = [v for v in params.get(name, []) if v]
+            if values:
+                if name == "location":
+                    values = [v.strip().lower() for v in values]
+                hits = self._any_of(name, values)
+                matched = hits if matched is None else matched & hits
+        since, until = _date_param(one, "posted_since"), _date_param(one, "posted_until")
+        if since is not None or until is not None:
+            low = since if since is not None else 1
+            high = until + 86400 if until is not None else float("inf")
+            hits = {i for i, epoch in enumerate(self.posted) if low <= epoch < high}
+            matched = hits if matched is None else matched & hits
+
+        order = self.orders[sort]
+        ids = order if matched is None else [i for i in order if i in matched]
+        start = (page - 1) * per_page
+        return {
+            "total": len(ids),
+            "page": page,
+            "per_page": per_page,
+            "pages": -(-len(ids) // per_page),
+            "jobs": [self.jobs[i] for i in ids[start : start + per_page]],
+            "facets": self._facet_counts(matched),
+        }
+
+    def _facet_counts(self, matched: set[int] | None) -> dict[str, dict[str, int]]:
+        out: dict[str, dict[str, int]] = {}
+        for name, values in self.facets.items():
+            counts = Counter(
+                {v: len(ids) if matched is None else len(ids & matched) for v, ids in values.items() if v}
+            )
+            top = counts.most_common(TOP_LOCATIONS) if name == "location" else sorted(counts.items())
+            out[name] = {self._labels.get(v, v) if name == "location" else v: n for v, n in top if n}
+        return out
+
+
+def _int_param(one: dict[str, str], name: str, default: int, low: int, high: int | None) -> int:
+    raw = one.get(name)
+    if not raw:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer") from None
+    if value < low or (high is not None and value > high):
+        raise ValueError(f"{name} must be between {low} and {high}" if high else f"{name} must be at least {low}")
+    return value
+
+
+def _date_param(one: dict[str, str], name: str) -> int | None:
+    """YYYY-MM-DD as epoch seconds at 00:00 UTC."""
+    raw = one.get(name)
+    if not raw:
+        return None
+    try:
+        day = date.fromisoformat(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be YYYY-MM-DD") from None
+    return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp())
+
+
+class JobService:
+    """Holds the current JobIndex and swaps in a new one when jobs.json changes."""
+
+    def __init__(self, path: Path, reload_seconds: float = RELOAD_SECONDS) -> None:
+        self.path = path
+        self.reload_seconds = reload_seconds
+        self._stamp = self._file_stamp()
+        self.index = JobIndex.load(path)
+        LOG.info("Loaded %d jobs from %s (version %s)", len(self.index.jobs), path, self.index.version)
+        self._stop = threading.Event()
+        self._watcher = threading.Thread(target=self._watch, name="jobs-watch", daemon=True)
+
+    def _file_stamp(self) -> tuple[int, int] | None:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def reload(self) -> bool:
+        """Re-read jobs.json if it changed since the last load; True when a new index was swapped in."""
+        stamp = self._file_stamp()
+        if stamp is None or stamp == self._stamp:
+            return False
+        try:
+            index = JobIndex.load(self.path)
+        except Exception as e:
+            LOG.warning("Reload %s: %s", self.path, e)
+            return False
+        self._stamp = stamp
+        if index.version == self.index.version:
+            return False
+        self.index = index
+        LOG.info("Reloaded %d jobs from %s (version %s)", len(index.jobs), self.path, index.version)
+        return True
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.reload_seconds):
+            self.reload()
+
+    def start(self) -> None:
+        self._watcher.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+def _handler(service: JobService) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:
+            LOG.debug("%s " + format, self.address_string(), *args)
+
+        def _send(self, status: int, payload: Any, etag: str | None = None, head: bool = False) -> None:
+            body = b"" if status == 304 else json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+            self.send_response(status)
+            if etag:
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if not head:
+                self.wfile.write(body)
+
+        def do_GET(self, head: bool = False) -> None:
+            index = service.index  # one version for the whole request
+            split = urlsplit(self.path)
+            query = parse_qsl(split.query, keep_blank_values=True)
+            if split.path not in ("/jobs", "/health"):
+                self._send(404, {"error": f"no such endpoint {split.path}"}, head=head)
+                return
+            digest = hashlib.sha1(f"{split.path}?{sorted(query)}".encode()).hexdigest()[:16]
+            etag = f'"{index.version}-{digest}"'
+            if etag in (t.strip() for t in (self.headers.get("If-None-Match") or "").split(",")):
+                self._send(304, None, etag, head=head)
+                return
+            if split.path == "/health":
+                payload = {"jobs": len(index.jobs), "version": index.version, "loaded_at": index.loaded_at}
+                self._send(200, payload, etag, head=head)
+                return
+            params: dict[str, list[str]] = {}
+            for key, value in query:
+                params.setdefault(key, []).append(value)
+            try:
+                result = index.search(params)
+            except ValueError as e:
+                self._send(400, {"error": str(e)}, head=head)
+                return
+            self._send(200, result, etag, head=head)
+
+        def do_HEAD(self) -> None:
+            self.do_GET(head=True)
+
+    return Handler
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s %(message)s")
+    parser = argparse.ArgumentParser(description="Serve indexed, paginated queries over data/jobs.json.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--jobs", type=Path, help="jobs file to serve (default: data/jobs.json)")
+    parser.add_argument("--root", type=Path, help="project directory (default: the repo root)")
+    parser.add_argument(
+        "--reload-seconds",
+        type=float,
+        default=RELOAD_SECONDS,
+        help="how often to check jobs.json for changes (0 turns reloading off)",
+    )
+    args = parser.parse_args(argv)
+
+    root = args.root.resolve() if args.root else Path(__file__).resolve().parent.parent
+    path = args.jobs or root / "data" / "jobs.json"
+    t0 = time.perf_counter()
+    try:
+        service = JobService(path, args.reload_seconds)
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"serve: cannot load {path}: {e}") from e
+    LOG.info("Indexed in %.2fs", time.perf_counter() - t0)
+    if args.reload_seconds > 0:
+        service.start()
+    server = ThreadingHTTPServer((args.host, args.port), _handler(service))
+    server.daemon_threads = True
+    host, port = server.server_address[:2]
+    LOG.info("Serving on http://%s:%s/jobs (Ctrl-C to stop)", host, port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Sharded job data for the dashboard: fixed-size shard files, a manifest, and a
+prebuilt search index so the page can load lazily and search without scanning.
+
+data/manifest.json      — count, shard size, shard list, per-source counts, new_count
+data/shards/jobs-NNNN.json — {"offset": first id, "jobs": [...]}: ids offset..offset+size-1,
+                          null where no open job has that id
+data/index.json         — inverted token index over title/company, source ids and epoch
+                          posted dates per id, and precomputed sort orders
+
+Ids come from the job store (JobStore.assign_ids): a posting keeps its id while it is
+open, and a new one takes a free id. The files hold one job, token or array per line,
+so adding or closing a posting changes a few lines of one shard and of the index
+instead of every shard after it.
+"""
+
+import json
+import logging
+import os
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any
+
+from src.filters import tokenize
+
+LOG = logging.getLogger(__name__)
+
+SHARD_SIZE = 500
+NEW_WINDOW = timedelta(hours=24)
+
+
+def posted_epoch(value: str | None) -> int:
+    """Posted date (ISO 8601 or RFC 822) as epoch seconds; 0 when missing or unparseable."""
+    if not value:
+        return 0
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            dt = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return 0
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _lines(value: Any, depth: int = 0) -> str:
+    """JSON with one entry per line for the top two levels of objects and for arrays of jobs."""
+    if isinstance(value, dict) and depth < 2 and value:
+        return "{\n" + ",\n".join(f"{_dumps(k)}:{_lines(v, depth + 1)}" for k, v in value.items()) + "\n}"
+    if isinstance(value, list) and value and all(v is None or isinstance(v, dict) for v in value):
+        return "[\n" + ",\n".join(_dumps(v) for v in value) + "\n]"
+    return _dumps(value)
+
+
+def _write_json(path: Path, data: Any) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(_lines(data) + "\n")
+    os.replace(tmp, path)
+
+
+def build_index(jobs: list[dict[str, Any] | None]) -> dict[str, Any]:
+    """
+    Inverted index (token -> ascending job ids), source id and posted epoch per id, and
+    sort orders, for jobs listed by id (None for ids no open job has).
+    """
+    tokens: dict[str, list[int]] = {}
+    sources: list[str] = []
+    source_ids: dict[str, int] = {}
+    job_sources: list[int | None] = []
+    posted: list[int] = []
+    for i, j in enumerate(jobs):
+        if j is None:
+            job_sources.append(None)
+            posted.append(0)
+            continue
+        for tok in dict.fromkeys(tokenize(f"{j.get('title') or ''} {j.get('company') or ''}")):
+            tokens.setdefault(tok, []).append(i)
+        src = j.get("source") or ""
+        if src not in source_ids:
+            source_ids[src] = len(sources)
+            sources.append(src)
+        job_sources.append(source_ids[src])
+        posted.append(posted_epoch(j.get("posted_date")))
+    ids = [i for i, j in enumerate(jobs) if j is not None]
+    return {
+        "sources": sources,
+        "source": job_sources,
+        "posted": posted,
+        "order": {
+            "posted_date": sorted(ids, key=lambda i: (-posted[i], i)),
+            "company": sorted(ids, key=lambda i: ((jobs[i].get("company") or "").casefold(), i)),
+            "title": sorted(ids, key=lambda i: ((jobs[i].get("title") or "").casefold(), i)),
+        },
+        "tokens": dict(sorted(tokens.items())),
+    }
+
+
+def write_shards(
+    data_dir: Path,
+    jobs: Iterable[tuple[int, dict[str, Any]]],
+    *,
+    generated_at: str,
+    shard_size: int = SHARD_SIZE,
+) -> dict[str, Any]:
+    """
+    Write shard files, index.json and manifest.json (last, so readers never see a
+    partial set) from (id, job) pairs.
+    """
+    by_id: list[dict[str, Any] | None] = []
+    for i, job in jobs:
+        by_id.extend([None] * (i + 1 - len(by_id)))
+        by_id[i] = job
+    shard_dir = data_dir / "shards"
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    shards = []
+    for n, offset in enumerate(range(0, len(by_id), shard_size)):
+        name = f"jobs-{n:04d}.json"
+        chunk = by_id[offset : offset + shard_size]
+        _write_json(shard_dir / name, {"offset": offset, "jobs": chunk})
+        shards.append({"file": f"shards/{name}", "offset": offset, "count": sum(j is not None for j in chunk)})
+    keep = {Path(s["file"]).name for s in shards}
+    for stale in shard_dir.glob("jobs-*.json"):
+        if stale.name not in keep:
+            stale.unlink()
+
+    _write_json(data_dir / "index.json", build_index(by_id))
+    jobs = [j for j in by_id if j is not None]
+
+    run_at = datetime.fromisoformat(generated_at)
+    new_count = 0
+    for j in jobs:
+        first_seen = j.get("first_seen")
+        if first_seen and run_at - datetime.fromisoformat(first_seen) < NEW_WINDOW:
+            new_count += 1
+    by_source: dict[str, int] = {}
+    for j in jobs:
+        by_source[j.get("source") or ""] = by_source.get(j.get("source") or "", 0) + 1
+    manifest = {
+        "generated_at": generated_at,
+        "count": len(jobs),
+        "new_count": new_count,
+        "shard_size": shard_size,
+        "shards": shards,
+        "sources": dict(sorted(by_source.items())),
+        "index": "index.json",
+    }
+    _write_json(data_dir / "manifest.json", manifest)
+    LOG.info("Wrote %d shards, index.json and manifest.json (%d jobs)", len(shards), len(jobs))
+    return manifest
@@ -0,0 +1,77 @@
+"""RSS feed parsing, reuse of the jobs cached for the previous body, and feed aliases."""
+
+from src import http_cache
+from src.scrapers.crypto_boards import _jobs_from_feed, fetch_crypto_board_jobs
+
+
+def _feed(ids: list[str], build: str = "Mon, 12 Oct 2026 08:00:00 GMT") -> bytes:
+    items = "".join(
+        f"<item><title>Engineer {i}</title><link>https://jobs.example/{i}</link>"
+        f"<description>About {i}</description></item>"
+        for i in ids
+    )
+    return f"<rss><channel><lastBuildDate>{build}</lastBuildDate>{items}</channel></rss>".encode()
+
+
+def _ids(jobs) -> list[str]:
+    return [j.url.rsplit("/", 1)[1] for j in jobs]
+
+
+def test_parses_entries_in_document_order():
+    jobs = _jobs_from_feed(_feed(["c", "b", "a"]), "board", [])
+    assert _ids(jobs) == ["c", "b", "a"]
+    assert jobs[0].title == "Engineer c"
+    assert jobs[0].snippet == "About c"
+    assert jobs[0].source == "board"
+
+
+def test_reuses_cached_jobs_for_known_links():
+    previous = _jobs_from_feed(_feed(["b", "a"]), "board", [])
+    jobs = _jobs_from_feed(_feed(["c", "b", "a"]), "board", previous)
+    assert _ids(jobs) == ["c", "b", "a"]
+    assert jobs[1] is previous[0] and jobs[2] is previous[1]
+
+
+def test_removed_entry_is_not_published_again():
+    previous = _jobs_from_feed(_feed(["a", "b", "c", "d"]), "board", [])
+    jobs = _jobs_from_feed(_feed(["x", "a", "c", "d"]), "board", previous)
+    assert _ids(jobs) == ["x", "a", "c", "d"]
+
+
+def test_reordered_entries_follow_the_new_body():
+    previous = _jobs_from_feed(_feed(["a", "b", "c"]), "board", [])
+    jobs = _jobs_from_feed(_feed(["c", "new", "a", "b"]), "board", previous)
+    assert _ids(jobs) == ["c", "new", "a", "b"]
+    assert jobs[0] is previous[2]
+
+
+class _Response:
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+
+
+def _serve(monkeypatch, bodies: dict[str, bytes]) -> None:
+    def fetch(url, parse, **_kwargs):
+        if url not in bodies:
+            raise OSError("HTTP 500")
+        return http_cache.Fetched(parse(_Response(bodies[url]), []), "", "miss")
+
+    monkeypatch.setattr(http_cache, "fetch", fetch)
+
+
+def test_alias_with_other_timestamps_is_yielded_once(monkeypatch):
+    _serve(
+        monkeypatch,
+        {
+            "https://board.example/rss": _feed(["b", "a"], build="Mon"),
+            "https://board.example/feed": _feed(["b", "a"], build="Tue"),
+        },
+    )
+    boards = [{"url": "https://board.example/rss"}, {"url": "https://board.example/feed"}]
+    assert _ids(fetch_crypto_board_jobs(boards, max_workers=2)) == ["b", "a"]
+
+
+def test_alias_yields_when_the_feed_it_mirrors_fails(monkeypatch):
+    _serve(monkeypatch, {"https://board.example/feed": _feed(["b", "a"])})
+    boards = [{"url": "https://board.example/rss"}, {"url": "https://board.example/feed"}]
+    assert _ids(fetch_crypto_board_jobs(boards, max_workers=2)) == ["b", "a"]
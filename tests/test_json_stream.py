@@ -0,0 +1,85 @@
+"""iter_array must decode exactly what json.loads does, however the input is chunked."""
+
+import json
+import random
+
+import pytest
+
+from src.json_stream import iter_array
+
+DOC = [
+    12.5,
+    3,
+    -0.25,
+    1e3,
+    -1.5e-7,
+    6.02e23,
+    0,
+    1234567890123,
+    True,
+    False,
+    None,
+    "",
+    "plain",
+    'quote " and backslash \\ and ☃ snowman, \U0001f680 rocket',
+    [],
+    {},
+    [1, [2.75, [3e-2]], {"x": -4.5}],
+    {"id": 42, "title": "Engineer", "salary": {"min": 120000.5, "max": 1.6e5}, "tags": ["rust", "go"]},
+]
+
+
+def _chunks(data: bytes, size: int) -> list[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def _random_value(rng: random.Random, depth: int = 0):
+    kind = rng.randrange(7 if depth < 3 else 4)
+    if kind == 0:
+        return rng.choice(
+            [rng.randint(-(10**12), 10**12), rng.uniform(-1e6, 1e6), rng.random() * 10 ** rng.randint(-30, 30)]
+        )
+    if kind == 1:
+        return rng.choice([True, False, None])
+    if kind in (2, 3):
+        return "".join(rng.choice('ab "\\/é€\n\U0001f680') for _ in range(rng.randrange(8)))
+    if kind in (4, 5):
+        return [_random_value(rng, depth + 1) for _ in range(rng.randrange(4))]
+    return {f"k{i}": _random_value(rng, depth + 1) for i in range(rng.randrange(4))}
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 4, 5, 7, 8, 16, 64, 1 << 16])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_array_matches_json_loads(size, indent):
+    data = json.dumps(DOC, indent=indent, ensure_ascii=False).encode("utf-8")
+    assert list(iter_array(_chunks(data, size))) == json.loads(data)
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 4, 7, 64])
+def test_array_under_key_matches_json_loads(size):
+    data = json.dumps({"meta": {"total": 2.5e1, "n": [1.25]}, "count": 17, "jobs": DOC, "after": -3.5}).encode()
+    assert list(iter_array(_chunks(data, size), key="jobs")) == json.loads(data)["jobs"]
+
+
+def test_random_documents_match_json_loads():
+    rng = random.Random(1234)
+    for _ in range(200):
+        doc = [_random_value(rng) for _ in range(rng.randrange(6))]
+        data = json.dumps(doc, ensure_ascii=rng.random() < 0.5).encode("utf-8")
+        size = rng.randint(1, 9)
+        assert list(iter_array(_chunks(data, size))) == json.loads(data), (data, size)
+
+
+@pytest.mark.parametrize("chunks", [[b"[12", b".5, 3]"], [b"[1.", b"5]"], [b"[1.5e", b"+3]"], [b"[1.5e+", b"3]"]])
+def test_number_split_at_chunk_boundary(chunks):
+    assert list(iter_array(chunks)) == json.loads(b"".join(chunks))
+
+
+def test_missing_key_yields_nothing():
+    assert list(iter_array([b'{"other": [1, 2]}'], key="jobs")) == []
+
+
+@pytest.mark.parametrize("data", [b"[1 2]", b"[1,", b'{"jobs": [1, {', b"[1x]"])
+def test_malformed_input_raises(data):
+    with pytest.raises(ValueError):
+        list(iter_array(_chunks(data, 1), key="jobs" if data.startswith(b"{") else None))
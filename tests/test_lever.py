@@ -0,0 +1,41 @@
+"""Lever paging: a page is short by the postings in it, not by the jobs kept from them."""
+
+import io
+import json
+
+from src import http_cache
+from src.scrapers import lever
+
+
+def _posting(i: int) -> dict:
+    return {"text": f"Engineer {i}", "hostedUrl": f"https://jobs.lever.co/acme/{i}"}
+
+
+def _serve(monkeypatch, pages: list[list]) -> list[int]:
+    requested: list[int] = []
+
+    def fetch_stream(url, parse, *, params, **_kwargs):
+        page = params["skip"] // lever.PAGE_SIZE
+        requested.append(page)
+        body = json.dumps(pages[page] if page < len(pages) else []).encode()
+        result = parse(io.BytesIO(body), [])
+        return http_cache.Fetched(result.jobs, "", "miss", result.items)
+
+    monkeypatch.setattr(http_cache, "fetch_stream", fetch_stream)
+    return requested
+
+
+def test_full_page_with_invalid_postings_is_not_the_last(monkeypatch):
+    first = [_posting(i) for i in range(lever.PAGE_SIZE - 2)] + [{"text": "No URL"}, "not a posting"]
+    second = [_posting(i) for i in range(lever.PAGE_SIZE, lever.PAGE_SIZE + 3)]
+    requested = _serve(monkeypatch, [first, second])
+    _outcome, jobs = lever._fetch_pages("https://api.lever.co/v0/postings/acme", "Acme")
+    assert requested == [0, 1]
+    assert len(jobs) == lever.PAGE_SIZE + 1
+
+
+def test_short_page_ends_paging(monkeypatch):
+    requested = _serve(monkeypatch, [[_posting(i) for i in range(5)]])
+    _outcome, jobs = lever._fetch_pages("https://api.lever.co/v0/postings/acme", "Acme")
+    assert requested == [0]
+    assert len(jobs) == 5
@@ -0,0 +1,110 @@
+"""Deduplicator (exact and near-duplicate merging) and URL canonicalization."""
+
+import pytest
+
+from src.normalize import Deduplicator, Job, canonical_url, normalize_job
+
+
+def _job(title: str, url: str, source: str, company: str = "Acme") -> Job:
+    return normalize_job(title=title, company=company, url=url, source=source)
+
+
+def _run(jobs: list[Job], **kwargs) -> tuple[list[Job], Deduplicator]:
+    dedupe = Deduplicator(**kwargs)
+    return list(dedupe(jobs)), dedupe
+
+
+def test_near_duplicate_from_other_source_is_merged():
+    kept, dedupe = _run(
+        [
+            _job("Senior Backend Engineer", "https://boards.greenhouse.io/acme/jobs/1", "greenhouse"),
+            _job("Senior Backend Engineer (Remote)", "https://cryptojobs.example/j/77", "rss"),
+        ]
+    )
+    assert [j.source for j in kept] == ["greenhouse"]
+    assert dedupe.near_dropped == 1
+    assert dedupe.merged == {("Acme", "Senior Backend Engineer", "greenhouse:1"): {"rss"}}
+
+
+def test_same_source_postings_are_kept():
+    kept, dedupe = _run(
+        [
+            _job("Backend Engineer", "https://jobs.lever.co/acme/1", "lever"),
+            _job("Backend Engineer", "https://jobs.lever.co/acme/2", "lever"),
+        ]
+    )
+    assert len(kept) == 2
+    assert dedupe.merged == {}
+
+
+@pytest.mark.parametrize(
+    "other",
+    [
+        "Staff Backend Engineer",  # a level word differs
+        "Frontend Designer",  # different role
+    ],
+)
+def test_distinct_roles_are_kept(other):
+    kept, dedupe = _run(
+        [
+            _job("Senior Backend Engineer", "https://a.example/1", "greenhouse"),
+            _job(other, "https://b.example/2", "rss"),
+        ]
+    )
+    assert len(kept) == 2
+    assert dedupe.merged == {}
+
+
+def test_same_title_at_other_company_is_kept():
+    kept, _dedupe = _run(
+        [
+            _job("Backend Engineer", "https://a.example/1", "greenhouse", company="Acme"),
+            _job("Backend Engineer", "https://b.example/2", "rss", company="Globex"),
+        ]
+    )
+    assert len(kept) == 2
+
+
+def test_exact_duplicate_from_other_source_is_recorded():
+    kept, dedupe = _run(
+        [
+            _job("Backend Engineer", "https://a.example/1?utm_source=x", "greenhouse"),
+            _job("Backend Engineer", "https://a.example/1", "rss"),
+            _job("Backend Engineer", "https://a.example/1", "greenhouse"),
+        ],
+        near_duplicates=False,
+    )
+    assert [j.source for j in kept] == ["greenhouse"]
+    assert dedupe.exact_dropped == 2
+    assert dedupe.merged == {("Acme", "Backend Engineer", "https://a.example/1"): {"rss"}}
+
+
+def test_exact_copy_of_a_merged_job_is_recorded_on_the_kept_job():
+    kept, dedupe = _run(
+        [
+            _job("Senior Backend Engineer", "https://a.example/1", "greenhouse"),
+            _job("Senior Backend Engineer - Remote", "https://b.example/2", "rss"),
+            _job("Senior Backend Engineer - Remote", "https://b.example/2", "jobspy"),
+        ]
+    )
+    assert len(kept) == 1
+    assert dedupe.merged == {("Acme", "Senior Backend Engineer", "https://a.example/1"): {"rss", "jobspy"}}
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://www.Example.com/jobs/1/?utm_source=x&utm_medium=y#apply", "https://example.com/jobs/1"),
+        ("https://example.com/j?gh_src=abc&gh_jid=12", "https://example.com/j?gh_jid=12"),
+        ("https://jobs.lever.co/acme/1?lever-source=LinkedIn&lever-origin=applied", "https://jobs.lever.co/acme/1"),
+        ("https://example.com/j?fbclid=1&gclid=2&trk=3", "https://example.com/j"),
+        # Generic names some boards use to select the posting are kept.
+        (
+            "https://example.com/j?t=9&source=board&ref=abc&from=list",
+            "https://example.com/j?from=list&ref=abc&source=board&t=9",
+        ),
+        ("https://example.com/view?jk=b&id=a", "https://example.com/view?id=a&jk=b"),
+    ],
+)
+def test_canonical_url(url, expected):
+    assert canonical_url(url) == expected
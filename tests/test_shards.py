@@ -0,0 +1,50 @@
+"""Dashboard shards keep a posting's id and shard while it is open."""
+
+import json
+
+from src.job_store import JobStore
+from src.normalize import Job, normalize_job
+from src.shards import write_shards
+
+
+def _job(i: int) -> Job:
+    return normalize_job(
+        title=f"Engineer {i}", company=f"Company {i:03d}", url=f"https://jobs.example/{i}", source="rss"
+    )
+
+
+def _publish(store: JobStore, data_dir, ids: list[int], run_at: str) -> dict:
+    store.record_run([_job(i) for i in ids], run_at)
+    store.assign_ids()
+    return write_shards(data_dir, store.published_jobs(), generated_at=run_at, shard_size=4)
+
+
+def _files(data_dir) -> dict[str, str]:
+    return {p.name: p.read_text(encoding="utf-8") for p in sorted((data_dir / "shards").glob("*.json"))}
+
+
+def test_added_and_closed_postings_touch_only_their_shard(tmp_path):
+    data_dir = tmp_path / "data"
+    with JobStore(tmp_path / "jobs.db") as store:
+        _publish(store, data_dir, list(range(12)), "2026-10-01T08:00:00+00:00")
+        before = _files(data_dir)
+        # Job 9 closes and job 12 opens: 12 takes the id 9 had, in the third shard.
+        manifest = _publish(store, data_dir, [i for i in range(13) if i != 9], "2026-10-02T08:00:00+00:00")
+        after = _files(data_dir)
+    assert [name for name in before if before[name] != after[name]] == ["jobs-0002.json"]
+    assert manifest["count"] == 12
+    shard = json.loads(after["jobs-0002.json"])
+    assert [j["url"] for j in shard["jobs"]][1] == "https://jobs.example/12"
+
+
+def test_closed_id_is_a_hole_until_reused(tmp_path):
+    data_dir = tmp_path / "data"
+    with JobStore(tmp_path / "jobs.db") as store:
+        _publish(store, data_dir, [0, 1, 2, 3, 4], "2026-10-01T08:00:00+00:00")
+        manifest = _publish(store, data_dir, [0, 2, 3, 4], "2026-10-02T08:00:00+00:00")
+    shard = json.loads((data_dir / "shards" / "jobs-0000.json").read_text(encoding="utf-8"))
+    index = json.loads((data_dir / "index.json").read_text(encoding="utf-8"))
+    assert shard["jobs"][1] is None
+    assert 1 not in index["order"]["company"]
+    assert index["source"][1] is None
+    assert [s["count"] for s in manifest["shards"]] == [3, 1]